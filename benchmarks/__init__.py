@@ -0,0 +1,2 @@
+# Ultralytics YOLO 🚀, AGPL-3.0 license
+"""Micro-benchmarks of individual pipeline stages, with reference implementations to check results against."""
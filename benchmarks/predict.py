@@ -0,0 +1,457 @@
+# Ultralytics YOLO 🚀, AGPL-3.0 license
+"""
+Micro-benchmarks of prediction, postprocessing and result export on synthetic data.
+
+Usage:
+    from benchmarks.predict import benchmark_nms, benchmark_counts, benchmark_process_mask, benchmark_compact_masks
+    from benchmarks.predict import benchmark_result_writer, benchmark_results_export, benchmark_streams
+    benchmark_nms(batch_sizes=(1, 8, 32), densities=(10, 100, 1000))
+    benchmark_counts(n=300)
+    benchmark_process_mask(instances=(10, 100, 300), imgsz=640, orig_shape=(1080, 1920))
+    benchmark_compact_masks(instances=(10, 50, 100), imgsz=(1080, 1920))
+    benchmark_result_writer(workers=(0, 2, 4), frames=50, imgsz=(1080, 1920))
+    benchmark_results_export(detections=(10_000, 100_000, 1_000_000), per_image=100)
+    benchmark_streams(streams=(1, 4), frames=300)
+
+Run all of them with default arguments from the repository root with `python -m benchmarks.predict`.
+"""
+
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+
+from benchmarks.utils import peak_memory_mb, profile_ms
+from ultralytics.utils import LOGGER
+from ultralytics.utils.ops import Profile
+from ultralytics.utils.torch_utils import select_device
+
+
+def _synthetic_predictions(bs, density, nc=80, nm=0, anchors=8400, imgsz=640, device="cpu"):
+    """Returns raw YOLOv8 outputs (bs, 4 + nc + nm, anchors) with `density` clustered confident boxes per image."""
+    p = torch.zeros(bs, 4 + nc + nm, anchors, device=device)
+    p[:, :2] = torch.rand(bs, 2, anchors, device=device) * imgsz  # xy
+    p[:, 2:4] = torch.rand(bs, 2, anchors, device=device) * imgsz / 10 + 4  # wh
+    p[:, 4 : 4 + nc] = torch.rand(bs, nc, anchors, device=device) * 0.2  # background scores
+    p[:, 4 + nc :] = torch.randn(bs, nm, anchors, device=device)  # mask coefficients
+    for b in range(bs):
+        i = torch.randperm(anchors, device=device)[:density]
+        centers = torch.rand(max(density // 5, 1), 2, device=device) * imgsz  # ~5 overlapping boxes per object
+        xy = centers[torch.randint(len(centers), (len(i),), device=device)]
+        p[b, :2, i] = (xy + torch.randn_like(xy) * 4).T
+        p[b, 4 + torch.randint(nc, (len(i),), device=device), i] = torch.rand(len(i), device=device) * 0.7 + 0.3
+    return p
+
+
+def benchmark_nms(batch_sizes=(1, 8, 32, 64), densities=(10, 100, 1000), nc=80, runs=10, device="cpu", **kwargs):
+    """
+    Benchmark per-image versus batched non_max_suppression() on synthetic YOLOv8 outputs.
+
+    Args:
+        batch_sizes (tuple): Batch sizes to profile.
+        densities (tuple): Number of confident candidate boxes per image.
+        nc (int): Number of classes.
+        runs (int): Timed runs per configuration.
+        device (str): Device to run on, i.e. 'cpu' or 'cuda:0'.
+        **kwargs (any): Extra arguments forwarded to non_max_suppression(), i.e. multi_label=True.
+
+    Returns:
+        (pandas.DataFrame): Per configuration latency of both paths in ms, speedup and whether outputs match.
+
+    Example:
+        ```python
+        from benchmarks.predict import benchmark_nms
+
+        benchmark_nms(batch_sizes=(1, 32), densities=(100,))
+        ```
+    """
+    import pandas as pd
+
+    from ultralytics.utils.ops import non_max_suppression
+
+    device = select_device(device, verbose=False)
+    rows = []
+    for bs in batch_sizes:
+        for density in densities:
+            p = _synthetic_predictions(bs, density, nc=nc, device=device)
+            loop = non_max_suppression(p, nc=nc, in_place=False, **kwargs)
+            batched = non_max_suppression(p, nc=nc, in_place=False, batched=True, **kwargs)
+            match = all(  # order of equal-score boxes may differ, compare column-wise sorted values
+                a.shape == b.shape and torch.allclose(a.sort(0)[0], b.sort(0)[0]) for a, b in zip(loop, batched)
+            )
+            t_loop = profile_ms(lambda: non_max_suppression(p, nc=nc, in_place=False, **kwargs), runs, device=device)
+            t_batched = profile_ms(
+                lambda: non_max_suppression(p, nc=nc, in_place=False, batched=True, **kwargs), runs, device=device
+            )
+            rows.append([bs, density, round(t_loop, 3), round(t_batched, 3), round(t_loop / t_batched, 2), match])
+
+    df = pd.DataFrame(rows, columns=["Batch", "Boxes/img", "Loop (ms)", "Batched (ms)", "Speedup", "Match"])
+    LOGGER.info(f"\nNMS benchmark complete on {device}\n{df}\n")
+    return df
+
+
+def benchmark_counts(n=300, nc=80, imgsz=(1080, 1920), runs=100):
+    """
+    Benchmark the per-frame cost of per-class detection counting in the predictor loop.
+
+    Compares the former pure-Python counting with an unconditional cv2.putText() overlay against Results.counts, which
+    is computed with torch.bincount() and only drawn when results are plotted, and times the predictor's headless
+    write_results() path with `show_counts=True` and plotting off.
+
+    Args:
+        n (int): Number of detections per frame.
+        nc (int): Number of classes.
+        imgsz (tuple): Frame size (h, w).
+        runs (int): Timed runs per method.
+
+    Returns:
+        (pandas.DataFrame): Per-frame overhead in ms of each method.
+    """
+    import types
+
+    import cv2
+    import pandas as pd
+
+    from ultralytics.data.loaders import SourceTypes
+    from ultralytics.engine.results import Results
+    from ultralytics.models.yolo.detect import DetectionPredictor
+    from ultralytics.utils.plotting import Annotator
+
+    names = {i: f"class{i}" for i in range(nc)}
+    boxes = torch.cat((torch.rand(n, 4) * 640, torch.rand(n, 1), torch.randint(nc, (n, 1))), 1)
+    result = Results(np.zeros((*imgsz, 3), dtype=np.uint8), path="", names=names, boxes=boxes)
+    im = result.orig_img.copy()
+    annotator = Annotator(im, example=names)
+
+    def python_counts():
+        """Former stream_inference() counting and overlay."""
+        count_dict = {}
+        for number in result.boxes.cls.tolist():
+            count_dict[number] = count_dict.get(number, 0) + 1
+        text = "| ".join(f"{names[k]}:{v}" for k, v in count_dict.items())
+        cv2.putText(im, text, (30, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2, cv2.LINE_AA)
+
+    def overlay():
+        """Results.plot(counts=True) overlay on an existing annotator."""
+        text = " | ".join(f"{names[c]}:{k}" for c, k in enumerate(result.counts.tolist()) if k)
+        annotator.text([30, 30], text, txt_color=(0, 0, 255))
+
+    # Predictor with plotting and saving off, so write_results() only logs the per-class counts of the frame
+    predictor = DetectionPredictor(overrides=dict(save=False, show=False, show_counts=True, verbose=False))
+    predictor.source_type, predictor.dataset = SourceTypes(), types.SimpleNamespace(mode="image")
+    im_batch, s = torch.zeros(1, 3, *imgsz), [""]
+    result.speed = {"preprocess": 0.0, "inference": 0.0, "postprocess": 0.0}
+
+    def headless():
+        """Predictor write_results() of one frame, which logs Results.counts per class without drawing them."""
+        return predictor.write_results(0, Path("im.jpg"), im_batch, s, results=[result])
+
+    rows = [
+        ["Python counting + putText (before)", profile_ms(python_counts, runs)],
+        ["Results.counts bincount", profile_ms(lambda: result.counts, runs)],
+        ["Results.counts + overlay (plotting only)", profile_ms(overlay, runs)],
+        ["Headless write_results(), no plotting (after)", profile_ms(headless, runs)],
+    ]
+    df = pd.DataFrame(rows, columns=["Method", "ms/frame"]).round(4)
+    LOGGER.info(f"\nCounting benchmark complete for {n} detections per frame\n{df}\n")
+    return df
+
+
+def benchmark_process_mask(instances=(10, 100, 300), imgsz=640, orig_shape=(1080, 1920), runs=5, device="cpu"):
+    """
+    Benchmark full-frame mask assembly against ROI mask assembly, which upsamples each mask only inside its box.
+
+    'imgsz' mode compares process_mask(..., upsample=True) with masks at the letterboxed input size, 'native' mode
+    compares process_mask_native with masks at the original image size like `retina_masks=True`. Boxes are random
+    with sides of 2% to 20% of the image.
+
+    Args:
+        instances (tuple): Numbers of instances per image.
+        imgsz (int): Inference image size, the prototype grid is a quarter of the letterboxed image.
+        orig_shape (tuple): Original image size (h, w).
+        runs (int): Timed runs per configuration.
+        device (str): Device to run on, i.e. 'cpu' or 'cuda:0'.
+
+    Returns:
+        (pandas.DataFrame): Per configuration latency in ms and peak memory in MB of both modes, and the number of
+            pixels where the pasted ROI masks differ from the full-frame masks, which happens only through float
+            rounding of values right at the 0.5 threshold.
+    """
+    from functools import partial
+
+    import pandas as pd
+
+    from ultralytics.utils.ops import process_mask, process_mask_native, process_mask_roi
+
+    device = select_device(device, verbose=False)
+    gain = imgsz / max(orig_shape)
+    shape = tuple(int(np.ceil(x * gain / 32)) * 32 for x in orig_shape)  # letterboxed input size
+    protos = torch.randn(32, shape[0] // 4, shape[1] // 4, device=device)
+    rows = []
+    for n in instances:
+        masks_in = torch.randn(n, 32, device=device)
+        for mode, size in ("imgsz", shape), ("native", orig_shape):
+            h, w = size
+            xy = torch.rand(n, 2, device=device) * torch.tensor([w, h], device=device)
+            wh = (torch.rand(n, 2, device=device) * 0.18 + 0.02) * torch.tensor([w, h], device=device)
+            boxes = torch.cat((xy - wh / 2, xy + wh / 2), 1)
+            native = mode == "native"
+            args = protos, masks_in, boxes, size
+            dense = partial(process_mask_native, *args) if native else partial(process_mask, *args, upsample=True)
+            roi = partial(process_mask_roi, *args, native=native)
+
+            tiles, offsets = roi()
+            full = dense().bool()
+            mismatch = full.sum().item()  # pixels outside the tiles plus differing pixels inside them
+            for t, m, (x, y) in zip(tiles, full, offsets.tolist()):
+                m = m[y : y + t.shape[0], x : x + t.shape[1]]
+                mismatch += (t != m).sum().item() - m.sum().item()
+            del full
+            m_roi, m_dense = (peak_memory_mb(fn, device) for fn in (roi, dense))
+            t_dense, t_roi = (profile_ms(fn, runs, warmup=1, device=device) for fn in (dense, roi))
+            rows.append([n, mode, round(t_dense, 1), round(t_roi, 1), round(m_dense), round(m_roi), mismatch])
+
+    columns = ["Instances", "Mode", "Full-frame (ms)", "ROI (ms)", "Full-frame peak (MB)", "ROI peak (MB)", "Mismatch"]
+    df = pd.DataFrame(rows, columns=columns)
+    LOGGER.info(f"\nMask assembly benchmark complete on {device} at imgsz={imgsz}, orig_shape={orig_shape}\n{df}\n")
+    return df
+
+
+def _masks2segments_loop(masks):
+    """Reference masks2segments that traces the largest contour of every mask over the full frame."""
+    import cv2
+
+    segments = []
+    for x in masks.int().cpu().numpy().astype("uint8"):
+        c = cv2.findContours(x, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)[0]
+        c = np.array(c[np.array([len(x) for x in c]).argmax()]).reshape(-1, 2) if c else np.zeros((0, 2))
+        segments.append(c.astype("float32"))
+    return segments
+
+
+def benchmark_compact_masks(instances=(10, 50, 100), imgsz=(1080, 1920), runs=5):
+    """
+    Benchmark dense segmentation masks against run-length encoded masks from Masks.compact().
+
+    Every instance is a random filled ellipse with axes of 2% to 10% of the image. Pickle times include unpickling,
+    segments are traced over the full frame before and per mask region after.
+
+    Args:
+        instances (tuple): Numbers of masks per image.
+        imgsz (tuple): Mask size (h, w).
+        runs (int): Timed runs per configuration.
+
+    Returns:
+        (pandas.DataFrame): Per number of masks the pickled size in KB, the pickle round trip time in ms of dense and
+            compact masks, the encode time in ms, and the segment tracing time in ms before and after.
+    """
+    import pickle
+
+    import cv2
+    import pandas as pd
+
+    from ultralytics.engine.results import Masks
+
+    rng, (h, w) = np.random.default_rng(0), imgsz
+    rows = []
+    for n in instances:
+        data = np.zeros((n, h, w), dtype=np.float32)
+        for m in data:
+            axes = (rng.uniform(0.02, 0.1, 2) * (w, h)).astype(int).tolist()
+            center = int(rng.integers(w)), int(rng.integers(h))
+            cv2.ellipse(m, center, axes, float(rng.uniform(0, 180)), 0, 360, 1, -1)
+        dense = Masks(torch.from_numpy(data), imgsz)
+        compact = dense.compact()
+        size_dense, size_compact = (len(pickle.dumps(x)) / 1024 for x in (dense, compact))
+        t_dense, t_compact = (profile_ms(lambda: pickle.loads(pickle.dumps(x)), runs) for x in (dense, compact))
+        t_encode = profile_ms(dense.compact, runs)
+        t_loop = profile_ms(lambda: _masks2segments_loop(dense.data), runs)
+        t_region = profile_ms(compact._segments, runs)
+        rows.append([n, round(size_dense), round(size_compact), round(t_dense, 1), round(t_compact, 1)])
+        rows[-1] += [round(t_encode, 1), round(t_loop, 1), round(t_region, 1)]
+
+    columns = ["Masks", "Dense (KB)", "Compact (KB)", "Dense pickle (ms)", "Compact pickle (ms)", "Encode (ms)"]
+    df = pd.DataFrame(rows, columns=columns + ["Full-frame segments (ms)", "Region segments (ms)"])
+    LOGGER.info(f"\nCompact masks benchmark complete at imgsz={imgsz}\n{df}\n")
+    return df
+
+
+def benchmark_result_writer(workers=(0, 2, 4), frames=50, imgsz=(1080, 1920), boxes=20, inference_ms=30):
+    """
+    Benchmark saving predictions on the inference thread against the background ResultWriter.
+
+    Every frame is a synthetic image that is appended to a video and saved as a JPEG frame, with a label line and a
+    crop per box, like `save=True, save_frames=True, save_txt=True, save_crop=True` on a video source. Inference is
+    simulated by sleeping, like a CPU waiting on the GPU, which background saving can overlap with.
+
+    Args:
+        workers (tuple): Numbers of writer threads, 0 saves on the calling thread.
+        frames (int): Number of frames.
+        imgsz (tuple): Frame size (h, w).
+        boxes (int): Number of boxes per frame, with sides of 5% to 30% of the frame.
+        inference_ms (float): Simulated inference time per frame in ms.
+
+    Returns:
+        (pandas.DataFrame): Per number of workers the time in ms per frame the caller is blocked saving, the wall time
+            in ms per frame including inference and writing the last files, and the frame rate speedup.
+    """
+    import tempfile
+
+    import cv2
+    import pandas as pd
+
+    from ultralytics.engine.predictor import ResultWriter
+
+    rng, (h, w) = np.random.default_rng(0), imgsz
+    im = cv2.resize(rng.integers(0, 256, (h // 8, w // 8, 3), dtype=np.uint8), (w, h))  # compressible like a photo
+    xy = rng.uniform(0, 0.7, (boxes, 2)) * (w, h)
+    xyxy = np.concatenate((xy, xy + rng.uniform(0.05, 0.3, (boxes, 2)) * (w, h)), 1).astype(int).tolist()
+    lines = [f"0 {x1 / w:g} {y1 / h:g} {x2 / w:g} {y2 / h:g}" for x1, y1, x2, y2 in xyxy]
+    rows = []
+    for n in workers:
+        with tempfile.TemporaryDirectory() as d:
+            d, writer, dt = Path(d), ResultWriter(n), Profile()
+            t0 = time.time()
+            for i in range(frames):
+                time.sleep(inference_ms / 1e3)
+                with dt:
+                    writer.video(d / "video.avi", im, 30, "MJPG")
+                    writer.imwrite(d / "video_frames" / f"{i}.jpg", im)
+                    writer.text(d / "labels" / f"video_{i}.txt", lines)
+                    for x1, y1, x2, y2 in xyxy:
+                        writer.crop(d / "crops" / "0" / f"video_{i}.jpg", im[y1:y2, x1:x2])
+            writer.close()
+            rows.append([n, round(dt.t / frames * 1e3, 1), round((time.time() - t0) / frames * 1e3, 1)])
+    df = pd.DataFrame(rows, columns=["Workers", "Save (ms/frame)", "Frame (ms)"])
+    df["Speedup"] = (df["Frame (ms)"].iloc[0] / df["Frame (ms)"]).round(2)
+    LOGGER.info(f"\nResult writer benchmark complete for {frames} frames at imgsz={imgsz} with {boxes} boxes\n{df}\n")
+    return df
+
+
+def _summary_loop(result, decimals=5):
+    """Reference Results.summary() of detection results that builds every detection from a row of Python floats."""
+    rows = []
+    for row in result.boxes.data.cpu().tolist():
+        box = {k: round(v, decimals) for k, v in zip(("x1", "y1", "x2", "y2"), row)}
+        cls = int(row[-1])
+        rows.append({"name": result.names[cls], "class": cls, "confidence": round(row[-2], decimals), "box": box})
+    return rows
+
+
+def benchmark_results_export(detections=(10_000, 100_000, 1_000_000), per_image=100, nc=80, runs=3):
+    """
+    Benchmark exporting the detections of a whole prediction run per Results object against columnar export.
+
+    Synthetic detection results of a 1080p image are exported with the per-image methods, i.e. JSON and label files,
+    and with `results_to_columns()` followed by `save_columns()` to NDJSON, CSV and, if pyarrow is installed, Parquet.
+
+    Args:
+        detections (tuple): Total numbers of detections of the run.
+        per_image (int): Detections per Results object.
+        nc (int): Number of classes.
+        runs (int): Timed runs per configuration.
+
+    Returns:
+        (pandas.DataFrame): Per number of detections and method the time in ms and the throughput in detections/s.
+    """
+    import importlib.util
+    import json
+    import tempfile
+
+    import pandas as pd
+
+    from ultralytics.engine.results import Results, results_to_columns, save_columns
+
+    rng, (h, w) = np.random.default_rng(0), (1080, 1920)
+    im, names = np.zeros((h, w, 3), dtype=np.uint8), {i: f"class{i}" for i in range(nc)}
+    formats = (".ndjson", ".csv") + ((".parquet",) if importlib.util.find_spec("pyarrow") else ())
+    rows = []
+    for n in detections:
+        xy = rng.uniform(0, 0.8, (n, 2)) * (w, h)
+        xyxy = np.concatenate((xy, xy + rng.uniform(0.01, 0.2, (n, 2)) * (w, h)), 1)
+        data = torch.from_numpy(np.concatenate((xyxy, rng.random((n, 1)), rng.integers(0, nc, (n, 1))), 1)).float()
+        results = [Results(im, f"{i}.jpg", names, boxes=b) for i, b in enumerate(data.split(per_image))]
+        with tempfile.TemporaryDirectory() as d:
+            d = Path(d)
+            methods = {
+                "Summary loop (reference)": lambda: [json.dumps(_summary_loop(r), indent=2) for r in results],
+                "Results.tojson()": lambda: [r.tojson() for r in results],
+                "Results.save_txt()": lambda: [r.save_txt(d / "labels" / f"{i}.txt") for i, r in enumerate(results)],
+                "results_to_columns()": lambda: results_to_columns(results),
+            }
+            for f in formats:
+                methods[f"Columns to {f[1:]}"] = lambda f=f: save_columns(results_to_columns(results), d / f"run{f}")
+            for method, fn in methods.items():
+                t = profile_ms(fn, runs, warmup=1)
+                rows.append([n, method, round(t, 1), round(n / t * 1e3)])
+
+    df = pd.DataFrame(rows, columns=["Detections", "Method", "Time (ms)", "Detections/s"])
+    LOGGER.info(f"\nResults export benchmark complete with {per_image} detections per image\n{df}\n")
+    return df
+
+
+def benchmark_streams(streams=(1, 4), frames=300, imgsz=(480, 640), inference_ms=30):
+    """
+    Benchmark LoadStreams frame latency and dropped frames with latest-only and FIFO stream buffers.
+
+    Every stream is a synthetic video file read like a camera, which delivers frames faster than the simulated
+    inference consumes them. Latency is the age of the oldest frame of a batch when the batch is returned.
+
+    Args:
+        streams (tuple): Numbers of concurrent streams.
+        frames (int): Frames per video file.
+        imgsz (tuple): Frame size (h, w).
+        inference_ms (float): Simulated inference time per batch in ms.
+
+    Returns:
+        (pandas.DataFrame): Per number of streams and buffer policy the batches returned, the mean time in ms
+            `__next__` waited for a batch, the mean and 95th percentile frame latency in ms and the dropped frames.
+    """
+    import tempfile
+
+    import cv2
+    import pandas as pd
+
+    from ultralytics.data.loaders import LoadStreams
+
+    rng, (h, w) = np.random.default_rng(0), imgsz
+    rows = []
+    with tempfile.TemporaryDirectory() as d:
+        video = str(Path(d) / "video.avi")
+        writer = cv2.VideoWriter(video, cv2.VideoWriter_fourcc(*"MJPG"), 30, (w, h))
+        for _ in range(frames):
+            writer.write(cv2.resize(rng.integers(0, 256, (h // 8, w // 8, 3), dtype=np.uint8), (w, h)))
+        writer.release()
+        for n in streams:
+            (Path(d) / "list.streams").write_text("\n".join([video] * n))
+            for buffer in (False, True):
+                dataset, dt, latency = LoadStreams(str(Path(d) / "list.streams"), buffer=buffer), Profile(), []
+                iterator = iter(dataset)
+                while True:
+                    try:
+                        with dt:
+                            next(iterator)
+                    except StopIteration:
+                        break
+                    latency.append((time.time() - min(dataset.timestamps)) * 1e3)
+                    time.sleep(inference_ms / 1e3)
+                batches, dropped = len(latency), sum(x["dropped"] for x in dataset.stats())
+                wait, mean, p95 = dt.t / max(batches, 1) * 1e3, np.mean(latency), np.percentile(latency, 95)
+                rows.append([n, "FIFO" if buffer else "latest", batches, *(round(x, 1) for x in (wait, mean, p95))])
+                rows[-1].append(dropped)
+
+    columns = ["Streams", "Buffer", "Batches", "Wait (ms)", "Latency (ms)", "Latency p95 (ms)", "Dropped"]
+    df = pd.DataFrame(rows, columns=columns)
+    LOGGER.info(f"\nStreams benchmark complete for {frames} frames at imgsz={imgsz}\n{df}\n")
+    return df
+
+
+if __name__ == "__main__":
+    benchmark_nms()
+    benchmark_counts()
+    benchmark_process_mask()
+    benchmark_compact_masks()
+    benchmark_result_writer()
+    benchmark_results_export()
+    benchmark_streams()
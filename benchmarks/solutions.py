@@ -0,0 +1,184 @@
+# Ultralytics YOLO 🚀, AGPL-3.0 license
+"""
+Micro-benchmarks of the solutions on synthetic data.
+
+Usage:
+    from benchmarks.solutions import benchmark_region_counter, benchmark_depth_height
+    benchmark_region_counter(tracks=(10, 100, 500), regions=(1, 4, 8))
+    benchmark_depth_height(plants=(10, 50, 100))
+
+Run all of them with default arguments from the repository root with `python -m benchmarks.solutions`.
+"""
+
+import numpy as np
+
+from benchmarks.utils import profile_ms
+from ultralytics.utils import LOGGER
+from ultralytics.utils.checks import check_requirements
+
+
+def benchmark_region_counter(tracks=(10, 100, 500), regions=(1, 4, 8), imgsz=(1080, 1920), runs=20):
+    """
+    Benchmark RegionCounter point-in-polygon tests against per-box shapely Polygon.contains() loops.
+
+    Args:
+        tracks (tuple): Number of tracked boxes per frame.
+        regions (tuple): Number of polygon regions.
+        imgsz (tuple): Frame size (h, w), used for random boxes and the rasterized mask mode.
+        runs (int): Timed runs per configuration.
+
+    Returns:
+        (pandas.DataFrame): Per-frame latency in ms of shapely, edge-array and mask-lookup counting.
+    """
+    import pandas as pd
+
+    from ultralytics.solutions.region_counter import RegionCounter
+
+    check_requirements("shapely>=2.0.0")
+    from shapely.geometry import Point, Polygon
+
+    h, w = imgsz
+    rows = []
+    for nr in regions:
+        # Random convex-ish polygons with 6 vertices around random centers
+        angles = np.sort(np.random.rand(nr, 6) * 2 * np.pi, 1)
+        centers, radii = np.random.rand(nr, 1, 2) * (w, h), np.random.rand(nr, 6, 1) * min(h, w) / 4 + 50
+        polygons = centers + radii * np.stack((np.cos(angles), np.sin(angles)), -1)
+        shapely_polygons = [Polygon(p) for p in polygons]
+        edges, masks = RegionCounter(list(polygons)), RegionCounter(list(polygons), imgsz=imgsz)
+        for nt in tracks:
+            xy = np.random.rand(nt, 2) * (w, h)
+            boxes, ids = np.concatenate((xy - 20, xy + 20), 1), np.arange(nt)
+
+            def shapely_loop():
+                """Former per-box, per-region counting."""
+                for box, tid in zip(boxes, ids):
+                    c = Point(((box[0] + box[2]) / 2, (box[1] + box[3]) / 2))
+                    for polygon, seen in zip(shapely_polygons, seen_ids):
+                        if polygon.contains(c) and tid not in seen:
+                            seen.add(tid)
+
+            seen_ids = [set() for _ in range(nr)]
+            edges.reset()
+            t_shapely = profile_ms(shapely_loop, runs)
+            match = [len(x) for x in seen_ids] == edges.update(boxes, ids).tolist()
+            rows.append(
+                [
+                    nr,
+                    nt,
+                    round(t_shapely, 3),
+                    round(profile_ms(lambda: edges.update(boxes, ids), runs), 3),
+                    round(profile_ms(lambda: masks.update(boxes, ids), runs), 3),
+                    match,
+                ]
+            )
+
+    df = pd.DataFrame(rows, columns=["Regions", "Tracks", "Shapely (ms)", "Edges (ms)", "Masks (ms)", "Match"])
+    LOGGER.info(f"\nRegion counting benchmark complete\n{df}\n")
+    return df
+
+
+def benchmark_depth_height(plants=(10, 50, 100), imgsz=(480, 640), budget_ms=33.3, runs=10):
+    """
+    Benchmark ground-plane fitting and plant height estimation on synthetic RealSense-like depth frames.
+
+    Each frame shows a tilted ground plane with `plants` rectangular objects of known heights. The former per-frame
+    loop-based RANSAC and per-box height estimation are compared against GroundPlane's incremental update and the
+    single-gather box_heights().
+
+    Args:
+        plants (tuple): Number of plant boxes per frame.
+        imgsz (tuple): Depth frame size (h, w).
+        budget_ms (float): Per-frame latency budget in ms of plane update plus height estimation.
+        runs (int): Timed runs per configuration.
+
+    Returns:
+        (pandas.DataFrame): Per-frame latency in ms of each stage, height error in cm and whether the budget is met.
+    """
+    from types import SimpleNamespace
+
+    import pandas as pd
+
+    from ultralytics.solutions.depth_height import GroundPlane, box_heights, fit_plane_ransac, roi_points_from_depth
+
+    h, w = imgsz
+    intr = SimpleNamespace(fx=0.9 * w, fy=0.9 * w, ppx=w / 2, ppy=h / 2)
+    n0, d0 = np.array([0.0, -0.6, -0.8], dtype=np.float32), 2.0  # ground plane, camera 2 m above it
+    gx, gy = np.meshgrid(np.arange(w), np.arange(h))
+    # -n0 @ (x/z, y/z, 1) per pixel, the depth of a point at height t above the plane is (d0 - t) / ray
+    ray = -(n0[0] * (gx - intr.ppx) / intr.fx + n0[1] * (gy - intr.ppy) / intr.fy + n0[2])
+
+    def ransac_loop(points, iters=300, dist_thresh=0.004):
+        """Former sequential RANSAC, one Python iteration per hypothesis."""
+        rng, best, best_mask = np.random.default_rng(123), -1, None
+        for _ in range(iters):
+            p0, p1, p2 = points[rng.choice(len(points), size=3, replace=False)]
+            n = np.cross(p1 - p0, p2 - p0)
+            norm = np.linalg.norm(n)
+            if norm < 1e-6:
+                continue
+            n /= norm
+            mask = np.abs(points @ n - n @ p0) < dist_thresh
+            if mask.sum() > best:
+                best, best_mask = mask.sum(), mask
+        return fit_plane_ransac(points[best_mask], iters=1, dist_thresh=1.0, min_inliers=3)
+
+    rng = np.random.default_rng(0)
+    rows = []
+    for npl in plants:
+        # Plant boxes in the upper 80% of the frame, the bottom rows stay ground as assumed by GroundPlane
+        wh = rng.uniform(20, 60, (npl, 2))
+        xy = rng.uniform((0, 0.05 * h), (w - 60, 0.8 * h - 60), (npl, 2))
+        boxes = np.concatenate((xy, xy + wh), 1).round().astype(int)
+        heights = rng.uniform(0.1, 1.0, npl).astype(np.float32)
+        t = np.zeros((h, w), dtype=np.float32)
+        for (x1, y1, x2, y2), ht in zip(boxes, heights):
+            t[y1:y2, x1:x2] = ht
+        depth = ((d0 - t) / ray + rng.normal(0, 5e-4, (h, w))).astype(np.float32)
+        depth[rng.random((h, w)) < 0.02] = 0  # missing depth
+
+        ground = GroundPlane()
+        for _ in range(ground.warmup):
+            ground.update(depth, intr)
+        plane = ground.plane
+        pts = roi_points_from_depth(depth, intr, 0, int(h * 0.85), w, h, step=4)
+        t_loop = profile_ms(lambda: ransac_loop(pts), runs)
+        t_ransac = profile_ms(lambda: fit_plane_ransac(pts), runs)
+        t_update = profile_ms(lambda: ground.update(depth, intr), runs)
+        t_per_box = profile_ms(lambda: [box_heights(depth, intr, b[None], plane) for b in boxes], runs)
+        t_batched = profile_ms(lambda: box_heights(depth, intr, boxes, plane), runs)
+        # Tallest plant within the sampled upper part of each box, as boxes may overlap
+        dx, dy = (0.12 * (boxes[:, 2] - boxes[:, 0])).astype(int), (0.7 * (boxes[:, 3] - boxes[:, 1])).astype(int)
+        gt = [t[b[1] : b[1] + y, b[0] + x : b[2] - x].max() for b, x, y in zip(boxes, dx, dy)]
+        err = np.nanmean(np.abs(box_heights(depth, intr, boxes, plane) - gt)) * 100
+        rows.append(
+            [
+                npl,
+                round(t_loop, 3),
+                round(t_ransac, 3),
+                round(t_update, 3),
+                round(t_per_box, 3),
+                round(t_batched, 3),
+                round(err, 2),
+                t_update + t_batched < budget_ms,
+            ]
+        )
+
+    columns = [
+        "Plants",
+        "RANSAC loop (ms)",
+        "RANSAC batched (ms)",
+        "Plane update (ms)",
+        "Heights per-box (ms)",
+        "Heights batched (ms)",
+        "Height MAE (cm)",
+        "Within budget",
+    ]
+    df = pd.DataFrame(rows, columns=columns)
+    LOGGER.info(f"\nDepth height benchmark complete\n{df}\n")
+    return df
+
+
+if __name__ == "__main__":
+    benchmark_region_counter()
+    benchmark_depth_height()
@@ -0,0 +1,168 @@
+# Ultralytics YOLO 🚀, AGPL-3.0 license
+"""
+Micro-benchmarks of the trackers on synthetic data.
+
+Usage:
+    from benchmarks.track import benchmark_tracker, benchmark_multi_stream_tracker, benchmark_gmc
+    benchmark_tracker(objects=(100, 500, 1000))
+    benchmark_multi_stream_tracker(streams=(1, 4, 16))
+    benchmark_gmc(methods=('sparseOptFlow', 'sparseOptFlowReuse'), intervals=(1, 2, 4))
+
+Run all of them with default arguments from the repository root with `python -m benchmarks.track`.
+"""
+
+import numpy as np
+
+from ultralytics.utils import LOGGER
+from ultralytics.utils.ops import Profile
+
+
+def _synthetic_detections(n, frames, rng, obb=False):
+    """Synthetic per-frame tracker inputs of n objects moving with constant random velocities over a 1920x1080 frame."""
+    from types import SimpleNamespace
+
+    xy, v = rng.uniform((0, 0), (1920, 1080), (n, 2)), rng.normal(0, 3, (n, 2))
+    wh = rng.uniform(15, 60, (n, 2))
+    detections = []
+    for _ in range(frames):
+        xy += v
+        i = rng.random(n) > 0.1
+        box = np.concatenate((xy + rng.normal(0, 1, (n, 2)), wh + rng.normal(0, 1, (n, 2))), 1)[i]
+        r = SimpleNamespace(conf=rng.uniform(0.05, 1.0, n)[i], cls=rng.integers(0, 3, n)[i].astype(float))
+        if obb:
+            r.xywhr = np.concatenate((box, rng.uniform(0, 0.3, (len(box), 1))), 1).astype(np.float32)
+        else:
+            r.xywh = box.astype(np.float32)
+        detections.append(r)
+    return detections
+
+
+def benchmark_tracker(objects=(100, 500, 1000), trackers=("bytetrack", "botsort"), frames=30, obb=False):
+    """
+    Benchmark BYTETracker and BOTSORT updates on synthetic dense detections.
+
+    Objects move with constant random velocities over a 1920x1080 frame, with box noise, random scores and 10% missed
+    detections per frame, which exercises both association stages, lost tracks and new track initialization.
+
+    Args:
+        objects (tuple): Number of objects in the scene.
+        trackers (tuple): Tracker types to benchmark.
+        frames (int): Number of tracked frames per configuration.
+        obb (bool): Track oriented boxes matched with probiou instead of axis-aligned boxes.
+
+    Returns:
+        (pandas.DataFrame): Per-frame tracker latency in ms, frames per second and number of output tracks per frame.
+    """
+    import pandas as pd
+
+    from ultralytics.trackers.track import TRACKER_MAP
+    from ultralytics.utils import IterableSimpleNamespace, yaml_load
+    from ultralytics.utils.checks import check_yaml
+
+    rng = np.random.default_rng(0)
+    rows = []
+    for n in objects:
+        detections = _synthetic_detections(n, frames, rng, obb)
+        for name in trackers:
+            cfg = IterableSimpleNamespace(**yaml_load(check_yaml(f"{name}.yaml")))
+            tracker = TRACKER_MAP[name](args=cfg, frame_rate=30)
+            dt, tracks = Profile(), 0
+            for r in detections:
+                with dt:
+                    tracks += len(tracker.update(r))  # no image, so BOTSORT skips GMC
+            ms = dt.t / frames * 1e3
+            rows.append([name, n, round(ms, 3), round(1e3 / ms, 1), round(tracks / frames, 1)])
+
+    df = pd.DataFrame(rows, columns=["Tracker", "Objects", "Update (ms)", "FPS", "Tracks/frame"])
+    LOGGER.info(f"\nTracker benchmark complete\n{df}\n")
+    return df
+
+
+def benchmark_multi_stream_tracker(streams=(1, 4, 16), objects=100, tracker="bytetrack", frames=30):
+    """
+    Benchmark updating one tracker per stream serially against MultiStreamTracker's batched lockstep update.
+
+    Args:
+        streams (tuple): Number of video streams.
+        objects (int): Number of objects per stream.
+        tracker (str): Tracker type.
+        frames (int): Number of tracked frames per configuration.
+
+    Returns:
+        (pandas.DataFrame): Per-frame latency in ms for all streams of the serial and batched updates, and whether their
+            tracks are identical.
+    """
+    import pandas as pd
+
+    from ultralytics.trackers.multi_tracker import MultiStreamTracker
+    from ultralytics.trackers.track import TRACKER_MAP
+    from ultralytics.utils import IterableSimpleNamespace, yaml_load
+    from ultralytics.utils.checks import check_yaml
+
+    cfg = IterableSimpleNamespace(**yaml_load(check_yaml(f"{tracker}.yaml")))
+    rng = np.random.default_rng(0)
+    rows = []
+    for ns in streams:
+        detections = [_synthetic_detections(objects, frames, rng) for _ in range(ns)]
+        serial, batched = (MultiStreamTracker(TRACKER_MAP[tracker], cfg, ns) for _ in range(2))
+        t_serial, t_batched, match = Profile(), Profile(), True
+        for f in range(frames):
+            results = [d[f] for d in detections]
+            with t_serial:
+                a = [t.update(r) for t, r in zip(serial.trackers, results)]
+            with t_batched:
+                b = batched.update(results)
+            match &= all(x.shape == y.shape and np.allclose(x, y, atol=1e-3) for x, y in zip(a, b))
+        rows.append([ns, objects, round(t_serial.t / frames * 1e3, 3), round(t_batched.t / frames * 1e3, 3), match])
+
+    df = pd.DataFrame(rows, columns=["Streams", "Objects/stream", "Serial (ms)", "Batched (ms)", "Match"])
+    LOGGER.info(f"\nMulti-stream tracker benchmark complete\n{df}\n")
+    return df
+
+
+def benchmark_gmc(methods=("sparseOptFlow", "sparseOptFlowReuse"), intervals=(1, 2, 4), imgsz=(720, 1280), frames=60):
+    """
+    Benchmark global motion compensation methods and estimation intervals on a synthetic panning camera.
+
+    Frames are crops of a smooth random texture that pan by a fixed (2, 1) pixels per frame, so the true per-frame
+    warp is a pure translation and the error of every returned warp, interpolated or estimated, is known.
+
+    Args:
+        methods (tuple): GMC methods to benchmark.
+        intervals (tuple): Estimate motion every interval frames and interpolate in between.
+        imgsz (tuple): Frame size (h, w).
+        frames (int): Number of frames per configuration.
+
+    Returns:
+        (pandas.DataFrame): Mean latency per call in ms, number of motion estimates and mean per-frame translation
+            error in pixels.
+    """
+    import cv2
+    import pandas as pd
+
+    from ultralytics.trackers.utils.gmc import GMC
+
+    h, w = imgsz
+    step = np.array([2.0, 1.0])  # camera pan in pixels per frame
+    rng = np.random.default_rng(0)
+    texture = rng.integers(0, 255, (h + int(step[1] * frames) + 1, w + int(step[0] * frames) + 1, 3), dtype=np.uint8)
+    texture = cv2.GaussianBlur(texture, (0, 0), 3)
+    shifts = np.outer(range(frames), step)
+    images = [cv2.warpAffine(texture, np.float32([[1, 0, -x], [0, 1, -y]]), (w, h)) for x, y in shifts]
+    rows = []
+    for method in methods:
+        for interval in intervals:
+            gmc = GMC(method=method, interval=interval)
+            errors = [np.abs(gmc.apply(im)[:, 2] + step).sum() for im in images][1:]  # first frame initializes
+            t = gmc.timing()
+            rows.append([method, interval, round(t["ms_per_call"], 3), t["estimates"], round(np.mean(errors), 3)])
+
+    df = pd.DataFrame(rows, columns=["Method", "Interval", "Apply (ms)", "Estimates", "Error (px)"])
+    LOGGER.info(f"\nGMC benchmark complete\n{df}\n")
+    return df
+
+
+if __name__ == "__main__":
+    benchmark_tracker()
+    benchmark_multi_stream_tracker()
+    benchmark_gmc()
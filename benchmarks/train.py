@@ -0,0 +1,456 @@
+# Ultralytics YOLO 🚀, AGPL-3.0 license
+"""
+Micro-benchmarks of training data loading, augmentation and loss computation on synthetic data.
+
+Usage:
+    from benchmarks.train import benchmark_label_cache, benchmark_loss_preprocess, benchmark_assigner
+    from benchmarks.train import benchmark_transforms, benchmark_batch_augment, benchmark_random_perspective
+    benchmark_label_cache(images=(10_000, 100_000, 1_000_000))
+    benchmark_loss_preprocess(batch_sizes=(8, 16, 64), densities=(5, 50, 300))
+    benchmark_assigner(objects=(50, 200, 400), imgsz=1280)
+    benchmark_transforms(data='coco8.yaml', imgsz=640, samples=200)
+    benchmark_batch_augment(data='coco8.yaml', imgsz=640, batch=16, workers=(0, 2, 4))
+    benchmark_random_perspective(instances=(10, 50, 200), vertices=100)
+
+Run all of them with default arguments from the repository root with `python -m benchmarks.train`.
+"""
+
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+
+from benchmarks.utils import peak_memory_mb, profile_ms
+from ultralytics.utils import LOGGER
+from ultralytics.utils.torch_utils import select_device
+
+
+def benchmark_label_cache(images=(10_000, 100_000, 1_000_000), batch=16):
+    """
+    Benchmark time-to-first-batch and memory of the pickled *.cache label cache against the columnar *.lcache store.
+
+    Synthetic label sets of 0-8 boxes per image are saved in both formats, with the per-file records written by
+    YOLODataset.cache_labels(). The timed part is what YOLODataset does before its first batch, i.e. loading the
+    cache, reading the image files and building the labels of one batch.
+
+    Args:
+        images (tuple): Number of images in the label set.
+        batch (int): Batch size.
+
+    Returns:
+        (pandas.DataFrame): Cache size on disk in MB, time to first batch in seconds and resident memory increase in MB.
+    """
+    import gc
+    import tempfile
+
+    import pandas as pd
+    import psutil
+
+    from ultralytics.data.utils import load_dataset_cache_file, load_label_store, save_dataset_cache_file
+    from ultralytics.data.utils import save_label_store
+
+    rng = np.random.default_rng(0)
+    process, mb = psutil.Process(), 1 << 20
+    rows = []
+    for n in images:
+        counts = rng.integers(0, 9, n)
+        split = np.cumsum(counts)[:-1]
+        cls = np.split(rng.integers(0, 80, (counts.sum(), 1)).astype(np.float32), split)
+        bboxes = np.split(rng.random((counts.sum(), 4), dtype=np.float32), split)
+        labels = [
+            dict(
+                im_file=f"/datasets/synthetic/images/train/{i:08d}.jpg",
+                shape=(480, 640),
+                cls=c,
+                bboxes=b,
+                segments=[],
+                keypoints=None,
+                normalized=True,
+                bbox_format="xywh",
+            )
+            for i, (c, b) in enumerate(zip(cls, bboxes))
+        ]
+        stats = rng.integers(1 << 10, 1 << 62, (n, 4))  # size, mtime of image and label files
+        files = dict(stats=stats, flags=np.full(n, 2, dtype=np.uint8), msgs={}, args=(False, 80, 0, 0))
+        with tempfile.TemporaryDirectory() as d:
+            paths = {"cache": Path(d) / "train.cache", "lcache": Path(d) / "train.lcache"}
+            save_dataset_cache_file("", paths["cache"], {"labels": labels, "files": dict(files)}, "")
+            save_label_store("", paths["lcache"], {"labels": labels, "files": dict(files)}, "")
+            del labels, cls, bboxes, stats, files
+            for name, load in (("cache", load_dataset_cache_file), ("lcache", load_label_store)):
+                gc.collect()
+                rss = process.memory_info().rss
+                t = time.perf_counter()
+                x = load(paths[name])["labels"]
+                im_files = x.im_files if name == "lcache" else [lb["im_file"] for lb in x]
+                first = [x[i] for i in rng.integers(0, n, batch)]
+                t = time.perf_counter() - t
+                p = paths[name]
+                size = p.stat().st_size if p.is_file() else sum(f.stat().st_size for f in p.glob("*.npy"))
+                rss = process.memory_info().rss - rss
+                rows.append([name, n, round(size / mb, 1), round(t, 3), round(rss / mb)])
+                del x, im_files, first
+
+    df = pd.DataFrame(rows, columns=["Format", "Images", "Size (MB)", "First batch (s)", "RSS (MB)"])
+    LOGGER.info(f"\nLabel cache benchmark complete\n{df}\n")
+    return df
+
+
+def _preprocess_loop(targets, batch_size, scale_tensor, obb=False):
+    """Reference per-image loop version of v8DetectionLoss.preprocess() and v8OBBLoss.preprocess()."""
+    from ultralytics.utils.ops import xywh2xyxy
+
+    i = targets[:, 0]  # image index
+    out = torch.zeros(batch_size, i.unique(return_counts=True)[1].max(), targets.shape[1] - 1, device=targets.device)
+    for j in range(batch_size):
+        matches = i == j
+        n = matches.sum()
+        if n:
+            out[j, :n] = targets[matches, 1:]
+    if obb:
+        out[..., 1:5].mul_(scale_tensor)
+    else:
+        out[..., 1:5] = xywh2xyxy(out[..., 1:5].mul_(scale_tensor))
+    return out
+
+
+def benchmark_loss_preprocess(batch_sizes=(8, 16, 64), densities=(5, 50, 300), runs=20, device="cpu"):
+    """
+    Benchmark the per-image loop against the scatter-based target padding of the detection and OBB loss preprocess().
+
+    Args:
+        batch_sizes (tuple): Batch sizes to profile.
+        densities (tuple): Mean number of labels per image, the actual count varies from 0 to twice the mean.
+        runs (int): Timed runs per configuration.
+        device (str): Device to run on, i.e. 'cpu' or 'cuda:0'.
+
+    Returns:
+        (pandas.DataFrame): Per configuration latency of both versions in ms, speedup and whether outputs are identical.
+    """
+    import pandas as pd
+
+    from ultralytics.nn.tasks import DetectionModel, OBBModel
+    from ultralytics.utils import DEFAULT_CFG
+
+    device = select_device(device, verbose=False)
+    losses = {}
+    for task, model in (("detect", DetectionModel), ("obb", OBBModel)):
+        model = model(verbose=False)  # yolov8n.yaml or yolov8n-obb.yaml
+        model.args = DEFAULT_CFG
+        losses[task] = model.to(device).init_criterion()
+    scale = torch.tensor([640.0, 640.0, 640.0, 640.0], device=device)
+    rows = []
+    for task, loss in losses.items():
+        for bs in batch_sizes:
+            for density in densities:
+                n = torch.randint(0, 2 * density + 1, (bs,))
+                n[0] = max(n[0], 1)  # at least one label in the batch
+                i = torch.repeat_interleave(torch.arange(bs), n).float()[:, None]
+                boxes = torch.rand(len(i), 5 if task == "obb" else 4)  # xywh(r)
+                args = torch.cat((i, torch.randint(0, 80, (len(i), 1)), boxes), 1).to(device), bs, scale
+                match = torch.equal(_preprocess_loop(*args, obb=task == "obb"), loss.preprocess(*args))
+                t_loop = profile_ms(lambda: _preprocess_loop(*args, obb=task == "obb"), runs, device=device)
+                t_scatter = profile_ms(lambda: loss.preprocess(*args), runs, device=device)
+                speedup = round(t_loop / t_scatter, 2)
+                rows.append([task, bs, density, round(t_loop, 3), round(t_scatter, 3), speedup, match])
+
+    columns = ["Task", "Batch", "Labels/img", "Loop (ms)", "Scatter (ms)", "Speedup", "Match"]
+    df = pd.DataFrame(rows, columns=columns)
+    LOGGER.info(f"\nLoss preprocess benchmark complete on {device}\n{df}\n")
+    return df
+
+
+def _synthetic_assigner_inputs(bs, n, imgsz=1280, nc=80, device="cpu"):
+    """Returns TaskAlignedAssigner inputs for n random gts per image and predictions scattered around every anchor."""
+    from ultralytics.utils.tal import make_anchors
+
+    feats = [torch.zeros(bs, 1, imgsz // s, imgsz // s, device=device) for s in (8, 16, 32)]
+    anchors, stride = make_anchors(feats, torch.tensor([8, 16, 32], device=device), 0.5)
+    points = anchors * stride  # pixels
+    wh = torch.rand(bs, len(points), 2, device=device) * 60 + 5
+    pd_bboxes = torch.cat((points - wh / 2 + torch.randn_like(wh) * 5, points + wh / 2), -1)
+    pd_scores = torch.rand(bs, len(points), nc, device=device) ** 3
+    mask_gt = (torch.arange(n, device=device) < torch.randint(n // 2, n + 1, (bs, 1), device=device)).float()[..., None]
+    xy, gt_wh = torch.rand(bs, n, 2, device=device) * imgsz, torch.rand(bs, n, 2, device=device) * 80 + 8
+    gt_bboxes = torch.cat((xy - gt_wh / 2, xy + gt_wh / 2), -1) * mask_gt
+    gt_labels = torch.randint(0, nc, (bs, n, 1), device=device).float() * mask_gt
+    return pd_scores, pd_bboxes, points, gt_labels, gt_bboxes, mask_gt
+
+
+def benchmark_assigner(objects=(50, 200, 400), imgsz=1280, batch=4, chunk=32, runs=3, device="cpu"):
+    """
+    Benchmark the dense TaskAlignedAssigner against its memory-bounded chunked mode on crowded synthetic images.
+
+    Args:
+        objects (tuple): Maximum number of gts per image, every image has between half and all of them.
+        imgsz (int): Image size, which sets the number of anchors.
+        batch (int): Batch size.
+        chunk (int): Number of gts per image of the chunked mode.
+        runs (int): Timed runs per configuration.
+        device (str): Device to run on, i.e. 'cpu' or 'cuda:0'.
+
+    Returns:
+        (pandas.DataFrame): Per configuration latency in ms and peak memory in MB of both modes, and whether all
+            assigner outputs are identical.
+    """
+    import pandas as pd
+
+    from ultralytics.utils.tal import TaskAlignedAssigner
+
+    device = select_device(device, verbose=False)
+    dense = TaskAlignedAssigner(topk=10, num_classes=80, alpha=0.5, beta=6.0)
+    chunked = TaskAlignedAssigner(topk=10, num_classes=80, alpha=0.5, beta=6.0, chunk=chunk)
+    rows = []
+    for n in objects:
+        args = _synthetic_assigner_inputs(batch, n, imgsz, device=device)
+        match = all(torch.equal(a, b) for a, b in zip(dense(*args), chunked(*args)))
+        m_chunked, m_dense = (peak_memory_mb(lambda: m(*args), device) for m in (chunked, dense))
+        t_dense, t_chunked = (profile_ms(lambda: m(*args), runs, warmup=1, device=device) for m in (dense, chunked))
+        rows.append([n, round(t_dense, 1), round(t_chunked, 1), round(m_dense), round(m_chunked), match])
+
+    columns = ["Objects", "Dense (ms)", "Chunked (ms)", "Dense peak (MB)", "Chunked peak (MB)", "Match"]
+    df = pd.DataFrame(rows, columns=columns)
+    LOGGER.info(f"\nAssigner benchmark complete on {device} at imgsz={imgsz}, batch={batch}, chunk={chunk}\n{df}\n")
+    return df
+
+
+class _TimedTransform:
+    """Wraps a transform to accumulate the number of calls and time of each call under its name."""
+
+    def __init__(self, transform, name, times):
+        """Initializes the wrapper with the transform, its name and the shared {name: [calls, seconds]} dict."""
+        self.transform, self.name, self.times = transform, name, times
+
+    def __call__(self, labels):
+        """Applies and times the transform."""
+        t = time.perf_counter()
+        labels = self.transform(labels)
+        self.times[self.name][0] += 1
+        self.times[self.name][1] += time.perf_counter() - t
+        return labels
+
+
+def _profile_transforms(dataset, samples, seed=0):
+    """
+    Times every transform of a dataset's Compose pipeline, including nested ones, over the first samples images.
+
+    Returns:
+        (dict): {name: [calls, seconds]} per transform, named by its position in the pipeline, i.e. '0.0 Mosaic', and
+            'Total' for the whole __getitem__() including image loading.
+    """
+    import random
+
+    from ultralytics.data.augment import Compose
+
+    times = {}
+
+    def wrap(compose, prefix=""):
+        for i, t in enumerate(compose.transforms):
+            name = f"{prefix}{i} {type(t).__name__}"
+            if isinstance(t, Compose):
+                wrap(t, f"{prefix}{i}.")
+            times[name] = [0, 0.0]
+            compose.transforms[i] = _TimedTransform(t, name, times)
+
+    wrap(dataset.transforms)
+    times["Total"] = [samples, 0.0]
+    random.seed(seed)
+    np.random.seed(seed)
+    t = time.perf_counter()
+    for i in range(samples):
+        dataset[i % len(dataset)]
+    times["Total"][1] = time.perf_counter() - t
+    return dict(sorted(times.items(), key=lambda x: x[0].split(" ")[0] if x[0] != "Total" else "~"))
+
+
+def benchmark_transforms(data="coco8.yaml", imgsz=640, samples=200, reuse_canvas=(False, True)):
+    """
+    Profile every transform of the YOLO training augmentation pipeline, with new and reused mosaic canvases.
+
+    Args:
+        data (str): Dataset yaml, the train split is used with default training hyperparameters.
+        imgsz (int): Image size.
+        samples (int): Number of images drawn, from the start of the dataset, repeating if it is smaller.
+        reuse_canvas (tuple): Mosaic canvas modes to compare.
+
+    Returns:
+        (pandas.DataFrame): Per transform number of calls and mean time per image in ms of each canvas mode. Nested
+            transforms are also included in their parent's time, 'Total' includes image loading.
+    """
+    import pandas as pd
+
+    from ultralytics.cfg import get_cfg
+    from ultralytics.data import build_yolo_dataset
+    from ultralytics.data.augment import Mosaic
+    from ultralytics.data.utils import check_det_dataset
+
+    cfg, data = get_cfg(overrides=dict(imgsz=imgsz)), check_det_dataset(data)
+    columns, results = ["Transform", "Calls"], []
+    for reuse in reuse_canvas:
+        dataset = build_yolo_dataset(cfg, data["train"], 16, data, mode="train")
+        for t in dataset.transforms.transforms[0].transforms:  # v8_transforms pre_transform
+            if isinstance(t, Mosaic):
+                t.reuse_canvas = reuse
+        results.append(_profile_transforms(dataset, samples))
+        columns.append(f"{'Reused' if reuse else 'New'} canvas (ms/img)")
+    rows = [[k, v[0]] + [round(r[k][1] / samples * 1e3, 3) for r in results] for k, v in results[0].items()]
+    df = pd.DataFrame(rows, columns=columns)
+    LOGGER.info(f"\nTransforms benchmark complete for {samples} images at imgsz={imgsz}\n{df}\n")
+    return df
+
+
+def _loader_throughput(loader, batches, fn=None):
+    """Returns images per second of the first `batches` batches of a dataloader after one warmup batch."""
+    n, t, seen = 0, None, 0
+    while seen <= batches:
+        for batch in loader:
+            if fn is not None:
+                batch = fn(batch)
+            if seen == 0:
+                t = time.perf_counter()  # exclude worker startup
+            else:
+                n += len(batch["img"])
+            seen += 1
+            if seen > batches:
+                break
+    return n / (time.perf_counter() - t)
+
+
+def benchmark_batch_augment(data="coco8.yaml", imgsz=640, batch=16, workers=(0, 2, 4), batches=10, device="cpu"):
+    """
+    Compare training dataloader throughput with HSV, flip and affine augmentations per image and on whole batches.
+
+    On a CPU-only machine the batched augmentations measured 21-24 img/s against 50 img/s per image in the dataloader
+    workers, so batch_augment is intended for GPU training.
+
+    Args:
+        data (str): Dataset yaml, the train split is used with default training hyperparameters.
+        imgsz (int): Image size.
+        batch (int): Batch size.
+        workers (tuple): Dataloader worker counts to compare.
+        batches (int): Number of timed batches, after one warmup batch.
+        device (str): Device of the batched augmentations, i.e. 'cpu' to also vectorize them on CPU-only torch.
+
+    Returns:
+        (pandas.DataFrame): Images per second with per-image and batched augmentations for every worker count. Both
+            include the uint8 to float conversion of the batch on `device`.
+    """
+    import pandas as pd
+
+    from ultralytics.cfg import get_cfg
+    from ultralytics.data import build_dataloader, build_yolo_dataset
+    from ultralytics.data.augment import BATCH_AUGMENTS, BatchAugment
+    from ultralytics.data.utils import check_det_dataset
+
+    data, device = check_det_dataset(data), select_device(device, verbose=False)
+    per_image = get_cfg(overrides=dict(imgsz=imgsz))
+    batched = get_cfg(overrides=dict(imgsz=imgsz, batch_augment=",".join(BATCH_AUGMENTS)))
+    augment = BatchAugment(batched, BATCH_AUGMENTS)
+
+    def to_float(batch):
+        batch["img"] = batch["img"].to(device).float() / 255
+        return batch
+
+    rows = []
+    for w in workers:
+        speeds = []
+        for cfg, fn in ((per_image, to_float), (batched, lambda b: augment(to_float(b)))):
+            dataset = build_yolo_dataset(cfg, data["train"], batch, data, mode="train")
+            speeds.append(_loader_throughput(build_dataloader(dataset, batch, w, shuffle=True, rank=-1), batches, fn))
+        rows.append([w, round(speeds[0], 1), round(speeds[1], 1), round(speeds[1] / speeds[0], 2)])
+    df = pd.DataFrame(rows, columns=["Workers", "Per-image (img/s)", "Batched (img/s)", "Speedup"])
+    LOGGER.info(f"\nBatch augment benchmark complete for batch={batch} at imgsz={imgsz} on {device}\n{df}\n")
+    return df
+
+
+def _resample_segments_loop(segments, n=1000):
+    """Reference per-segment np.interp() version of ops.resample_segments()."""
+    out = []
+    for s in segments:
+        s = np.concatenate((s, s[0:1, :]), axis=0)
+        x, xp = np.linspace(0, len(s) - 1, n), np.arange(len(s))
+        out.append(np.concatenate([np.interp(x, xp, s[:, i]) for i in range(2)], dtype=np.float32).reshape(2, -1).T)
+    return np.stack(out, 0)
+
+
+def _apply_segments_loop(self, segments, M):
+    """Reference per-segment segment2box() version of RandomPerspective.apply_segments()."""
+    from ultralytics.utils.ops import segment2box
+
+    n, num = segments.shape[:2]
+    xy = np.ones((n * num, 3), dtype=segments.dtype)
+    xy[:, :2] = segments.reshape(-1, 2)
+    xy = xy @ M.T
+    segments = (xy[:, :2] / xy[:, 2:3]).reshape(n, -1, 2)
+    bboxes = np.stack([segment2box(xy, self.size[0], self.size[1]) for xy in segments], 0)
+    segments[..., 0] = segments[..., 0].clip(bboxes[:, 0:1], bboxes[:, 2:3])
+    segments[..., 1] = segments[..., 1].clip(bboxes[:, 1:2], bboxes[:, 3:4])
+    return bboxes, segments
+
+
+def benchmark_random_perspective(instances=(10, 50, 200), vertices=100, imgsz=640, runs=20):
+    """
+    Benchmark the per-segment loops against the packed segment resampling and RandomPerspective label transforms.
+
+    Each image is a synthetic 2 * imgsz mosaic with random polygons, cropped to imgsz with default hyperparameters
+    like in segmentation training. 'Crop only' is the same crop without any random affine, a whole pixel shift that is
+    copied instead of warped.
+
+    Args:
+        instances (tuple): Numbers of polygons per image.
+        vertices (int): Maximum number of vertices per polygon, each has 3 to `vertices`.
+        imgsz (int): Image size.
+        runs (int): Number of timed runs.
+
+    Returns:
+        (pandas.DataFrame): Mean time per image in ms for every stage and number of polygons.
+    """
+    import types
+
+    import cv2
+    import pandas as pd
+
+    from ultralytics.data.augment import RandomPerspective
+    from ultralytics.utils.instance import Instances
+    from ultralytics.utils.ops import resample_segments
+
+    rng, size = np.random.default_rng(0), imgsz * 2
+    img = rng.integers(0, 256, (size, size, 3), dtype=np.uint8)
+    rows = []
+    for n in instances:
+        polygons = [(rng.random((rng.integers(3, vertices + 1), 2)) * size).astype(np.float32) for _ in range(n)]
+        segments = resample_segments(polygons)
+        bboxes = np.concatenate((segments.min(1), segments.max(1)), 1)
+
+        def perspective(t):
+            """Applies transform t to a fresh copy of the labels."""
+            instances = Instances(bboxes.copy(), segments.copy(), bbox_format="xyxy", normalized=False)
+            return t(dict(img=img, cls=np.zeros((n, 1)), instances=instances, mosaic_border=(-imgsz // 2,) * 2))
+
+        loop, packed = RandomPerspective(), RandomPerspective()
+        loop.apply_segments = types.MethodType(_apply_segments_loop, loop)
+        warp, shift = RandomPerspective(translate=0, scale=0), RandomPerspective(translate=0, scale=0)
+        warp.shift_image = lambda im, dx, dy: cv2.warpAffine(
+            im, np.float32([[1, 0, dx], [0, 1, dy]]), dsize=warp.size, borderValue=(114, 114, 114)
+        )
+        stages = {
+            "Resample": (lambda: _resample_segments_loop(polygons), lambda: resample_segments(polygons)),
+            "Perspective": (lambda: perspective(loop), lambda: perspective(packed)),
+            "Crop only": (lambda: perspective(warp), lambda: perspective(shift)),
+        }
+        for stage, (before, after) in stages.items():
+            t0, t1 = profile_ms(before, runs), profile_ms(after, runs)
+            rows.append([n, stage, round(t0, 3), round(t1, 3), round(t0 / t1, 2)])
+    df = pd.DataFrame(rows, columns=["Instances", "Stage", "Loop (ms)", "Packed (ms)", "Speedup"])
+    LOGGER.info(f"\nRandomPerspective benchmark complete for imgsz={imgsz}\n{df}\n")
+    return df
+
+
+if __name__ == "__main__":
+    benchmark_label_cache()
+    benchmark_loss_preprocess()
+    benchmark_assigner()
+    benchmark_transforms()
+    benchmark_batch_augment()
+    benchmark_random_perspective()
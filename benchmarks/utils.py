@@ -0,0 +1,48 @@
+# Ultralytics YOLO 🚀, AGPL-3.0 license
+"""Shared helpers of the micro-benchmarks."""
+
+import time
+
+import torch
+
+from ultralytics.utils.ops import Profile
+
+
+def profile_ms(fn, runs=10, warmup=2, device=None):
+    """Returns the mean wall time of fn() in milliseconds over a number of runs, after warmup runs."""
+    for _ in range(warmup):
+        fn()
+    dt = Profile(device=device)
+    for _ in range(runs):
+        with dt:
+            fn()
+    return dt.t / runs * 1e3
+
+
+def peak_memory_mb(fn, device):
+    """Returns the peak memory increase in MB while running fn(), CUDA allocations on GPU or sampled RSS on CPU."""
+    if device.type == "cuda":
+        torch.cuda.synchronize(device)
+        torch.cuda.reset_peak_memory_stats(device)
+        start = torch.cuda.memory_allocated(device)
+        fn()
+        return (torch.cuda.max_memory_allocated(device) - start) / (1 << 20)
+
+    import threading
+
+    import psutil
+
+    process, done, peak = psutil.Process(), threading.Event(), []
+    start = process.memory_info().rss
+
+    def sample():
+        while not done.is_set():
+            peak.append(process.memory_info().rss)
+            time.sleep(0.001)
+
+    thread = threading.Thread(target=sample, daemon=True)
+    thread.start()
+    fn()
+    done.set()
+    thread.join()
+    return (max(peak + [process.memory_info().rss]) - start) / (1 << 20)
@@ -0,0 +1,156 @@
+# Ultralytics YOLO 🚀, AGPL-3.0 license
+"""
+Micro-benchmarks of validation metrics on synthetic data.
+
+Usage:
+    from benchmarks.val import benchmark_match_predictions, benchmark_ap_histogram
+    benchmark_match_predictions(detections=(10, 100, 300), labels=(5, 50, 200))
+    benchmark_ap_histogram(detections=(100_000, 1_000_000, 5_000_000), bins=(100, 1000, 10000))
+
+Run all of them with default arguments from the repository root with `python -m benchmarks.val`.
+"""
+
+import time
+
+import numpy as np
+import torch
+
+from benchmarks.utils import profile_ms
+from ultralytics.utils import LOGGER
+from ultralytics.utils.torch_utils import select_device
+
+
+def _match_predictions_loop(pred_classes, true_classes, iou, iouv):
+    """Reference per-threshold NumPy version of BaseValidator.match_predictions()."""
+    correct = np.zeros((pred_classes.shape[0], iouv.shape[0])).astype(bool)
+    iou = (iou * (true_classes[:, None] == pred_classes)).cpu().numpy()
+    for i, threshold in enumerate(iouv.cpu().tolist()):
+        matches = np.array(np.nonzero(iou >= threshold)).T
+        if matches.shape[0]:
+            if matches.shape[0] > 1:
+                matches = matches[iou[matches[:, 0], matches[:, 1]].argsort()[::-1]]
+                matches = matches[np.unique(matches[:, 1], return_index=True)[1]]
+                matches = matches[np.unique(matches[:, 0], return_index=True)[1]]
+            correct[matches[:, 1].astype(int), i] = True
+    return torch.tensor(correct, dtype=torch.bool, device=pred_classes.device)
+
+
+def benchmark_match_predictions(detections=(10, 100, 300), labels=(5, 50, 200), nc=5, runs=20, device="cpu"):
+    """
+    Benchmark the per-threshold NumPy loop against the single-pass BaseValidator.match_predictions().
+
+    Detections are jittered copies of the labels plus random boxes, so every image has overlapping candidates of the
+    same class at all IoU thresholds.
+
+    Args:
+        detections (tuple): Number of detections per image.
+        labels (tuple): Number of labels per image.
+        nc (int): Number of classes, fewer classes give more competing candidates.
+        runs (int): Timed runs per configuration.
+        device (str): Device to run on, i.e. 'cpu' or 'cuda:0'.
+
+    Returns:
+        (pandas.DataFrame): Per configuration latency of both versions in ms, speedup and whether outputs are identical.
+    """
+    from types import SimpleNamespace
+
+    import pandas as pd
+
+    from ultralytics.engine.validator import BaseValidator
+    from ultralytics.utils.metrics import box_iou
+
+    device = select_device(device, verbose=False)
+    validator = SimpleNamespace(iouv=torch.linspace(0.5, 0.95, 10, device=device))
+    rows = []
+    for nd in detections:
+        for nl in labels:
+            xy, wh = torch.rand(nl, 2) * 600, torch.rand(nl, 2) * 80 + 10
+            gt = torch.cat((xy, xy + wh), 1)
+            det = gt[torch.randint(0, nl, (nd,))] + torch.randn(nd, 4) * 4  # jittered duplicates
+            det[nd // 2 :, :2] = torch.rand(nd - nd // 2, 2) * 600  # and random boxes
+            det[nd // 2 :, 2:] = det[nd // 2 :, :2] + torch.rand(nd - nd // 2, 2) * 80 + 10
+            args = torch.randint(0, nc, (nd,)).to(device), torch.randint(0, nc, (nl,)).to(device)
+            args += (box_iou(gt, det).to(device),)
+            match = torch.equal(
+                _match_predictions_loop(*args, validator.iouv), BaseValidator.match_predictions(validator, *args)
+            )
+            t_loop = profile_ms(lambda: _match_predictions_loop(*args, validator.iouv), runs, device=device)
+            t_fast = profile_ms(lambda: BaseValidator.match_predictions(validator, *args), runs, device=device)
+            rows.append([nd, nl, round(t_loop, 3), round(t_fast, 3), round(t_loop / t_fast, 2), match])
+
+    columns = ["Detections", "Labels", "Loop (ms)", "Single-pass (ms)", "Speedup", "Match"]
+    df = pd.DataFrame(rows, columns=columns)
+    LOGGER.info(f"\nMatch predictions benchmark complete on {device}\n{df}\n")
+    return df
+
+
+def benchmark_ap_histogram(detections=(100_000, 1_000_000, 5_000_000), bins=(100, 1000, 10000), nc=80, batch=10_000):
+    """
+    Benchmark exact ap_per_class() against streaming APHistogram metrics for accuracy, latency and memory.
+
+    Synthetic predictions have confidences in [0.001, 1] and IoUs correlated with their confidence, so true positives
+    at all IoU thresholds concentrate at high confidence like real validation statistics.
+
+    Args:
+        detections (tuple): Total number of predictions of the validation set.
+        bins (tuple): Number of histogram confidence bins.
+        nc (int): Number of classes.
+        batch (int): Number of predictions added to the histograms per update() call.
+
+    Returns:
+        (pandas.DataFrame): Per configuration mAP50 and mAP50-95 of both methods and their absolute error, final
+            metrics latency in ms of exact AP and of streaming updates plus AP, and the memory held in MB by each.
+    """
+    import pandas as pd
+
+    from ultralytics.utils.metrics import APHistogram, ap_per_class
+
+    rng = np.random.default_rng(0)
+    iouv = np.linspace(0.5, 0.95, 10)
+    rows = []
+    for n in detections:
+        conf = rng.uniform(0.001, 1, n).astype(np.float32) ** 2
+        iou = np.clip(conf**0.5 + rng.normal(0, 0.25, n), 0, 1)
+        tp = iou[:, None] >= iouv  # (n, 10)
+        pred_cls = rng.integers(0, nc, n).astype(np.float32)
+        target_cls = rng.integers(0, nc, int(tp[:, 0].sum() * 1.25)).astype(np.float32)  # recall < 1
+
+        t = time.perf_counter()
+        ap = ap_per_class(tp, conf, pred_cls, target_cls, names={})[5]
+        t_exact = (time.perf_counter() - t) * 1e3
+        m_exact = (tp.nbytes + conf.nbytes + pred_cls.nbytes + target_cls.nbytes) / (1 << 20)
+        for b in bins:
+            t = time.perf_counter()
+            hist = APHistogram(nc, len(iouv), b)
+            tensors = [torch.from_numpy(x) for x in (tp, conf, pred_cls)]
+            for i in range(0, n, batch):
+                hist.update(*(x[i : i + batch] for x in tensors), torch.zeros(0))
+            hist.nt += torch.bincount(torch.from_numpy(target_cls).long(), minlength=nc)  # targets in one update
+            ap_hist = ap_per_class(hist, None, None, None, names={})[5]
+            t_hist = (time.perf_counter() - t) * 1e3
+            m_hist = sum(x.element_size() * x.numel() for x in (hist.n, hist.tp, hist.nt)) / (1 << 20)
+            rows.append(
+                [
+                    n,
+                    b,
+                    round(ap[:, 0].mean(), 5),
+                    round(ap_hist[:, 0].mean(), 5),
+                    round(ap.mean(), 5),
+                    round(ap_hist.mean(), 5),
+                    round(abs(ap.mean() - ap_hist.mean()), 5),
+                    round(t_exact, 1),
+                    round(t_hist, 1),
+                    round(m_exact, 1),
+                    round(m_hist, 1),
+                ]
+            )
+
+    columns = ["Preds", "Bins", "mAP50", "Hist mAP50", "mAP50-95", "Hist mAP50-95", "Error", "Exact (ms)", "Hist (ms)"]
+    df = pd.DataFrame(rows, columns=columns + ["Exact (MB)", "Hist (MB)"])
+    LOGGER.info(f"\nAP histogram benchmark complete\n{df}\n")
+    return df
+
+
+if __name__ == "__main__":
+    benchmark_match_predictions()
+    benchmark_ap_histogram()
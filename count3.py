@@ -15,8 +15,10 @@ from typing import Optional, Tuple
 
 import cv2
 import numpy as np
-from shapely.geometry import Polygon, Point
+from shapely.geometry import Polygon
 from ultralytics import YOLO
+from ultralytics.solutions.depth_height import GroundPlane, box_heights
+from ultralytics.solutions.region_counter import RegionCounter
 from ultralytics.utils.plotting import Annotator, colors
 
 # 允许 MKL/OpenMP 共存
@@ -67,6 +69,16 @@ counting_regions = [
     },
 ]
 
+# 所有质心 × 所有区域一次性向量化判定（替代逐框 shapely contains）
+region_counter = RegionCounter({r['name']: r['polygon'].exterior.coords[:-1] for r in counting_regions})
+
+
+def _count_regions(boxes, tids):
+    counts = region_counter.update(boxes, tids)
+    for region, n, seen in zip(counting_regions, counts, region_counter.seen_ids):
+        region['counts'], region['seen_ids'] = int(n), seen
+
+
 # ---------------- 轨迹与株高平滑 ----------------
 track_history = defaultdict(list)
 heights_win = defaultdict(lambda: deque(maxlen=5))
@@ -198,109 +210,6 @@ def _iterate_bag_frames(bag_path: str, max_consec_timeout: int = 20, first_frame
             pass
 
 
-def _roi_points_from_depth(depth_m: np.ndarray, intr, x1, y1, x2, y2, step=4):
-    H, W = depth_m.shape[:2]
-    x1, y1 = max(0, x1), max(0, y1)
-    x2, y2 = min(W - 1, x2), min(H - 1, y2)
-    if x2 <= x1 or y2 <= y1:
-        return None
-    xs = np.arange(x1, x2, step, dtype=np.int32)
-    ys = np.arange(y1, y2, step, dtype=np.int32)
-    if xs.size == 0 or ys.size == 0:
-        return None
-    gx, gy = np.meshgrid(xs, ys)
-    z = depth_m[gy, gx].astype(np.float32)
-    mask = np.isfinite(z) & (z > 0.05) & (z < 10.0)
-    if not np.any(mask):
-        return None
-    u = gx[mask].astype(np.float32)
-    v = gy[mask].astype(np.float32)
-    z = z[mask]
-    X = (u - intr.ppx) / intr.fx * z
-    Y = (v - intr.ppy) / intr.fy * z
-    P = np.stack([X, Y, z], axis=1)
-    return P
-
-
-def _fit_plane_ransac(points: np.ndarray, iters=300, dist_thresh=0.004):
-    if points is None or len(points) < 100:
-        return None
-    pts = points
-    N = pts.shape[0]
-    best_inl = -1
-    best_n = None;
-    best_d = None;
-    best_mask = None
-    rng = np.random.default_rng(123)
-
-    for _ in range(iters):
-        idx = rng.choice(N, size=3, replace=False)
-        p0, p1, p2 = pts[idx]
-        v1 = p1 - p0;
-        v2 = p2 - p0
-        n = np.cross(v1, v2)
-        norm = np.linalg.norm(n)
-        if norm < 1e-6:
-            continue
-        n = n / norm
-        d = -np.dot(n, p0)
-        dist = np.abs(pts @ n + d)
-        mask = dist < dist_thresh
-        ninl = int(mask.sum())
-        if ninl > best_inl:
-            best_inl = ninl
-            best_n = n;
-            best_d = d
-            best_mask = mask
-
-    if best_inl < 100:
-        return None
-
-    P = pts[best_mask]
-    cen = P.mean(axis=0)
-    Q = P - cen
-    _, _, vh = np.linalg.svd(Q, full_matrices=False)
-    n = vh[-1, :]
-    n = n / np.linalg.norm(n)
-    d = -np.dot(n, cen)
-    if n[2] > 0:
-        n = -n;
-        d = -d
-    return (n.astype(np.float32), float(d))
-
-
-def _estimate_ground_plane(depth_m: np.ndarray, intr):
-    H, W = depth_m.shape[:2]
-    y0 = int(H * 0.85)
-    pts = _roi_points_from_depth(depth_m, intr, 0, y0, W, H, step=4)
-    if pts is None:
-        return None
-    return _fit_plane_ransac(pts, iters=300, dist_thresh=0.004)
-
-
-def _height_from_box_plane(depth_m, box, intr, plane, top_ratio=0.02, step=2) -> Optional[float]:
-    n, d = plane
-    x1, y1, x2, y2 = [int(round(v)) for v in box]
-    w = x2 - x1;
-    h = y2 - y1
-    if w < 6 or h < 6:
-        return None
-    shrink = 0.12
-    x1 = x1 + int(w * shrink)
-    x2 = x2 - int(w * shrink)
-    y2 = y1 + int(h * 0.70)
-    pts = _roi_points_from_depth(depth_m, intr, x1, y1, x2, y2, step=step)
-    if pts is None or pts.shape[0] < 40:
-        return None
-    h = pts @ n + d
-    h = h[(h > 0.0) & (h < 1.5)]
-    if h.size < 20:
-        return None
-    k = max(10, int(top_ratio * h.size))
-    idx = np.argpartition(h, -k)[-k:]
-    return float(np.median(h[idx]))
-
-
 # ================== 核心运行逻辑 ==================
 def run(
         weights='models/best.pt',
@@ -338,9 +247,7 @@ def run(
     out_path = save_dir / f'{Path(source).stem}.mp4'
     default_bag_fps = 25
 
-    PLANE_FRAMES = 10
-    plane_buf = []
-    plane_nd = None
+    ground = GroundPlane(warmup=10)
 
     heights_all = []
 
@@ -374,11 +281,7 @@ def run(
                     pts = np.hstack(tr).astype(np.int32).reshape((-1, 1, 2))
                     cv2.polylines(frame, [pts], False, colors(cls, True), track_thickness)
 
-                    for region in counting_regions:
-                        if region['polygon'].contains(Point((cx, cy))):
-                            if tid not in region['seen_ids']:
-                                region['counts'] += 1
-                                region['seen_ids'].add(tid)
+                _count_regions(boxes, tids)
 
             _draw_counts_top_left(frame, counting_regions)
             if save_img:
@@ -399,21 +302,7 @@ def run(
                 fourcc = cv2.VideoWriter_fourcc(*'mp4v')
                 writer = cv2.VideoWriter(str(out_path), fourcc, default_bag_fps, (w, h))
 
-            if plane_nd is None:
-                est = _estimate_ground_plane(depth_m, intr)
-                if est is not None:
-                    plane_buf.append(est)
-                    if len(plane_buf) >= PLANE_FRAMES:
-                        ns = np.stack([p[0] for p in plane_buf], axis=0)
-                        ns = ns / np.linalg.norm(ns, axis=1, keepdims=True)
-                        n_mean = ns.mean(axis=0)
-                        n_mean = n_mean / np.linalg.norm(n_mean)
-                        ds = np.array([p[1] for p in plane_buf], dtype=np.float32)
-                        d_med = float(np.median(ds))
-                        if d_med < 0:
-                            n_mean = -n_mean;
-                            d_med = -d_med
-                        plane_nd = (n_mean.astype(np.float32), d_med)
+            plane_nd = ground.update(depth_m, intr)
 
             results = model.track(frame, persist=True, classes=classes, conf=0.25, tracker=TRACKER_PATH)
 
@@ -423,12 +312,15 @@ def run(
                 tids_t = results[0].boxes.id
                 tids = tids_t.int().cpu().tolist() if tids_t is not None else [None] * len(boxes)
 
+                boxes_px = boxes.numpy().round().astype(int)
+                boxes_px[:, 0::2] = boxes_px[:, 0::2].clip(0, w - 1)
+                boxes_px[:, 1::2] = boxes_px[:, 1::2].clip(0, h - 1)
+                h_all = box_heights(depth_m, intr, boxes_px, plane_nd) if plane_nd is not None else None
+
                 ann = Annotator(frame, line_width=line_thickness, example=str(names))
-                for box, tid, cls in zip(boxes, tids, clss):
+                for i, (box, tid, cls) in enumerate(zip(boxes, tids, clss)):
                     ann.box_label(box, str(names[cls]), color=colors(cls, True))
-                    x1, y1, x2, y2 = [int(round(v)) for v in box.tolist()]
-                    x1, y1 = max(0, x1), max(0, y1)
-                    x2, y2 = min(w - 1, x2), min(h - 1, y2)
+                    x1, y1, x2, y2 = boxes_px[i].tolist()
 
                     if tid is not None:
                         cx = int((x1 + x2) / 2);
@@ -439,26 +331,9 @@ def run(
                             tr.pop(0)
                         pts = np.hstack(tr).astype(np.int32).reshape((-1, 1, 2))
                         cv2.polylines(frame, [pts], False, colors(cls, True), track_thickness)
-                    else:
-                        cx = int((x1 + x2) / 2);
-                        cy = int((y1 + y2) / 2)
 
-                    for region in counting_regions:
-                        if region['polygon'].contains(Point((cx, cy))):
-                            if tid is not None and tid not in region['seen_ids']:
-                                region['counts'] += 1
-                                region['seen_ids'].add(tid)
-
-                    if plane_nd is not None:
-                        h_raw = _height_from_box_plane(depth_m, (x1, y1, x2, y2), intr, plane_nd,
-                                                       top_ratio=0.02, step=2)
-                        if h_raw is None:
-                            pts_fb = _roi_points_from_depth(depth_m, intr, x1, y1, x2, y2, step=3)
-                            if pts_fb is not None and pts_fb.shape[0] >= 20:
-                                hh = pts_fb @ plane_nd[0] + plane_nd[1]
-                                hh = hh[(hh > 0.0) & (hh < 1.5)]
-                                if hh.size >= 10:
-                                    h_raw = float(np.percentile(hh, 95.0))
+                    if h_all is not None:
+                        h_raw = None if np.isnan(h_all[i]) else float(h_all[i])
                         h_show = _smooth_height_by_id(tid, h_raw) if tid is not None else h_raw
                         if h_show is not None:
                             heights_all.append(h_show)
@@ -466,6 +341,8 @@ def run(
                                         (x1, max(0, y1 - 8)),
                                         cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
 
+                _count_regions(boxes, tids_t)
+
             _draw_counts_top_left(frame, counting_regions)
 
             if save_img and writer is not None:
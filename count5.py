@@ -6,6 +6,7 @@ import cv2
 import numpy as np
 from shapely.geometry import Polygon, Point
 from ultralytics import YOLO
+from ultralytics.solutions.region_counter import RegionCounter
 from ultralytics.utils.files import increment_path
 from ultralytics.utils.plotting import Annotator, colors
 import tkinter as tk
@@ -53,6 +54,10 @@ counting_regions = [
         'text_color': (0, 0, 0)
     }
 ]
+# 所有质心 × 所有区域一次性向量化判定（替代逐框 shapely contains）
+region_counter = RegionCounter({r['name']: r['polygon'].exterior.coords[:-1] for r in counting_regions})
+
+
 def _smooth_height_by_id(tid, h_raw):
     """对同一 track 的高度做“窗口中值 + EMA + 每帧限幅”；无新值时沿用上一帧，保证持续显示。"""
     if tid is None:
@@ -119,6 +124,8 @@ def mouse_callback(event, x, y, flags, param):
             dy = y - current_region['offset_y']
             current_region['polygon'] = Polygon([
                 (p[0] + dx, p[1] + dy) for p in current_region['polygon'].exterior.coords])
+            region_counter.set_region(counting_regions.index(current_region),
+                                      current_region['polygon'].exterior.coords[:-1])
             current_region['offset_x'] = x
             current_region['offset_y'] = y
     elif event == cv2.EVENT_LBUTTONUP:
@@ -405,11 +412,9 @@ def run(
                         cv2.polylines(frame, [points], isClosed=False,
                                       color=colors(cls, True), thickness=track_thickness)
 
-                        for region in counting_regions:
-                            if region['polygon'].contains(Point((bbox_center[0], bbox_center[1]))):
-                                if track_id not in region['seen_ids']:
-                                    region['counts'] += 1
-                                    region['seen_ids'].add(track_id)
+                    counts = region_counter.update(boxes, track_ids)
+                    for region, n, seen in zip(counting_regions, counts, region_counter.seen_ids):
+                        region['counts'], region['seen_ids'] = int(n), seen
 
                 # 绘区域 & 文本（不改）
                 for region in counting_regions:
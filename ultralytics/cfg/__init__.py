@@ -130,9 +130,12 @@ CFG_INT_KEYS = {
     "close_mosaic",
     "mask_ratio",
     "max_det",
+    "ap_bins",
     "vid_stride",
+    "save_workers",
     "line_width",
     "nbs",
+    "tal_chunk",
     "save_period",
 }
 CFG_BOOL_KEYS = {
@@ -160,8 +163,14 @@ CFG_BOOL_KEYS = {
     "visualize",
     "augment",
     "agnostic_nms",
+    "batch_nms",
+    "lazy_labels",
+    "pipeline",
     "retina_masks",
+    "roi_masks",
+    "compact_masks",
     "show_boxes",
+    "show_counts",
     "keras",
     "optimize",
     "int8",
@@ -169,7 +178,9 @@ CFG_BOOL_KEYS = {
     "simplify",
     "nms",
     "profile",
+    "profile_transforms",
     "multi_scale",
+    "prefetch",
 }
 
 
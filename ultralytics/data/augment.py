@@ -2,19 +2,21 @@
 
 import math
 import random
+import time
 from copy import deepcopy
 from typing import Tuple, Union
 
 import cv2
 import numpy as np
 import torch
+import torch.nn.functional as F
 import torchvision.transforms as T
 
 from ultralytics.utils import LOGGER, colorstr
 from ultralytics.utils.checks import check_version
 from ultralytics.utils.instance import Instances
 from ultralytics.utils.metrics import bbox_ioa
-from ultralytics.utils.ops import segment2box, xyxyxyxy2xywhr
+from ultralytics.utils.ops import xywh2xyxy, xyxy2xywh, xyxyxyxy2xywhr
 from ultralytics.utils.torch_utils import TORCHVISION_0_10, TORCHVISION_0_11, TORCHVISION_0_13
 from .utils import polygons2masks, polygons2masks_overlap
 
@@ -63,18 +65,51 @@ class BaseTransform:
 
 
 class Compose:
-    """Class for composing multiple image transformations."""
+    """
+    Class for composing multiple image transformations.
+
+    With profiling enabled, the wall time and output image size of every transform, including those of nested Compose
+    transforms, are recorded per sample as {name: (seconds, bytes)} under the 'transform_profile' key of the output, so
+    that they can be collated with the batch and aggregated across dataloader workers.
+    """
 
     def __init__(self, transforms):
         """Initializes the Compose object with a list of transforms."""
         self.transforms = transforms if isinstance(transforms, list) else [transforms]
+        self.profile = False
 
     def __call__(self, data):
         """Applies a series of transformations to input data."""
+        if self.profile:
+            return self._profiled_call(data)
         for t in self.transforms:
             data = t(data)
         return data
 
+    def _profiled_call(self, data):
+        """Applies the transformations and records their time and output image size in data['transform_profile']."""
+        names = [type(t).__name__ for t in self.transforms]
+        profile = {}
+        for i, (t, name) in enumerate(zip(self.transforms, names)):
+            t0 = time.perf_counter()
+            data = t(data)
+            dt = time.perf_counter() - t0
+            if isinstance(t, Compose):  # nested transforms are recorded individually
+                profile.update(data.pop("transform_profile", {}))
+                continue
+            if names.count(name) > 1:  # i.e. vertical and horizontal RandomFlip
+                name = f"{name}_{names[:i].count(name) + 1}"
+            profile[name] = dt, getattr(data.get("img"), "nbytes", 0)
+        data["transform_profile"] = profile
+        return data
+
+    def enable_profiling(self, enabled=True):
+        """Enables or disables recording of per-transform time and output size, including nested Compose transforms."""
+        self.profile = enabled
+        for t in self.transforms:
+            if isinstance(t, Compose):
+                t.enable_profiling(enabled)
+
     def append(self, transform):
         """Appends a new transform to the existing list of transforms."""
         self.transforms.append(transform)
@@ -186,9 +221,13 @@ class Mosaic(BaseMixTransform):
         imgsz (int, optional): Image size (height and width) after mosaic pipeline of a single image. Default to 640.
         p (float, optional): Probability of applying the mosaic augmentation. Must be in the range 0-1. Default to 1.0.
         n (int, optional): The grid size, either 4 (for 2x2) or 9 (for 3x3).
+        reuse_canvas (bool, optional): Build every mosaic in the same preallocated canvas of this transform (one per
+            dataloader worker) instead of allocating a new one. The returned image is then a view of the canvas that is
+            overwritten by the next mosaic, so it must be copied or warped into a new image by a following transform,
+            like RandomPerspective in v8_transforms(). Default to False.
     """
 
-    def __init__(self, dataset, imgsz=640, p=1.0, n=4):
+    def __init__(self, dataset, imgsz=640, p=1.0, n=4, reuse_canvas=False):
         """Initializes the object with a dataset, image size, probability, and border."""
         assert 0 <= p <= 1.0, f"The probability should be in range [0, 1], but got {p}."
         assert n in {4, 9}, "grid must be equal to 4 or 9."
@@ -197,6 +236,24 @@ class Mosaic(BaseMixTransform):
         self.imgsz = imgsz
         self.border = (-imgsz // 2, -imgsz // 2)  # width, height
         self.n = n
+        self.reuse_canvas = reuse_canvas
+        self.canvas = None
+
+    def get_canvas(self, shape, fill=True):
+        """Returns a uint8 mosaic canvas of shape, filled with 114 if fill, reusing the preallocated one if enabled."""
+        if not self.reuse_canvas:
+            return np.full(shape, 114, dtype=np.uint8) if fill else np.empty(shape, dtype=np.uint8)
+        if self.canvas is None or self.canvas.shape != shape:
+            self.canvas = np.empty(shape, dtype=np.uint8)
+        if fill:
+            self.canvas.fill(114)
+        return self.canvas
+
+    def __getstate__(self):
+        """Drops the canvas when pickled, i.e. for spawned dataloader workers that allocate their own."""
+        state = self.__dict__.copy()
+        state["canvas"] = None
+        return state
 
     def get_indexes(self, buffer=True):
         """Return a list of random indexes from the dataset."""
@@ -215,7 +272,7 @@ class Mosaic(BaseMixTransform):
 
     def _mosaic3(self, labels):
         """Create a 1x3 image mosaic."""
-        mosaic_labels = []
+        mosaic_labels, pads = [], []
         s = self.imgsz
         for i in range(3):
             labels_patch = labels if i == 0 else labels["mix_labels"][i - 1]
@@ -225,7 +282,7 @@ class Mosaic(BaseMixTransform):
 
             # Place img in img3
             if i == 0:  # center
-                img3 = np.full((s * 3, s * 3, img.shape[2]), 114, dtype=np.uint8)  # base image with 3 tiles
+                img3 = self.get_canvas((s * 3, s * 3, img.shape[2]))  # base image with 3 tiles
                 h0, w0 = h, w
                 c = s, s, s + w, s + h  # xmin, ymin, xmax, ymax (base) coordinates
             elif i == 1:  # right
@@ -240,52 +297,72 @@ class Mosaic(BaseMixTransform):
             # hp, wp = h, w  # height, width previous for next iteration
 
             # Labels assuming imgsz*2 mosaic size
-            labels_patch = self._update_labels(labels_patch, padw + self.border[0], padh + self.border[1])
             mosaic_labels.append(labels_patch)
-        final_labels = self._cat_labels(mosaic_labels)
+            pads.append((padw + self.border[0], padh + self.border[1]))
+        final_labels = self._cat_labels(mosaic_labels, pads)
 
         final_labels["img"] = img3[-self.border[0] : self.border[0], -self.border[1] : self.border[1]]
         return final_labels
 
     def _mosaic4(self, labels):
         """Create a 2x2 image mosaic."""
-        mosaic_labels = []
+        mosaic_labels = [labels] + labels["mix_labels"][:3]
         s = self.imgsz
         yc, xc = (int(random.uniform(-x, 2 * s + x)) for x in self.border)  # mosaic center x, y
-        for i in range(4):
-            labels_patch = labels if i == 0 else labels["mix_labels"][i - 1]
-            # Load image
-            img = labels_patch["img"]
-            h, w = labels_patch.pop("resized_shape")
-
-            # Place img in img4
-            if i == 0:  # top left
-                img4 = np.full((s * 2, s * 2, img.shape[2]), 114, dtype=np.uint8)  # base image with 4 tiles
-                x1a, y1a, x2a, y2a = max(xc - w, 0), max(yc - h, 0), xc, yc  # xmin, ymin, xmax, ymax (large image)
-                x1b, y1b, x2b, y2b = w - (x2a - x1a), h - (y2a - y1a), w, h  # xmin, ymin, xmax, ymax (small image)
-            elif i == 1:  # top right
-                x1a, y1a, x2a, y2a = xc, max(yc - h, 0), min(xc + w, s * 2), yc
-                x1b, y1b, x2b, y2b = 0, h - (y2a - y1a), min(w, x2a - x1a), h
-            elif i == 2:  # bottom left
-                x1a, y1a, x2a, y2a = max(xc - w, 0), yc, xc, min(s * 2, yc + h)
-                x1b, y1b, x2b, y2b = w - (x2a - x1a), 0, w, min(y2a - y1a, h)
-            elif i == 3:  # bottom right
-                x1a, y1a, x2a, y2a = xc, yc, min(xc + w, s * 2), min(s * 2, yc + h)
-                x1b, y1b, x2b, y2b = 0, 0, min(w, x2a - x1a), min(y2a - y1a, h)
-
-            img4[y1a:y2a, x1a:x2a] = img[y1b:y2b, x1b:x2b]  # img4[ymin:ymax, xmin:xmax]
-            padw = x1a - x1b
-            padh = y1a - y1b
-
-            labels_patch = self._update_labels(labels_patch, padw, padh)
-            mosaic_labels.append(labels_patch)
-        final_labels = self._cat_labels(mosaic_labels)
+        shapes = [labels_patch.pop("resized_shape") for labels_patch in mosaic_labels]
+        slices = self._mosaic4_slices(xc, yc, s * 2, shapes)
+
+        # Every tile lies in the corner of its quadrant at the mosaic center, only the rest of the quadrants is filled
+        img4 = self.get_canvas((s * 2, s * 2, labels["img"].shape[2]), fill=False)  # base image with 4 tiles
+        quadrants = (0, 0, xc, yc), (xc, 0, s * 2, yc), (0, yc, xc, s * 2), (xc, yc, s * 2, s * 2)
+        for (qx1, qy1, qx2, qy2), (x1a, y1a, x2a, y2a, x1b, y1b, x2b, y2b), labels_patch in zip(
+            quadrants, slices, mosaic_labels
+        ):
+            img4[qy1:y1a, qx1:qx2] = 114  # above tile
+            img4[y2a:qy2, qx1:qx2] = 114  # below tile
+            img4[y1a:y2a, qx1:x1a] = 114  # left of tile
+            img4[y1a:y2a, x2a:qx2] = 114  # right of tile
+            img4[y1a:y2a, x1a:x2a] = labels_patch["img"][y1b:y2b, x1b:x2b]  # img4[ymin:ymax, xmin:xmax]
+
+        pads = [(x1a - x1b, y1a - y1b) for x1a, y1a, _, _, x1b, y1b, _, _ in slices]  # padw, padh
+        final_labels = self._cat_labels(mosaic_labels, pads)
         final_labels["img"] = img4
         return final_labels
 
+    @staticmethod
+    def _mosaic4_slices(xc, yc, size, shapes):
+        """
+        Returns the slice table of a 2x2 mosaic.
+
+        Args:
+            xc (int): Mosaic center x.
+            yc (int): Mosaic center y.
+            size (int): Mosaic size, twice the image size.
+            shapes (list): (h, w) of the top left, top right, bottom left and bottom right tiles.
+
+        Returns:
+            (list): Per tile (x1a, y1a, x2a, y2a, x1b, y1b, x2b, y2b) coordinates of the region in the large mosaic and
+                in the small tile image.
+        """
+        (h0, w0), (h1, w1), (h2, w2), (h3, w3) = shapes
+        table = []
+        # top left
+        x1a, y1a, x2a, y2a = max(xc - w0, 0), max(yc - h0, 0), xc, yc  # xmin, ymin, xmax, ymax (large image)
+        table.append((x1a, y1a, x2a, y2a, w0 - (x2a - x1a), h0 - (y2a - y1a), w0, h0))  # (small image)
+        # top right
+        x1a, y1a, x2a, y2a = xc, max(yc - h1, 0), min(xc + w1, size), yc
+        table.append((x1a, y1a, x2a, y2a, 0, h1 - (y2a - y1a), min(w1, x2a - x1a), h1))
+        # bottom left
+        x1a, y1a, x2a, y2a = max(xc - w2, 0), yc, xc, min(size, yc + h2)
+        table.append((x1a, y1a, x2a, y2a, w2 - (x2a - x1a), 0, w2, min(y2a - y1a, h2)))
+        # bottom right
+        x1a, y1a, x2a, y2a = xc, yc, min(xc + w3, size), min(size, yc + h3)
+        table.append((x1a, y1a, x2a, y2a, 0, 0, min(w3, x2a - x1a), min(y2a - y1a, h3)))
+        return table
+
     def _mosaic9(self, labels):
         """Create a 3x3 image mosaic."""
-        mosaic_labels = []
+        mosaic_labels, pads = [], []
         s = self.imgsz
         hp, wp = -1, -1  # height, width previous
         for i in range(9):
@@ -296,7 +373,7 @@ class Mosaic(BaseMixTransform):
 
             # Place img in img9
             if i == 0:  # center
-                img9 = np.full((s * 3, s * 3, img.shape[2]), 114, dtype=np.uint8)  # base image with 4 tiles
+                img9 = self.get_canvas((s * 3, s * 3, img.shape[2]))  # base image with 4 tiles
                 h0, w0 = h, w
                 c = s, s, s + w, s + h  # xmin, ymin, xmax, ymax (base) coordinates
             elif i == 1:  # top
@@ -324,13 +401,47 @@ class Mosaic(BaseMixTransform):
             hp, wp = h, w  # height, width previous for next iteration
 
             # Labels assuming imgsz*2 mosaic size
-            labels_patch = self._update_labels(labels_patch, padw + self.border[0], padh + self.border[1])
             mosaic_labels.append(labels_patch)
-        final_labels = self._cat_labels(mosaic_labels)
+            pads.append((padw + self.border[0], padh + self.border[1]))
+        final_labels = self._cat_labels(mosaic_labels, pads)
 
         final_labels["img"] = img9[-self.border[0] : self.border[0], -self.border[1] : self.border[1]]
         return final_labels
 
+    @staticmethod
+    def _shift_instances(mosaic_labels, pads):
+        """
+        Returns the instances of all tiles in absolute xyxy mosaic coordinates, combined with a single concatenation.
+
+        Boxes, segments and keypoints of all tiles are concatenated first and then denormalized by their tile size and
+        shifted by their tile (padw, padh) offset at once, with the same result as _update_labels() on every tile.
+        """
+        instances = [labels["instances"] for labels in mosaic_labels]
+        use_keypoints = instances[0].keypoints is not None
+        states = {(x._bboxes.format, x.normalized, x.keypoints is not None) for x in instances}
+        if len(states) > 1 or not (
+            all(len(x.segments) == 0 for x in instances) or all(len(x.segments) == len(x) for x in instances)
+        ):  # tiles differ, shift one by one
+            for labels, (padw, padh) in zip(mosaic_labels, pads):
+                Mosaic._update_labels(labels, padw, padh)
+            return Instances.concatenate(instances, axis=0)
+
+        n = [len(x) for x in instances]
+        normalized = instances[0].normalized
+        scale = [labels["img"].shape[1::-1] if normalized else (1, 1) for labels in mosaic_labels]  # tile w, h
+        scale = np.repeat(np.array(scale, dtype=np.float32), n, axis=0)  # (N, 2)
+        offset = np.repeat(np.array(pads, dtype=np.float32), n, axis=0)  # (N, 2)
+        cat = Instances.concatenate(instances, axis=0)  # new arrays, tiles are left untouched
+        cat.convert_bbox(format="xyxy")
+        bboxes = cat.bboxes * np.tile(scale, 2) + np.tile(offset, 2)
+        segments, keypoints = cat.segments, cat.keypoints
+        if len(segments):
+            segments = segments * scale[:, None] + offset[:, None]
+        if use_keypoints:
+            keypoints[..., :2] *= scale[:, None]
+            keypoints[..., :2] += offset[:, None]
+        return Instances(bboxes, segments, keypoints, bbox_format="xyxy", normalized=False)
+
     @staticmethod
     def _update_labels(labels, padw, padh):
         """Update labels."""
@@ -340,23 +451,27 @@ class Mosaic(BaseMixTransform):
         labels["instances"].add_padding(padw, padh)
         return labels
 
-    def _cat_labels(self, mosaic_labels):
-        """Return labels with mosaic border instances clipped."""
+    def _cat_labels(self, mosaic_labels, pads=None):
+        """
+        Return labels with mosaic border instances clipped.
+
+        If the (padw, padh) offset of every tile is given, tile instances are shifted into mosaic coordinates while
+        being combined, otherwise they must have been updated with _update_labels() before.
+        """
         if len(mosaic_labels) == 0:
             return {}
-        cls = []
-        instances = []
         imgsz = self.imgsz * 2  # mosaic imgsz
-        for labels in mosaic_labels:
-            cls.append(labels["cls"])
-            instances.append(labels["instances"])
+        if pads is None:
+            instances = Instances.concatenate([labels["instances"] for labels in mosaic_labels], axis=0)
+        else:
+            instances = self._shift_instances(mosaic_labels, pads)
         # Final labels
         final_labels = {
             "im_file": mosaic_labels[0]["im_file"],
             "ori_shape": mosaic_labels[0]["ori_shape"],
             "resized_shape": (imgsz, imgsz),
-            "cls": np.concatenate(cls, 0),
-            "instances": Instances.concatenate(instances, axis=0),
+            "cls": np.concatenate([labels["cls"] for labels in mosaic_labels], 0),
+            "instances": instances,
             "mosaic_border": self.border,
         }
         final_labels["instances"].clip(imgsz, imgsz)
@@ -474,10 +589,33 @@ class RandomPerspective:
         if (border[0] != 0) or (border[1] != 0) or (M != np.eye(3)).any():  # image changed
             if self.perspective:
                 img = cv2.warpPerspective(img, M, dsize=self.size, borderValue=(114, 114, 114))
+            elif (M[:2, :2] == np.eye(2)).all() and (M[:2, 2] == M[:2, 2].round()).all():  # whole pixel shift
+                img = self.shift_image(img, int(M[0, 2]), int(M[1, 2]))
             else:  # affine
                 img = cv2.warpAffine(img, M[:2], dsize=self.size, borderValue=(114, 114, 114))
         return img, M, s
 
+    def shift_image(self, img, dx, dy):
+        """
+        Translates an image by whole pixels onto a canvas of `self.size`, with the same result as cv2.warpAffine().
+
+        Args:
+            img (ndarray): Input image.
+            dx (int): Translation in x.
+            dy (int): Translation in y.
+
+        Returns:
+            (ndarray): Translated image, padded with 114.
+        """
+        w, h = self.size
+        x1, y1, x2, y2 = max(dx, 0), max(dy, 0), min(w, img.shape[1] + dx), min(h, img.shape[0] + dy)
+        if (x1, y1, x2, y2) == (0, 0, w, h):  # crop
+            return img[-dy : h - dy, -dx : w - dx].copy()
+        out = np.full((h, w, *img.shape[2:]), 114, dtype=img.dtype)
+        if x2 > x1 and y2 > y1:
+            out[y1:y2, x1:x2] = img[y1 - dy : y2 - dy, x1 - dx : x2 - dx]
+        return out
+
     def apply_bboxes(self, bboxes, M):
         """
         Apply affine to bboxes only.
@@ -519,13 +657,28 @@ class RandomPerspective:
         if n == 0:
             return [], segments
 
-        xy = np.ones((n * num, 3), dtype=segments.dtype)
-        segments = segments.reshape(-1, 2)
-        xy[:, :2] = segments
-        xy = xy @ M.T  # transform
-        xy = xy[:, :2] / xy[:, 2:3]
+        if self.perspective:
+            xy = np.ones((n * num, 3), dtype=segments.dtype)
+            xy[:, :2] = segments.reshape(-1, 2)
+            xy = xy @ M.T  # transform
+            xy = xy[:, :2] / xy[:, 2:3]
+        else:  # affine, all points of all segments in one matmul
+            xy = segments.reshape(-1, 2) @ M[:2, :2].T + M[:2, 2]
         segments = xy.reshape(n, -1, 2)
-        bboxes = np.stack([segment2box(xy, self.size[0], self.size[1]) for xy in segments], 0)
+
+        # Boxes of the points inside the image, like segment2box() for all segments at once
+        x, y = segments[..., 0], segments[..., 1]
+        inside = (x >= 0) & (y >= 0) & (x <= self.size[0]) & (y <= self.size[1])
+        bboxes = np.stack(
+            (
+                np.where(inside, x, np.inf).min(1),
+                np.where(inside, y, np.inf).min(1),
+                np.where(inside, x, -np.inf).max(1),
+                np.where(inside, y, -np.inf).max(1),
+            ),
+            1,
+        ).astype(segments.dtype)
+        bboxes[~(inside & (x != 0)).any(1)] = 0  # no points inside
         segments[..., 0] = segments[..., 0].clip(bboxes[:, 0:1], bboxes[:, 2:3])
         segments[..., 1] = segments[..., 1].clip(bboxes[:, 1:2], bboxes[:, 3:4])
         return bboxes, segments
@@ -1093,15 +1246,18 @@ class RandomLoadText:
 
 def v8_transforms(dataset, imgsz, hyp, stretch=False):
     """Convert images to a size suitable for YOLOv8 training."""
+    task = "segment" if dataset.use_segments else "obb" if dataset.use_obb else "detect"
+    batched = batch_augments(hyp, task)  # applied to collated batches by the trainer instead
+    affine = "affine" not in batched
     pre_transform = Compose(
         [
-            Mosaic(dataset, imgsz=imgsz, p=hyp.mosaic),
+            Mosaic(dataset, imgsz=imgsz, p=hyp.mosaic, reuse_canvas=True),
             CopyPaste(p=hyp.copy_paste),
             RandomPerspective(
-                degrees=hyp.degrees,
-                translate=hyp.translate,
-                scale=hyp.scale,
-                shear=hyp.shear,
+                degrees=hyp.degrees if affine else 0.0,
+                translate=hyp.translate if affine else 0.0,
+                scale=hyp.scale if affine else 0.0,
+                shear=hyp.shear if affine else 0.0,
                 perspective=hyp.perspective,
                 pre_transform=None if stretch else LetterBox(new_shape=(imgsz, imgsz)),
             ),
@@ -1121,13 +1277,225 @@ def v8_transforms(dataset, imgsz, hyp, stretch=False):
             pre_transform,
             MixUp(dataset, pre_transform=pre_transform, p=hyp.mixup),
             Albumentations(p=1.0),
-            RandomHSV(hgain=hyp.hsv_h, sgain=hyp.hsv_s, vgain=hyp.hsv_v),
-            RandomFlip(direction="vertical", p=hyp.flipud),
-            RandomFlip(direction="horizontal", p=hyp.fliplr, flip_idx=flip_idx),
+            RandomHSV(*((0.0, 0.0, 0.0) if "hsv" in batched else (hyp.hsv_h, hyp.hsv_s, hyp.hsv_v))),
+            RandomFlip(direction="vertical", p=0.0 if "flip" in batched else hyp.flipud),
+            RandomFlip(direction="horizontal", p=0.0 if "flip" in batched else hyp.fliplr, flip_idx=flip_idx),
         ]
     )  # transforms
 
 
+# Batched augmentations ------------------------------------------------------------------------------------------------
+BATCH_AUGMENTS = ("hsv", "flip", "affine")  # augmentations that can run on collated batches
+
+
+def batch_augments(hyp, task="detect", verbose=False):
+    """
+    Returns the augmentations selected with `hyp.batch_augment` that run on collated batches for a given task.
+
+    Args:
+        hyp (IterableSimpleNamespace): Training arguments, `batch_augment` is a comma-separated string or a list.
+        task (str): Training task. Segment and OBB labels keep the affine warp per image.
+        verbose (bool): Warn when a selected augmentation is not supported for the task.
+
+    Returns:
+        (set): Names of the batched augmentations out of BATCH_AUGMENTS.
+    """
+    names = hyp.batch_augment or ()
+    names = {x.strip() for x in (names.split(",") if isinstance(names, str) else names) if x.strip()}
+    if names - set(BATCH_AUGMENTS):
+        raise ValueError(f"Invalid 'batch_augment={hyp.batch_augment}', valid augmentations are {BATCH_AUGMENTS}.")
+    if "affine" in names and task in {"segment", "obb"}:
+        names.discard("affine")
+        if verbose:
+            LOGGER.warning(
+                f"WARNING ⚠️ 'batch_augment' affine is not supported for task={task}, applying it per image"
+            )
+    return names
+
+
+class BatchAugment:
+    """
+    Applies HSV, flip and affine augmentations to a collated training batch with batched tensor operations.
+
+    Every image of the batch draws its own random parameters, but all images are augmented at once on the device of the
+    batch, i.e. the GPU, instead of one by one in the dataloader workers. Labels are transformed to match. The affine
+    warp is applied after the mosaic crop, so zoomed out images are padded instead of showing more of the mosaic, and
+    any `perspective` stays with the per-image RandomPerspective.
+
+    Attributes:
+        names (set): Augmentations to apply, out of 'hsv', 'flip' and 'affine'.
+        gains (tuple): Maximum hue, saturation and value variation.
+        flipud (float): Probability of a vertical flip.
+        fliplr (float): Probability of a horizontal flip.
+        degrees (float): Rotation range in degrees.
+        translate (float): Translation range as a fraction of the image size.
+        scale (float): Scaling range.
+        shear (float): Shear range in degrees.
+        flip_idx (list, optional): Keypoint index mapping for horizontal flips.
+        overlap (bool): Whether batch masks are per-image index maps instead of per-instance masks.
+
+    Example:
+        ```python
+        from ultralytics.cfg import get_cfg
+        from ultralytics.data.augment import BatchAugment
+
+        augment = BatchAugment(get_cfg(), names=('hsv', 'flip', 'affine'))
+        batch['img'] = batch['img'].cuda().float() / 255
+        batch = augment(batch)
+        ```
+    """
+
+    def __init__(self, hyp, names=BATCH_AUGMENTS, flip_idx=None):
+        """
+        Initializes the BatchAugment with the augmentation hyperparameters.
+
+        Args:
+            hyp (IterableSimpleNamespace): Augmentation hyperparameters, i.e. `hsv_h`, `fliplr` and `degrees`.
+            names (iterable): Augmentations to apply, out of 'hsv', 'flip' and 'affine'.
+            flip_idx (list, optional): Keypoint index mapping for horizontal flips.
+        """
+        self.names = set(names)
+        self.gains = (hyp.hsv_h, hyp.hsv_s, hyp.hsv_v)
+        self.flipud = hyp.flipud
+        self.fliplr = hyp.fliplr
+        self.degrees = hyp.degrees
+        self.translate = hyp.translate
+        self.scale = hyp.scale
+        self.shear = hyp.shear
+        self.flip_idx = list(flip_idx) if flip_idx else None
+        self.overlap = getattr(hyp, "overlap_mask", True)
+
+    def __call__(self, batch):
+        """
+        Augments a batch in the order of the per-image pipeline: affine, HSV, then flips.
+
+        Args:
+            batch (dict): Collated batch with 'img' as float (B, 3, H, W) RGB images in 0-1 and normalized labels.
+
+        Returns:
+            (dict): The same batch with augmented images and labels.
+        """
+        if "affine" in self.names and (self.degrees or self.translate or self.scale or self.shear):
+            self.affine(batch)
+        if "hsv" in self.names and any(self.gains):
+            self.hsv(batch)
+        if "flip" in self.names:
+            self.flip(batch)
+        return batch
+
+    @staticmethod
+    def rgb2hsv(img, eps=1e-8):
+        """Converts (B, 3, H, W) RGB images in 0-1 to HSV with all channels in 0-1."""
+        r, g, b = img.unbind(1)
+        v = torch.maximum(torch.maximum(r, g), b)
+        delta = v - torch.minimum(torch.minimum(r, g), b)
+        d = delta + eps
+        h = torch.lerp((r - g).div_(d).add_(4), (b - r).div_(d).add_(2), (v == g).float())  # lerp is cheaper than where
+        h = torch.lerp(h, (g - b).div_(d), (v == r).float())  # hue sextant of the max channel, in [-1, 5]
+        return torch.stack((h.add_(6).div_(6).frac_(), delta.div_(v + eps), v), 1)
+
+    @staticmethod
+    def hsv2rgb(img):
+        """Converts (B, 3, H, W) HSV images with all channels in 0-1 to RGB."""
+        h, s, v = img[:, :1], img[:, 1:2], img[:, 2:]
+        k = (h + img.new_tensor([5, 3, 1]).view(1, 3, 1, 1) / 6).frac_().mul_(6)  # R, G, B
+        return v - (v * s) * torch.minimum(k, 4 - k).clamp_(0, 1)
+
+    def hsv(self, batch):
+        """Multiplies hue, saturation and value of every image by its own random gains, like RandomHSV."""
+        img = batch["img"]
+        r = (torch.rand(len(img), 3, device=img.device) * 2 - 1) * img.new_tensor(self.gains) + 1  # random gains
+        hsv = self.rgb2hsv(img).mul_(r[..., None, None])
+        hsv[:, 0].frac_()
+        hsv[:, 1:].clamp_(max=1)
+        batch["img"] = self.hsv2rgb(hsv)
+
+    def flip(self, batch):
+        """Flips a random subset of the images vertically and horizontally together with their labels."""
+        img = batch["img"]
+        for p, axis in ((self.flipud, 1), (self.fliplr, 0)):
+            flipped = torch.rand(len(img)) < p
+            if not flipped.any():
+                continue
+            i = flipped.nonzero()[:, 0].to(img.device)
+            img[i] = img[i].flip(3 - axis)  # W for x, H for y
+            rows = flipped.to(batch["batch_idx"].device)[batch["batch_idx"].long()]
+            if not rows.any():
+                continue
+            bboxes = batch["bboxes"]
+            bboxes[rows, axis] = 1 - bboxes[rows, axis]
+            if bboxes.shape[-1] == 5:  # xywhr, mirror the angle and keep it in [0, pi/2]
+                bboxes[rows, 2:] = torch.stack((bboxes[rows, 3], bboxes[rows, 2], math.pi / 2 - bboxes[rows, 4]), 1)
+            if "keypoints" in batch:
+                kpts = batch["keypoints"]
+                kpts[rows, :, axis] = 1 - kpts[rows, :, axis]
+                if axis == 0 and self.flip_idx is not None:
+                    kpts[rows] = kpts[rows][:, self.flip_idx]
+            if "masks" in batch:
+                masks = batch["masks"]
+                j = (i if self.overlap else rows.nonzero()[:, 0]).to(masks.device)
+                masks[j] = masks[j].flip(2 - axis)
+
+    def affine(self, batch):
+        """Rotates, scales, shears and translates every image with its own random matrix, like RandomPerspective."""
+        img = batch["img"]
+        b, _, h, w = img.shape
+
+        # Matrices M = T @ S @ R @ C in pixels, with the same sampling as RandomPerspective
+        a = torch.empty(b).uniform_(-self.degrees, self.degrees) * math.pi / 180
+        s = torch.empty(b).uniform_(1 - self.scale, 1 + self.scale)
+        M = torch.eye(3).repeat(b, 1, 1)
+        M[:, 0, 0], M[:, 0, 1] = s * torch.cos(a), s * torch.sin(a)
+        M[:, 1, 0], M[:, 1, 1] = -s * torch.sin(a), s * torch.cos(a)
+        S = torch.eye(3).repeat(b, 1, 1)
+        S[:, 0, 1] = torch.tan(torch.empty(b).uniform_(-self.shear, self.shear) * math.pi / 180)
+        S[:, 1, 0] = torch.tan(torch.empty(b).uniform_(-self.shear, self.shear) * math.pi / 180)
+        M = S @ M
+        M[:, :2, 2] = -M[:, :2, :2] @ torch.tensor([w / 2, h / 2])  # center
+        M[:, 0, 2] += torch.empty(b).uniform_(0.5 - self.translate, 0.5 + self.translate) * w
+        M[:, 1, 2] += torch.empty(b).uniform_(0.5 - self.translate, 0.5 + self.translate) * h
+
+        # Images, sample the source pixel of every output pixel in normalized coordinates
+        N = torch.tensor([[2 / (w - 1), 0, -1], [0, 2 / (h - 1), -1], [0, 0, 1]])  # pixels to [-1, 1]
+        theta = (N @ torch.linalg.inv(M) @ torch.linalg.inv(N))[:, :2]
+        grid = F.affine_grid(theta.to(img), [b, 3, h, w], align_corners=True)
+        pad = 114 / 255
+        batch["img"] = F.grid_sample(img - pad, grid, align_corners=True) + pad
+
+        # Labels
+        bboxes = batch["bboxes"]
+        if not len(bboxes):
+            return
+        i = batch["batch_idx"].long().cpu()
+        Mi, si = M[i].to(bboxes), s[i].to(bboxes)
+        gain = bboxes.new_tensor([w, h, w, h])
+        xyxy = xywh2xyxy(bboxes) * gain
+        xy = xyxy[:, [0, 1, 2, 3, 0, 3, 2, 1]].view(-1, 4, 2) @ Mi[:, :2, :2].transpose(1, 2) + Mi[:, None, :2, 2]
+        new = torch.cat((xy.min(1)[0], xy.max(1)[0]), 1)
+        new[:, [0, 2]] = new[:, [0, 2]].clamp(0, w)
+        new[:, [1, 3]] = new[:, [1, 3]].clamp(0, h)
+
+        # Filter candidates like RandomPerspective.box_candidates()
+        wh1 = (xyxy[:, 2:] - xyxy[:, :2]) * si[:, None]
+        wh2 = new[:, 2:] - new[:, :2]
+        ar = torch.maximum(wh2[:, 0] / (wh2[:, 1] + 1e-16), wh2[:, 1] / (wh2[:, 0] + 1e-16))
+        area = wh2.prod(1) / (wh1.prod(1) + 1e-16)
+        keep = (wh2 > 2).all(1) & (area > 0.1) & (ar < 100)
+
+        batch["bboxes"] = xyxy2xywh(new[keep]) / gain
+        batch["cls"] = batch["cls"][keep]
+        batch["batch_idx"] = batch["batch_idx"][keep]
+        if "keypoints" in batch:
+            kpts, Mi = batch["keypoints"][keep], Mi[keep]
+            xy = (kpts[..., :2] * gain[:2]) @ Mi[:, :2, :2].transpose(1, 2) + Mi[:, None, :2, 2]
+            if kpts.shape[-1] == 3:
+                out = (xy < 0).any(-1) | (xy[..., 0] > w) | (xy[..., 1] > h)
+                kpts[..., 2][out] = 0
+            kpts[..., 0] = xy[..., 0].clamp(0, w) / w
+            kpts[..., 1] = xy[..., 1].clamp(0, h) / h
+            batch["keypoints"] = kpts
+
+
 # Classification augmentations -----------------------------------------------------------------------------------------
 def classify_transforms(
     size=224,
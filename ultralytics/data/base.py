@@ -14,8 +14,11 @@ import numpy as np
 import psutil
 from torch.utils.data import Dataset
 
-from ultralytics.utils import DEFAULT_CFG, LOCAL_RANK, LOGGER, NUM_THREADS, TQDM
-from .utils import HELP_URL, FORMATS_HELP_MSG, IMG_FORMATS
+from ultralytics.utils import DEFAULT_CFG, LOCAL_RANK, LOGGER, NUM_THREADS, TQDM, is_dir_writeable
+from .utils import HELP_URL, FORMATS_HELP_MSG, IMG_FORMATS, LabelStore, get_hash
+
+# Memory-mapped image arena *.imcache index version
+IMAGE_CACHE_VERSION = "1.0.0"
 
 
 class BaseDataset(Dataset):
@@ -25,7 +28,8 @@ class BaseDataset(Dataset):
     Args:
         img_path (str): Path to the folder containing images.
         imgsz (int, optional): Image size. Defaults to 640.
-        cache (bool, optional): Cache images to RAM or disk during training. Defaults to False.
+        cache (bool | str, optional): Cache images to RAM ('ram' or True), disk ('disk') or a shared memory-mapped
+            arena ('mmap') during training. Defaults to False.
         augment (bool, optional): If True, data augmentation is applied. Defaults to True.
         hyp (dict, optional): Hyperparameters to apply data augmentation. Defaults to None.
         prefix (str, optional): Prefix to print in log messages. Defaults to ''.
@@ -43,6 +47,9 @@ class BaseDataset(Dataset):
         ni (int): Number of images in the dataset.
         ims (list): List of loaded images.
         npy_files (list): List of numpy file paths.
+        arena_file (Path): Memory-mapped image arena file, None unless cache='mmap'.
+        arena_hash (str): Hash of the image files cached in the arena, None unless cache='mmap'.
+        arena_rows (np.ndarray): Arena row of each image, None unless cache='mmap'.
         transforms (callable): Image transformation function.
     """
 
@@ -89,8 +96,17 @@ class BaseDataset(Dataset):
         self.max_buffer_length = min((self.ni, self.batch_size * 8, 1000)) if self.augment else 0
 
         # Cache images
+        self.arena_file, self.arena_hash = None, None
+        self.arena, self.arena_index, self.arena_rows = None, None, None
         if cache == "ram" and not self.check_cache_ram():
             cache = False
+        elif cache == "mmap":
+            # Named by dataset and imgsz, so datasets sharing an image directory, i.e. train and val lists, never
+            # replace each other's arena
+            self.arena_hash = get_hash(sorted(self.im_files))
+            im_dir = Path(self.im_files[0]).parent
+            self.arena_file = im_dir.parent / f"{im_dir.name}.{self.arena_hash[:12]}_{self.imgsz}.imcache"
+            self.check_cache_ram(shared=True)  # page cache is evictable, so only informs
         self.ims, self.im_hw0, self.im_hw = [None] * self.ni, [None] * self.ni, [None] * self.ni
         self.npy_files = [Path(f).with_suffix(".npy") for f in self.im_files]
         if cache:
@@ -129,6 +145,8 @@ class BaseDataset(Dataset):
 
     def update_labels(self, include_class: Optional[list]):
         """Update labels to include only these classes (optional)."""
+        if isinstance(self.labels, LabelStore):  # applied when a label is built
+            return self.labels.filter(include_class, self.single_cls)
         include_class_array = np.array(include_class).reshape(1, -1)
         for i in range(len(self.labels)):
             if include_class is not None:
@@ -149,6 +167,13 @@ class BaseDataset(Dataset):
     def load_image(self, i, rect_mode=True):
         """Loads 1 image from dataset index 'i', returns (im, resized hw)."""
         im, f, fn = self.ims[i], self.im_files[i], self.npy_files[i]
+        if im is None and self.arena_rows is not None:  # memory-mapped arena, images are stored resized
+            im, hw0 = self.load_arena_image(i)
+            if self.augment:  # keep the mosaic buffer filled, images stay in the arena
+                self.buffer.append(i)
+                if len(self.buffer) >= self.max_buffer_length:
+                    self.buffer.pop(0)
+            return im, hw0, im.shape[:2]
         if im is None:  # not cached in RAM
             if fn.exists():  # load npy
                 try:
@@ -185,6 +210,8 @@ class BaseDataset(Dataset):
 
     def cache_images(self, cache):
         """Cache images to memory or disk."""
+        if cache == "mmap":
+            return self.cache_images_to_mmap()
         b, gb = 0, 1 << 30  # bytes of cached images, bytes per gigabytes
         fcn = self.cache_images_to_disk if cache == "disk" else self.load_image
         with ThreadPool(NUM_THREADS) as pool:
@@ -205,18 +232,105 @@ class BaseDataset(Dataset):
         if not f.exists():
             np.save(f.as_posix(), cv2.imread(self.im_files[i]), allow_pickle=False)
 
-    def check_cache_ram(self, safety_margin=0.5):
-        """Check image caching requirements vs available memory."""
+    def cache_images_to_mmap(self):
+        """Packs all resized images into a single memory-mapped arena file, reusing an existing arena if it matches."""
+        index = self.load_arena_index()
+        if index is None:
+            if not is_dir_writeable(self.arena_file.parent):
+                LOGGER.warning(
+                    f"{self.prefix}WARNING ⚠️ {self.arena_file.parent} not writeable, images not cached."
+                )
+                return
+            gb = 1 << 30
+            offsets = np.zeros(self.ni + 1, dtype=np.int64)  # byte offset of each image
+            shapes, hw0 = np.zeros((self.ni, 3), dtype=np.int32), np.zeros((self.ni, 2), dtype=np.int32)
+            tmp = self.arena_file.with_suffix(".imcache.tmp")
+            with open(tmp, "wb") as f, ThreadPool(NUM_THREADS) as pool:
+                results = pool.imap(self.load_image, range(self.ni))
+                pbar = TQDM(enumerate(results), total=self.ni, disable=LOCAL_RANK > 0)
+                for i, (im, hw, _) in pbar:
+                    im = np.ascontiguousarray(im).reshape(*im.shape[:2], -1)  # hwc
+                    shapes[i], hw0[i], offsets[i + 1] = im.shape, hw, offsets[i] + im.nbytes
+                    f.write(memoryview(im))
+                    pbar.desc = f"{self.prefix}Caching images ({offsets[i + 1] / gb:.1f}GB mmap)"
+                pbar.close()
+            self.ims, self.im_hw0, self.im_hw = [None] * self.ni, [None] * self.ni, [None] * self.ni
+            self.buffer = []
+            tmp.replace(self.arena_file)
+            index = dict(
+                version=IMAGE_CACHE_VERSION,
+                hash=self.arena_hash,
+                imgsz=self.imgsz,
+                files=list(self.im_files),
+                offsets=offsets,
+                shapes=shapes,
+                hw0=hw0,
+            )
+            np.save(self.arena_file.with_suffix(".imcache.npy"), index)
+            LOGGER.info(f"{self.prefix}New image cache created: {self.arena_file}")
+        rows = {f: j for j, f in enumerate(index["files"])}
+        self.arena_index, self.arena_rows = index, np.array([rows[f] for f in self.im_files])
+
+    def load_arena_index(self):
+        """Returns the *.imcache index of the arena if it caches exactly this dataset at this imgsz, else None."""
+        path = self.arena_file.with_suffix(".imcache.npy")
+        try:
+            index = np.load(path, allow_pickle=True).item()
+            assert index["version"] == IMAGE_CACHE_VERSION and index["imgsz"] == self.imgsz
+            assert index["hash"] == self.arena_hash
+            assert self.arena_file.stat().st_size == index["offsets"][-1]
+            return index
+        except (FileNotFoundError, AssertionError, AttributeError, KeyError, ValueError):
+            return None
+
+    def load_arena_image(self, i):
+        """Returns a writeable copy of arena image i and its original hw, mapping the arena on first use."""
+        if self.arena is None:  # opened lazily, so every DataLoader worker maps the same shared pages
+            self.arena = np.memmap(self.arena_file, dtype=np.uint8, mode="r")
+        j = self.arena_rows[i]
+        a, b = self.arena_index["offsets"][j : j + 2]
+        im = np.array(self.arena[a:b].reshape(self.arena_index["shapes"][j]))  # copy, augmentations work in-place
+        return (im[..., 0] if im.shape[2] == 1 else im), tuple(self.arena_index["hw0"][j].tolist())
+
+    def __getstate__(self):
+        """Drops the memory map when pickled, i.e. for spawned DataLoader workers, which map the arena again."""
+        state = self.__dict__.copy()
+        state["arena"] = None
+        return state
+
+    def check_cache_ram(self, safety_margin=0.5, shared=False):
+        """
+        Check image caching requirements vs available memory.
+
+        Args:
+            safety_margin (float): Fraction added to the estimated cache size.
+            shared (bool): Check the memory-mapped arena, which all DataLoader workers share through the OS page cache.
+                An existing arena is measured exactly and the check only informs, as pages are read from disk once
+                evicted.
+
+        Returns:
+            (bool): True if the cache fits into available memory.
+        """
         b, gb = 0, 1 << 30  # bytes of cached images, bytes per gigabytes
-        n = min(self.ni, 30)  # extrapolate from 30 random images
-        for _ in range(n):
-            im = cv2.imread(random.choice(self.im_files))  # sample image
-            ratio = self.imgsz / max(im.shape[0], im.shape[1])  # max(h, w)  # ratio
-            b += im.nbytes * ratio**2
-        mem_required = b * self.ni / n * (1 + safety_margin)  # GB required to cache dataset into RAM
+        index = self.load_arena_index() if shared else None
+        if index is not None:
+            mem_required = index["offsets"][-1]  # exact size of the shared arena
+        else:
+            n = min(self.ni, 30)  # extrapolate from 30 random images
+            for _ in range(n):
+                im = cv2.imread(random.choice(self.im_files))  # sample image
+                ratio = self.imgsz / max(im.shape[0], im.shape[1])  # max(h, w)  # ratio
+                b += im.nbytes * ratio**2
+            mem_required = b * self.ni / n * (1 + safety_margin)  # GB required to cache dataset into RAM
         mem = psutil.virtual_memory()
         cache = mem_required < mem.available  # to cache or not to cache, that is the question
-        if not cache:
+        if shared:
+            LOGGER.info(
+                f"{self.prefix}{mem_required / gb:.1f}GB shared page cache required for memory-mapped images, "
+                f"{mem.available / gb:.1f}/{mem.total / gb:.1f}GB available"
+                f"{'' if cache else ', evicted images will be read from disk ⚠️'}"
+            )
+        elif not cache:
             LOGGER.info(
                 f'{self.prefix}{mem_required / gb:.1f}GB RAM required to cache images '
                 f'with {int(safety_margin * 100)}% safety margin but only '
@@ -230,11 +344,14 @@ class BaseDataset(Dataset):
         bi = np.floor(np.arange(self.ni) / self.batch_size).astype(int)  # batch index
         nb = bi[-1] + 1  # number of batches
 
-        s = np.array([x.pop("shape") for x in self.labels])  # hw
+        if isinstance(self.labels, LabelStore):
+            s = self.labels.shapes  # hw
+        else:
+            s = np.array([x.pop("shape") for x in self.labels])  # hw
         ar = s[:, 0] / s[:, 1]  # aspect ratio
         irect = ar.argsort()
         self.im_files = [self.im_files[i] for i in irect]
-        self.labels = [self.labels[i] for i in irect]
+        self.labels = self.labels[irect] if isinstance(self.labels, LabelStore) else [self.labels[i] for i in irect]
         ar = ar[irect]
 
         # Set training image shapes
@@ -2,7 +2,10 @@
 
 import os
 import random
+import threading
+import time
 from pathlib import Path
+from queue import Full, Queue
 
 import numpy as np
 import torch
@@ -30,14 +33,23 @@ class InfiniteDataLoader(dataloader.DataLoader):
     """
     Dataloader that reuses workers.
 
-    Uses same syntax as vanilla DataLoader.
+    Uses same syntax as vanilla DataLoader. After prefetch() a background thread keeps the next batch ready, pinned and,
+    on CUDA, already copied to the device on a side stream while the current step runs. Every epoch records how long
+    the consumer waited for batches in `wait` (seconds) over `steps` batches since `t_start`.
     """
 
+    PREFETCH_KEYS = ("img", "masks")  # batch tensors copied to the prefetch device
+
     def __init__(self, *args, **kwargs):
         """Dataloader that infinitely recycles workers, inherits from DataLoader."""
         super().__init__(*args, **kwargs)
         object.__setattr__(self, "batch_sampler", _RepeatSampler(self.batch_sampler))
         self.iterator = super().__iter__()
+        self.device = None  # prefetch device, None to fetch batches on demand
+        self.stream = None  # CUDA side stream of the prefetch copies
+        self.thread = None
+        self.stop = threading.Event()
+        self.wait, self.steps, self.t_start = 0.0, 0, time.perf_counter()
 
     def __len__(self):
         """Returns the length of the batch sampler's sampler."""
@@ -45,8 +57,14 @@ class InfiniteDataLoader(dataloader.DataLoader):
 
     def __iter__(self):
         """Creates a sampler that repeats indefinitely."""
-        for _ in range(len(self)):
-            yield next(self.iterator)
+        self.wait, self.steps, self.t_start = 0.0, 0, time.perf_counter()
+        batches = self._prefetch() if self.device is not None else (next(self.iterator) for _ in range(len(self)))
+        t = time.perf_counter()
+        for batch in batches:
+            self.wait += time.perf_counter() - t
+            self.steps += 1
+            yield batch
+            t = time.perf_counter()
 
     def reset(self):
         """
@@ -54,8 +72,77 @@ class InfiniteDataLoader(dataloader.DataLoader):
 
         This is useful when we want to modify settings of dataset while training.
         """
+        self._stop_prefetch()
         self.iterator = self._get_iterator()
 
+    def prefetch(self, device):
+        """
+        Fetches every batch one step ahead in a background thread from now on.
+
+        On CUDA devices the PREFETCH_KEYS tensors are pinned and copied asynchronously on a side stream, otherwise the
+        thread overlaps waiting for the workers, or collating without workers, with the current step.
+
+        Args:
+            device (torch.device | str): Device the training step runs on.
+        """
+        self.device = torch.device(device)
+        self.stream = torch.cuda.Stream(self.device) if self.device.type == "cuda" else None
+
+    def _prefetch(self):
+        """Yields the batches of one epoch from a background thread that stays one batch ahead."""
+        self._stop_prefetch()
+        queue = Queue(maxsize=1)  # one batch ready while the consumer holds the current one, i.e. a double buffer
+        self.thread = threading.Thread(target=self._fetch, args=(queue, len(self)), daemon=True)
+        self.thread.start()
+        for _ in range(len(self)):
+            batch, event = queue.get()
+            if isinstance(batch, Exception):
+                raise batch
+            if event is not None:  # copies were queued on the side stream
+                stream = torch.cuda.current_stream(self.device)
+                stream.wait_event(event)
+                for k in self.PREFETCH_KEYS:
+                    if isinstance(batch.get(k), torch.Tensor):
+                        batch[k].record_stream(stream)  # do not reuse the memory before the consumer is done
+            yield batch
+
+    def _fetch(self, queue, n):
+        """Puts n batches from the workers on the queue, copying their PREFETCH_KEYS tensors to the device first."""
+
+        def put(item):
+            """Waits for a free slot on the queue, returns False if the consumer stopped the epoch."""
+            while not self.stop.is_set():
+                try:
+                    queue.put(item, timeout=0.1)
+                    return True
+                except Full:
+                    pass
+            return False
+
+        try:
+            for _ in range(n):
+                batch, event = next(self.iterator), None
+                if self.stream is not None:
+                    with torch.cuda.stream(self.stream):
+                        for k in self.PREFETCH_KEYS:
+                            v = batch.get(k)
+                            if isinstance(v, torch.Tensor):
+                                v = v if v.is_pinned() else v.pin_memory()
+                                batch[k] = v.to(self.device, non_blocking=True)
+                        event = self.stream.record_event()
+                if not put((batch, event)):
+                    return
+        except Exception as e:
+            put((e, None))
+
+    def _stop_prefetch(self):
+        """Stops the prefetch thread of an epoch that was not consumed to the end, i.e. after a break."""
+        if self.thread is not None and self.thread.is_alive():
+            self.stop.set()
+            self.thread.join()
+        self.stop.clear()
+        self.thread = None
+
 
 class _RepeatSampler:
     """
@@ -101,6 +188,7 @@ def build_yolo_dataset(cfg, img_path, batch, data, mode="train", rect=False, str
         classes=cfg.classes,
         data=data,
         fraction=cfg.fraction if mode == "train" else 1.0,
+        lazy_labels=cfg.lazy_labels,
     )
 
 
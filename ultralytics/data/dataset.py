@@ -1,8 +1,10 @@
 # Ultralytics YOLO 🚀, AGPL-3.0 license
 import contextlib
+import multiprocessing as mp
+import time
 from itertools import repeat
 from collections import defaultdict
-from multiprocessing.pool import ThreadPool
+from multiprocessing.pool import Pool, ThreadPool
 from pathlib import Path
 
 import cv2
@@ -29,12 +31,16 @@ from .base import BaseDataset
 from .utils import (
     HELP_URL,
     LOGGER,
+    LabelStore,
+    file_stats,
     get_hash,
     img2label_paths,
     verify_image,
     verify_image_label,
     load_dataset_cache_file,
+    load_label_store,
     save_dataset_cache_file,
+    save_label_store,
 )
 
 # Ultralytics dataset *.cache version, >= 1.0.0 for YOLOv8
@@ -48,13 +54,16 @@ class YOLODataset(BaseDataset):
     Args:
         data (dict, optional): A dataset YAML dictionary. Defaults to None.
         task (str): An explicit arg to point current task, Defaults to 'detect'.
+        lazy_labels (bool): Cache labels as memory-mapped columns in a *.lcache directory and build label
+            dictionaries on access, for very large datasets. Defaults to False.
 
     Returns:
         (torch.utils.data.Dataset): A PyTorch dataset object that can be used for training an object detection model.
     """
 
-    def __init__(self, *args, data=None, task="detect", **kwargs):
+    def __init__(self, *args, data=None, task="detect", lazy_labels=False, **kwargs):
         """Initializes the YOLODataset with optional configurations for segments and keypoints."""
+        self.lazy_labels = lazy_labels
         self.use_segments = task == "segment"
         self.use_keypoints = task == "pose"
         self.use_obb = task == "obb"
@@ -62,12 +71,16 @@ class YOLODataset(BaseDataset):
         assert not (self.use_segments and self.use_keypoints), "Can not use both segments and keypoints."
         super().__init__(*args, **kwargs)
 
-    def cache_labels(self, path=Path("./labels.cache")):
+    def cache_labels(self, path=Path("./labels.cache"), previous=None):
         """
         Cache dataset labels, check images and read shapes.
 
+        The size and modification time of every image and label file are stored with its verification result, so that
+        when a previous cache is given only new or changed files are verified again, in a process pool.
+
         Args:
             path (Path): Path where to save the cache file. Default is Path('./labels.cache').
+            previous (dict, optional): A previous cache of this dataset to reuse verification results from.
 
         Returns:
             (dict): labels.
@@ -82,28 +95,41 @@ class YOLODataset(BaseDataset):
                 "'kpt_shape' in data.yaml missing or incorrect. Should be a list with [number of "
                 "keypoints, number of dims (2 for x,y or 3 for x,y,visible)], i.e. 'kpt_shape: [17, 3]'"
             )
-        with ThreadPool(NUM_THREADS) as pool:
-            results = pool.imap(
-                func=verify_image_label,
-                iterable=zip(
-                    self.im_files,
-                    self.label_files,
-                    repeat(self.prefix),
-                    repeat(self.use_keypoints),
-                    repeat(len(self.data["names"])),
-                    repeat(nkpt),
-                    repeat(ndim),
-                ),
-            )
-            pbar = TQDM(results, desc=desc, total=total)
-            for im_file, lb, shape, segments, keypoint, nm_f, nf_f, ne_f, nc_f, msg in pbar:
-                nm += nm_f
-                nf += nf_f
-                ne += ne_f
-                nc += nc_f
-                if im_file:
-                    x["labels"].append(
-                        dict(
+        verify_args = (self.use_keypoints, len(self.data["names"]), nkpt, ndim)
+        stats = np.concatenate((file_stats(self.im_files), file_stats(self.label_files)), 1)  # size, mtime of im, lb
+        reused = self._reusable_labels(previous, stats, verify_args)  # {index: (label, nm, nf, ne, nc, msg)}
+        todo = [i for i in range(total) if i not in reused]
+        previous = None  # release the previous cache before it is overwritten
+
+        t = time.perf_counter()
+        with contextlib.ExitStack() as stack:
+            results = iter(())
+            if todo:
+                # Processes only pay off for large rebuilds, and dataloader workers are daemonic and can not start them
+                processes = len(todo) >= 1000 and not mp.current_process().daemon
+                pool = stack.enter_context((Pool if processes else ThreadPool)(NUM_THREADS))
+                results = pool.imap(
+                    func=verify_image_label,
+                    iterable=zip(
+                        (self.im_files[i] for i in todo),
+                        (self.label_files[i] for i in todo),
+                        repeat(self.prefix),
+                        repeat(self.use_keypoints),
+                        repeat(len(self.data["names"])),
+                        repeat(nkpt),
+                        repeat(ndim),
+                    ),
+                    chunksize=32,
+                )
+            flags, rows, file_msgs = np.zeros(total, dtype=np.uint8), [], {}  # per file verification result
+            pbar = TQDM(range(total), desc=desc, total=total)
+            for i in pbar:
+                if i in reused:
+                    lb, nm_f, nf_f, ne_f, nc_f, msg = reused.pop(i)
+                else:
+                    im_file, lb, shape, segments, keypoint, nm_f, nf_f, ne_f, nc_f, msg = next(results)
+                    if im_file:
+                        lb = dict(
                             im_file=im_file,
                             shape=shape,
                             cls=lb[:, 0:1],  # n, 1
@@ -113,12 +139,30 @@ class YOLODataset(BaseDataset):
                             normalized=True,
                             bbox_format="xywh",
                         )
-                    )
+                nm += nm_f
+                nf += nf_f
+                ne += ne_f
+                nc += nc_f
+                flags[i] = nm_f | nf_f << 1 | ne_f << 2 | nc_f << 3
+                if not nc_f:
+                    x["labels"].append(lb)
+                    rows.append(i)
+                    if msg:
+                        file_msgs[len(rows) - 1] = msg
                 if msg:
                     msgs.append(msg)
                 pbar.desc = f"{desc} {nf} images, {nm + ne} backgrounds, {nc} corrupt"
             pbar.close()
+        dt = time.perf_counter() - t
 
+        if todo:  # restat verified files, i.e. corrupt JPEGs restored in place
+            stats[todo] = np.concatenate(
+                (file_stats([self.im_files[i] for i in todo]), file_stats([self.label_files[i] for i in todo])), 1
+            )
+        LOGGER.info(
+            f"{self.prefix}Verified {len(todo)} new or changed files in {dt:.1f}s ({len(todo) / max(dt, 1e-6):.0f} "
+            f"files/s), {total - len(todo)} unchanged files reused from cache"
+        )
         if msgs:
             LOGGER.info("\n".join(msgs))
         if nf == 0:
@@ -126,19 +170,61 @@ class YOLODataset(BaseDataset):
         x["hash"] = get_hash(self.label_files + self.im_files)
         x["results"] = nf, nm, ne, nc, len(self.im_files)
         x["msgs"] = msgs  # warnings
-        save_dataset_cache_file(self.prefix, path, x, DATASET_CACHE_VERSION)
+        x["files"] = dict(stats=stats[rows], flags=flags[rows], msgs=file_msgs, args=verify_args)  # per label row
+        if self.lazy_labels:
+            save_label_store(self.prefix, path, x, DATASET_CACHE_VERSION)
+        else:
+            save_dataset_cache_file(self.prefix, path, x, DATASET_CACHE_VERSION)
         return x
 
+    def _reusable_labels(self, previous, stats, verify_args):
+        """
+        Returns the verification results of a previous cache for images whose image and label files are unchanged.
+
+        The per-file records of a previous cache are aligned with its labels, so corrupt images are always verified
+        again. A *.lcache store keeps the stats and flags as memory-mapped columns and its file names in 'files'.
+
+        Args:
+            previous (dict | None): Previous cache with per-file records under 'files'.
+            stats (np.ndarray): Current size and modification time of the image and label files, shape (n, 4).
+            verify_args (tuple): Current (use_keypoints, num_cls, nkpt, ndim) verification arguments.
+
+        Returns:
+            (dict): Index of each reusable image to its (label, nm, nf, ne, nc, msg) result.
+        """
+        files = (previous or {}).get("files")
+        if not files or tuple(files["args"]) != verify_args:
+            return {}
+        labels = previous["labels"]
+        if isinstance(labels, LabelStore):  # memory-mapped columns
+            im_files, columns = labels.im_files, labels.columns
+            old_stats, old_flags = columns.get("file_stats"), columns.get("file_flags")
+        else:
+            im_files, old_stats, old_flags = [lb["im_file"] for lb in labels], files.get("stats"), files.get("flags")
+        if old_stats is None or not len(im_files) or len(old_stats) != len(im_files):
+            return {}
+        index = {f: k for k, f in enumerate(im_files)}
+        k = np.array([index.get(f, -1) for f in self.im_files], dtype=np.int64)
+        unchanged = np.nonzero((k >= 0) & (old_stats[k] == stats).all(1))[0]
+        flags = np.asarray(old_flags[k[unchanged]]).tolist()
+        return {
+            i: (labels[r], f & 1, f >> 1 & 1, f >> 2 & 1, 0, files["msgs"].get(r, ""))
+            for i, r, f in zip(unchanged.tolist(), k[unchanged].tolist(), flags)
+        }
+
     def get_labels(self):
         """Returns dictionary of labels for YOLO training."""
         self.label_files = img2label_paths(self.im_files)
-        cache_path = Path(self.label_files[0]).parent.with_suffix(".cache")
+        cache_path = Path(self.label_files[0]).parent.with_suffix(".lcache" if self.lazy_labels else ".cache")
+        cache, exists = None, False
         try:
-            cache, exists = load_dataset_cache_file(cache_path), True  # attempt to load a *.cache file
+            load = load_label_store if self.lazy_labels else load_dataset_cache_file
+            cache, exists = load(cache_path), True  # attempt to load a *.cache file or *.lcache directory
             assert cache["version"] == DATASET_CACHE_VERSION  # matches current version
             assert cache["hash"] == get_hash(self.label_files + self.im_files)  # identical hash
         except (FileNotFoundError, AssertionError, AttributeError):
-            cache, exists = self.cache_labels(cache_path), False  # run cache ops
+            previous = cache if exists and cache["version"] == DATASET_CACHE_VERSION else None  # reuse unchanged files
+            cache, exists = self.cache_labels(cache_path, previous), False  # run cache ops
 
         # Display cache
         nf, nm, ne, nc, n = cache.pop("results")  # found, missing, empty, corrupt, total
@@ -153,19 +239,25 @@ class YOLODataset(BaseDataset):
         labels = cache["labels"]
         if not labels:
             LOGGER.warning(f"WARNING ⚠️ No images found in {cache_path}, training may not work correctly. {HELP_URL}")
-        self.im_files = [lb["im_file"] for lb in labels]  # update im_files
-
-        # Check if the dataset is all boxes or all segments
-        lengths = ((len(lb["cls"]), len(lb["bboxes"]), len(lb["segments"])) for lb in labels)
-        len_cls, len_boxes, len_segments = (sum(x) for x in zip(*lengths))
+        if isinstance(labels, LabelStore):  # read the columns, labels are built on access
+            self.im_files = labels.im_files
+            len_cls, len_boxes, len_segments = labels.counts()
+        else:
+            self.im_files = [lb["im_file"] for lb in labels]  # update im_files
+            # Check if the dataset is all boxes or all segments
+            lengths = ((len(lb["cls"]), len(lb["bboxes"]), len(lb["segments"])) for lb in labels)
+            len_cls, len_boxes, len_segments = (sum(x) for x in zip(*lengths))
         if len_segments and len_boxes != len_segments:
             LOGGER.warning(
                 f"WARNING ⚠️ Box and segment counts should be equal, but got len(segments) = {len_segments}, "
                 f"len(boxes) = {len_boxes}. To resolve this only boxes will be used and all segments will be removed. "
                 "To avoid this please supply either a detect or segment dataset, not a detect-segment mixed dataset."
             )
-            for lb in labels:
-                lb["segments"] = []
+            if isinstance(labels, LabelStore):
+                labels.drop_segments = True
+            else:
+                for lb in labels:
+                    lb["segments"] = []
         if len_cls == 0:
             LOGGER.warning(f"WARNING ⚠️ No labels found in {cache_path}, training may not work correctly. {HELP_URL}")
         return labels
@@ -191,6 +283,8 @@ class YOLODataset(BaseDataset):
                 bgr=hyp.bgr if self.augment else 0.0,  # only affect training.
             )
         )
+        if self.augment and hyp.profile_transforms:
+            transforms.enable_profiling()
         return transforms
 
     def close_mosaic(self, hyp):
@@ -219,7 +313,7 @@ class YOLODataset(BaseDataset):
         if len(segments) > 0:
             # list[np.array(1000, 2)] * num_samples
             # (N, 1000, 2)
-            segments = np.stack(resample_segments(segments, n=segment_resamples), axis=0)
+            segments = resample_segments(segments, n=segment_resamples)
         else:
             segments = np.zeros((0, segment_resamples, 2), dtype=np.float32)
         label["instances"] = Instances(bboxes, segments, keypoints, bbox_format=bbox_format, normalized=normalized)
@@ -371,6 +465,8 @@ class YOLOMultiModalDataset(YOLODataset):
     Args:
         data (dict, optional): A dataset YAML dictionary. Defaults to None.
         task (str): An explicit arg to point current task, Defaults to 'detect'.
+        lazy_labels (bool): Cache labels as memory-mapped columns in a *.lcache directory and build label
+            dictionaries on access, for very large datasets. Defaults to False.
 
     Returns:
         (torch.utils.data.Dataset): A PyTorch dataset object that can be used for training an object detection model.
@@ -4,9 +4,10 @@ import glob
 import math
 import os
 import time
+from collections import deque
 from dataclasses import dataclass
 from pathlib import Path
-from threading import Thread
+from threading import Condition, Thread
 from urllib.parse import urlparse
 
 import cv2
@@ -34,14 +35,25 @@ class LoadStreams:
     """
     Stream Loader for various types of video streams, Supports RTSP, RTMP, HTTP, and TCP streams.
 
+    Every stream is read by a daemon thread that pushes (frame, capture timestamp, frame number) entries into a ring
+    buffer, keeping only the latest frame or, with `buffer=True`, up to 30 frames in FIFO order. `__next__` waits on a
+    condition variable that the capture threads notify, rather than sleeping, so a batch is returned as soon as every
+    stream has a frame.
+
     Attributes:
         sources (str): The source input paths or URLs for the video streams.
         vid_stride (int): Video frame-rate stride, defaults to 1.
         buffer (bool): Whether to buffer input streams, defaults to False.
         running (bool): Flag to indicate if the streaming thread is running.
         mode (str): Set to 'stream' indicating real-time capture.
-        imgs (list): List of image frames for each stream.
+        buffers (list): Ring buffers (collections.deque) of (frame, timestamp, frame number) for each stream.
+        cond (threading.Condition): Condition notified when a frame is pushed to or taken from a buffer.
         fps (list): List of FPS for each stream.
+        capture_fps (list): Measured capture FPS of each stream, a moving average.
+        captured (list): Number of frames captured from each stream.
+        dropped (list): Number of captured frames of each stream that were overwritten before being returned.
+        timestamps (list): Capture timestamps (time.time()) of the frames of the last batch.
+        frame_ids (list): Frame numbers of the frames of the last batch.
         frames (list): List of total frames for each stream.
         threads (list): List of threads for each stream.
         shape (list): List of shapes for each stream.
@@ -51,6 +63,7 @@ class LoadStreams:
     Methods:
         __init__: Initialize the stream loader.
         update: Read stream frames in daemon thread.
+        stats: Return per-stream FPS, queue depth and frame counters for monitoring.
         close: Close stream loader and release resources.
         __iter__: Returns an iterator object for the class.
         __next__: Returns source paths, transformed, and original images for processing.
@@ -77,7 +90,13 @@ class LoadStreams:
         self.frames = [0] * n
         self.threads = [None] * n
         self.caps = [None] * n  # video capture objects
-        self.imgs = [[] for _ in range(n)]  # images
+        self.buffers = [deque(maxlen=30 if buffer else 1) for _ in range(n)]  # (image, timestamp, frame number)
+        self.cond = Condition()  # notified on every push to and pop from the buffers
+        self.capture_fps = [0.0] * n  # measured frames per second
+        self.captured = [1] * n  # frames captured, starting with the first frame read below
+        self.dropped = [0] * n  # frames overwritten in the latest-only buffer before being returned
+        self.timestamps = [0.0] * n  # capture timestamps of the last batch
+        self.frame_ids = [-vid_stride] * n  # frame numbers of the last batch, one stride before the first frame
         self.shape = [[] for _ in range(n)]  # image shapes
         self.sources = [ops.clean_str(x) for x in sources]  # clean source names for later
         for i, s in enumerate(sources):  # index, source
@@ -106,7 +125,7 @@ class LoadStreams:
             success, im = self.caps[i].read()  # guarantee first frame
             if not success or im is None:
                 raise ConnectionError(f"{st}Failed to read images from {s}")
-            self.imgs[i].append(im)
+            self.buffers[i].append((im, time.time(), 0))
             self.shape[i] = im.shape
             self.threads[i] = Thread(target=self.update, args=([i, self.caps[i], s]), daemon=True)
             LOGGER.info(f"{st}Success ✅ ({self.frames[i]} frames of shape {w}x{h} at {self.fps[i]:.2f} FPS)")
@@ -115,27 +134,42 @@ class LoadStreams:
 
     def update(self, i, cap, stream):
         """Read stream `i` frames in daemon thread."""
-        n, f = 0, self.frames[i]  # frame number, frame array
+        n, f, buffer = 0, self.frames[i], self.buffers[i]  # frame number, frame count, ring buffer
+        t0, interval = time.time(), 1 / self.fps[i]  # last capture time, moving average of capture intervals
         while self.running and cap.isOpened() and n < (f - 1):
-            if len(self.imgs[i]) < 30:  # keep a <=30-image buffer
-                n += 1
-                cap.grab()  # .read() = .grab() followed by .retrieve()
-                if n % self.vid_stride == 0:
-                    success, im = cap.retrieve()
-                    if not success:
-                        im = np.zeros(self.shape[i], dtype=np.uint8)
-                        LOGGER.warning("WARNING ⚠️ Video stream unresponsive, please check your IP camera connection.")
-                        cap.open(stream)  # re-open stream if signal was lost
-                    if self.buffer:
-                        self.imgs[i].append(im)
-                    else:
-                        self.imgs[i] = [im]
-            else:
-                time.sleep(0.01)  # wait until the buffer is empty
+            if len(buffer) == buffer.maxlen and self.buffer:  # keep a <=30-image buffer
+                with self.cond:  # wait until __next__ takes a frame
+                    self.cond.wait_for(lambda: len(buffer) < buffer.maxlen or not self.running, timeout=1)
+                continue
+            n += 1
+            cap.grab()  # .read() = .grab() followed by .retrieve()
+            if n % self.vid_stride == 0:
+                t = time.time()
+                success, im = cap.retrieve()
+                if not success:
+                    im = np.zeros(self.shape[i], dtype=np.uint8)
+                    LOGGER.warning("WARNING ⚠️ Video stream unresponsive, please check your IP camera connection.")
+                    cap.open(stream)  # re-open stream if signal was lost
+                buffer.append((im, t, n))  # a full latest-only buffer drops its frame, counted in __next__
+                interval, t0 = 0.9 * interval + 0.1 * (t - t0), t
+                self.capture_fps[i], self.captured[i] = 1 / max(interval, 1e-6), self.captured[i] + 1
+                with self.cond:
+                    self.cond.notify_all()
+        with self.cond:
+            self.cond.notify_all()  # wake __next__ to see the stream has ended
+
+    def stats(self):
+        """Return a list of dicts with the capture FPS, queue depth and captured and dropped frames of each stream."""
+        return [
+            {"source": s, "fps": round(fps, 2), "queue": len(b), "captured": c, "dropped": d}
+            for s, fps, b, c, d in zip(self.sources, self.capture_fps, self.buffers, self.captured, self.dropped)
+        ]
 
     def close(self):
         """Close stream loader and release resources."""
         self.running = False  # stop flag for Thread
+        with self.cond:
+            self.cond.notify_all()  # wake threads waiting for buffer space
         for thread in self.threads:
             if thread.is_alive():
                 thread.join(timeout=5)  # Add timeout
@@ -156,25 +190,26 @@ class LoadStreams:
         self.count += 1
 
         images = []
-        for i, x in enumerate(self.imgs):
-            # Wait until a frame is available in each buffer
-            while not x:
-                if not self.threads[i].is_alive() or cv2.waitKey(1) == ord("q"):  # q to quit
-                    self.close()
-                    raise StopIteration
-                time.sleep(1 / min(self.fps))
-                x = self.imgs[i]
-                if not x:
-                    LOGGER.warning(f"WARNING ⚠️ Waiting for stream {i}")
-
-            # Get and remove the first frame from imgs buffer
+        for i, buffer in enumerate(self.buffers):
+            # Wait until a frame is available in each buffer, woken by the capture thread as soon as it pushes one
+            while not buffer and self.threads[i].is_alive():
+                if cv2.waitKey(1) == ord("q"):  # q to quit, checked without holding the lock the capture threads need
+                    break
+                with self.cond:  # held only to wait, the buffer is checked again so no notification is missed
+                    if not buffer and not self.cond.wait(timeout=1):
+                        LOGGER.warning(f"WARNING ⚠️ Waiting for stream {i}")
+            if not buffer:
+                self.close()
+                raise StopIteration
+
+            # Get the first frame of a FIFO buffer or the only, most recent, frame of a latest-only buffer
+            im, self.timestamps[i], n = buffer.popleft()
+            self.dropped[i] += (n - self.frame_ids[i]) // self.vid_stride - 1  # frames skipped since the last batch
+            self.frame_ids[i] = n
+            images.append(im)
             if self.buffer:
-                images.append(x.pop(0))
-
-            # Get the last frame, and clear the rest from the imgs buffer
-            else:
-                images.append(x.pop(-1) if x else np.zeros(self.shape[i], dtype=np.uint8))
-                x.clear()
+                with self.cond:
+                    self.cond.notify_all()  # wake the capture thread if it waits for buffer space
 
         return self.sources, images, [""] * self.bs
 
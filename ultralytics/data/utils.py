@@ -1,10 +1,12 @@
 # Ultralytics YOLO 🚀, AGPL-3.0 license
 
 import contextlib
+import copy
 import hashlib
 import json
 import os
 import random
+import shutil
 import subprocess
 import time
 import zipfile
@@ -56,6 +58,20 @@ def get_hash(paths):
     return h.hexdigest()  # return hash
 
 
+def file_stats(paths):
+    """Returns an int64 array of shape (n, 2) with the size and modification time in ns of paths, -1 if missing."""
+
+    def stat(p):
+        try:
+            s = os.stat(p)
+            return s.st_size, s.st_mtime_ns
+        except OSError:
+            return -1, -1
+
+    with ThreadPool(NUM_THREADS) as pool:
+        return np.array(pool.map(stat, paths, chunksize=256), dtype=np.int64).reshape(-1, 2)
+
+
 def exif_size(img: Image.Image):
     """Returns exif-corrected PIL size."""
     s = img.size  # (width, height)
@@ -674,3 +690,175 @@ def save_dataset_cache_file(prefix, path, x, version):
         LOGGER.info(f"{prefix}New cache created: {path}")
     else:
         LOGGER.warning(f"{prefix}WARNING ⚠️ Cache directory {path.parent} is not writeable, cache not saved.")
+
+
+class LabelStore:
+    """
+    Lazily indexed sequence of YOLO label dictionaries backed by the memory-mapped columns of a *.lcache directory.
+
+    The instances of all images are stored as concatenated cls, bboxes, segment and keypoint arrays with per-image
+    offsets, so opening a store and indexing an image only touches the pages of that image. Label dictionaries are
+    built on access, which keeps startup time and memory independent of the number of images.
+
+    Attributes:
+        path (Path): The *.lcache directory.
+        rows (np.ndarray): Stored row of each index, None for the stored order.
+        include_class (np.ndarray): Classes to keep, None to keep all.
+        single_cls (bool): Return all instances as class 0.
+        drop_segments (bool): Return no segments, i.e. for mixed detect-segment datasets.
+        columns (dict): Memory-mapped column arrays.
+
+    Example:
+        ```python
+        from ultralytics.data.utils import load_label_store
+
+        labels = load_label_store(Path('coco/labels/train2017.lcache'))['labels']
+        label = labels[0]  # dict(im_file, shape, cls, bboxes, segments, keypoints, normalized, bbox_format)
+        ```
+    """
+
+    def __init__(self, path, rows=None):
+        """Opens the columns of the *.lcache directory at path."""
+        self.path = Path(path)
+        self.rows = rows
+        self.include_class, self.single_cls, self.drop_segments = None, False, False
+        self._open()
+
+    def _open(self):
+        """Memory-maps all columns."""
+        self.columns = {f.stem: np.load(f, mmap_mode="r") for f in self.path.glob("*.npy") if f.stem != "meta"}
+
+    def __getstate__(self):
+        """Drops the memory maps when pickled, i.e. for DataLoader workers, which map the columns again."""
+        state = self.__dict__.copy()
+        state.pop("columns")
+        return state
+
+    def __setstate__(self, state):
+        """Restores the store and maps the columns again."""
+        self.__dict__.update(state)
+        self._open()
+
+    def __len__(self):
+        """Returns the number of images."""
+        return len(self.columns["shapes"]) if self.rows is None else len(self.rows)
+
+    def __iter__(self):
+        """Iterates over the label dictionaries of all images."""
+        return (self[i] for i in range(len(self)))
+
+    def __getitem__(self, index):
+        """Returns the label dictionary of image index, or a reordered store for a slice or array of indices."""
+        if not isinstance(index, (int, np.integer)):  # reorder or subset, i.e. for rectangular training
+            store = copy.copy(self)
+            store.rows = (np.arange(len(self)) if self.rows is None else self.rows)[index]
+            return store
+        if not -len(self) <= index < len(self):
+            raise IndexError(f"label index {index} out of range for {len(self)} images")
+        r = (index % len(self)) if self.rows is None else self.rows[index]
+        c = self.columns
+        a, b = c["offsets"][r : r + 2]
+        cls, bboxes = np.array(c["cls"][a:b]), np.array(c["bboxes"][a:b])
+        keypoints = np.array(c["keypoints"][a:b]) if "keypoints" in c else None
+        s = c["seg_offsets"][a : b + 1]
+        segments = []
+        if not self.drop_segments and s[-1] > s[0]:
+            segments = [np.array(c["segments"][p:q]) for p, q in zip(s, s[1:])]
+        if self.include_class is not None:
+            j = (cls == self.include_class).any(1)
+            cls, bboxes = cls[j], bboxes[j]
+            if segments:
+                segments = [x for x, k in zip(segments, j) if k]
+            if keypoints is not None:
+                keypoints = keypoints[j]
+        if self.single_cls:
+            cls[:, 0] = 0
+        f0, f1 = c["file_offsets"][r : r + 2]
+        return dict(
+            im_file=bytes(c["files"][f0:f1]).decode(),
+            shape=tuple(c["shapes"][r].tolist()),
+            cls=cls,
+            bboxes=bboxes,
+            segments=segments,
+            keypoints=keypoints,
+            normalized=True,
+            bbox_format="xywh",
+        )
+
+    @property
+    def im_files(self):
+        """Image files of all images."""
+        blob, offsets = bytes(self.columns["files"]), self.columns["file_offsets"].tolist()
+        files = [blob[a:b].decode() for a, b in zip(offsets, offsets[1:])]
+        return files if self.rows is None else [files[r] for r in self.rows]
+
+    @property
+    def shapes(self):
+        """Original (h, w) shapes of all images."""
+        return np.array(self.columns["shapes"] if self.rows is None else self.columns["shapes"][self.rows])
+
+    def counts(self):
+        """Returns the total number of classes, boxes and segments of all stored images."""
+        n = len(self.columns["cls"])
+        return n, n, int(np.count_nonzero(np.diff(self.columns["seg_offsets"])))
+
+    def concatenate(self, key):
+        """Returns the concatenated 'cls' or 'bboxes' instances of all stored images, i.e. for label statistics."""
+        x = np.array(self.columns[key])
+        if self.include_class is not None:
+            x = x[(self.columns["cls"] == self.include_class).any(1)]
+        if self.single_cls and key == "cls":
+            x[:] = 0
+        return x
+
+    def filter(self, include_class=None, single_cls=False):
+        """Keeps only the instances of include_class and returns all instances as class 0 if single_cls."""
+        if include_class is not None:
+            self.include_class = np.array(include_class).reshape(1, -1)
+        self.single_cls = single_cls
+
+
+def load_label_store(path):
+    """Load an Ultralytics *.lcache dictionary from path, with its labels as a lazily indexed LabelStore."""
+    cache = np.load(str(Path(path) / "meta.npy"), allow_pickle=True).item()  # load dict
+    cache["labels"] = LabelStore(path)
+    return cache
+
+
+def save_label_store(prefix, path, x, version):
+    """Save an Ultralytics dataset cache dictionary x to path as a *.lcache directory of memory-mappable columns."""
+    x["version"] = version  # add cache version
+    if not is_dir_writeable(path.parent):
+        LOGGER.warning(f"{prefix}WARNING ⚠️ Cache directory {path.parent} is not writeable, cache not saved.")
+        return
+    labels = x.pop("labels")
+    files = [lb["im_file"].encode() for lb in labels]
+    segments = [lb["segments"] or [np.zeros((0, 2), dtype=np.float32)] * len(lb["cls"]) for lb in labels]
+    segments = [s for image in segments for s in image]  # per instance
+    columns = dict(
+        files=np.frombuffer(b"".join(files), dtype=np.uint8),
+        file_offsets=np.cumsum([0] + [len(f) for f in files], dtype=np.int64),
+        shapes=np.array([lb["shape"] for lb in labels], dtype=np.int32).reshape(-1, 2),
+        offsets=np.cumsum([0] + [len(lb["cls"]) for lb in labels], dtype=np.int64),
+        cls=np.concatenate([np.zeros((0, 1), dtype=np.float32)] + [lb["cls"] for lb in labels]),
+        bboxes=np.concatenate([np.zeros((0, 4), dtype=np.float32)] + [lb["bboxes"] for lb in labels]),
+        seg_offsets=np.cumsum([0] + [len(s) for s in segments], dtype=np.int64),
+        segments=np.concatenate([np.zeros((0, 2), dtype=np.float32)] + segments),
+    )
+    keypoints = [lb["keypoints"] for lb in labels if lb["keypoints"] is not None]
+    if keypoints:
+        columns["keypoints"] = np.concatenate(keypoints)
+    files = x.get("files")
+    if files:  # per-file stats and flags as columns, file names are read from the 'files' column
+        columns.update(file_stats=files["stats"], file_flags=files["flags"])
+        x["files"] = dict(args=files["args"], msgs=files["msgs"])
+    tmp = path.with_suffix(".lcache.tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir()
+    for k, v in columns.items():
+        np.save(tmp / f"{k}.npy", v)
+    np.save(tmp / "meta.npy", x)
+    shutil.rmtree(path, ignore_errors=True)  # remove *.lcache directory if exists
+    tmp.rename(path)
+    x["labels"] = LabelStore(path)
+    LOGGER.info(f"{prefix}New cache created: {path}")
@@ -30,13 +30,18 @@ Usage - formats:
 """
 
 import platform
+import queue
 import re
 import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import cv2
 import numpy as np
 import torch
+from PIL import Image
 
 from ultralytics.cfg import get_cfg, get_save_dir
 from ultralytics.data import load_inference_source
@@ -60,6 +65,148 @@ Example:
 """
 
 
+class ResultWriter:
+    """
+    Writes predicted images, video frames, label files and crops, on the calling thread or in the background.
+
+    With workers > 0, writes are put on a bounded queue and run in order by a writer thread. The writer thread appends
+    video frames itself, hands image and crop encoding to a pool of `workers` threads and buffers label lines, writing
+    each label file once per flush. A full queue blocks the caller. With workers=0 everything is written immediately.
+
+    Attributes:
+        videos (dict): Dictionary of {save_path: cv2.VideoWriter, ...}.
+        labels (dict): Buffered label lines per label file.
+        errors (list): Exceptions raised by background writes, re-raised on the calling thread.
+    """
+
+    def __init__(self, workers=0, maxsize=8, flush=1000):
+        """
+        Initializes the ResultWriter.
+
+        Args:
+            workers (int): Number of threads encoding images and crops in the background, 0 to write on the caller.
+            maxsize (int): Maximum number of queued writes and of images being encoded at once.
+            flush (int): Number of buffered label lines that triggers writing them in the background.
+        """
+        self.videos, self.labels, self.errors = {}, defaultdict(list), []
+        self.flush_lines, self.pending = flush, 0
+        self.reserved = set()  # crop paths being written, not on disk yet
+        self.queue = self.pool = self.thread = None
+        if workers:
+            self.queue = queue.Queue(maxsize)
+            self.pool = ThreadPoolExecutor(workers, thread_name_prefix="ResultWriter")
+            self.slots = threading.BoundedSemaphore(maxsize)
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+
+    def imwrite(self, file, im):
+        """Saves image im to file."""
+        self._put(self._encode, self._imwrite, Path(file), im)
+
+    def video(self, file, im, fps=30, fourcc="MJPG"):
+        """Appends frame im to the video file, which is opened on its first frame."""
+        self._put(self._video, str(file), im, fps, fourcc)
+
+    def text(self, file, lines):
+        """Appends lines to the label file."""
+        self._put(self._text, str(file), lines)
+
+    def crop(self, file, im):
+        """Saves crop im to file, or to the next free incremented path like increment_path()."""
+        self._put(self._crop, Path(file), im.copy())  # always copy, the source image may be reused
+
+    def close(self):
+        """Finishes all pending writes, flushes the label files and releases the video writers."""
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.pool.shutdown(wait=True)
+            self.thread = None
+        self._flush()
+        for v in self.videos.values():
+            v.release()
+        self.videos.clear()
+        if self.errors:
+            raise self.errors[0]
+
+    def _put(self, fn, *args):
+        """Runs fn(*args) now, or queues it for the writer thread."""
+        if self.errors:
+            raise self.errors[0]
+        if self.queue is None:
+            fn(*args)
+        else:
+            self.queue.put((fn, args))
+
+    def _run(self):
+        """Runs queued writes in order until close()."""
+        for fn, args in iter(self.queue.get, None):
+            try:
+                fn(*args)
+            except Exception as e:
+                self.errors.append(e)
+
+    def _encode(self, fn, *args):
+        """Runs fn(*args) in the thread pool with at most maxsize encodes in flight, or now without a pool."""
+        if self.pool is None:
+            return fn(*args)
+        self.slots.acquire()
+        self.pool.submit(fn, *args).add_done_callback(self._done)
+
+    def _done(self, future):
+        """Frees the slot of a finished encode and keeps its exception."""
+        self.slots.release()
+        if future.exception() is not None:
+            self.errors.append(future.exception())
+
+    @staticmethod
+    def _imwrite(file, im):
+        """Encodes and saves an image, making its directory if needed."""
+        file.parent.mkdir(parents=True, exist_ok=True)
+        cv2.imwrite(str(file), im)
+
+    def _video(self, file, im, fps, fourcc):
+        """Appends a frame to a video, opening its writer on the first frame."""
+        if file not in self.videos:
+            self.videos[file] = cv2.VideoWriter(
+                filename=file,
+                fourcc=cv2.VideoWriter_fourcc(*fourcc),
+                fps=fps,  # integer required, floats produce error in MP4 codec
+                frameSize=(im.shape[1], im.shape[0]),  # (width, height)
+            )
+        self.videos[file].write(im)
+
+    def _text(self, file, lines):
+        """Buffers label lines, writing them now without a writer thread or once enough lines are buffered."""
+        self.labels[file].extend(lines)
+        self.pending += len(lines)
+        if self.queue is None or self.pending >= self.flush_lines:
+            self._flush()
+
+    def _flush(self):
+        """Appends all buffered lines to their label files, opening every file once."""
+        for file, lines in self.labels.items():
+            Path(file).parent.mkdir(parents=True, exist_ok=True)
+            with open(file, "a") as f:
+                f.writelines(text + "\n" for text in lines)
+        self.labels.clear()
+        self.pending = 0
+
+    def _crop(self, file, im):
+        """Reserves the first free path for a crop, also among crops still being encoded, and saves it."""
+        path, n = file, 2
+        while path in self.reserved or path.exists():
+            path, n = file.with_name(f"{file.stem}{n}{file.suffix}"), n + 1
+        self.reserved.add(path)
+        self._encode(self._save_crop, path, im)
+
+    def _save_crop(self, path, im):
+        """Saves a BGR crop as RGB JPEG like save_one_box() and releases its path."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        Image.fromarray(im[..., ::-1]).save(path, quality=95, subsampling=0)
+        self.reserved.discard(path)
+
+
 class BasePredictor:
     """
     BasePredictor.
@@ -74,7 +221,7 @@ class BasePredictor:
         data (dict): Data configuration.
         device (torch.device): Device used for prediction.
         dataset (Dataset): Dataset used for prediction.
-        vid_writer (dict): Dictionary of {save_path: video_writer, ...} writer for saving video output.
+        writer (ResultWriter): Writer of saved images, videos, labels and crops, in the background if `save_workers`.
     """
     def __init__(self, cfg=DEFAULT_CFG, overrides=None, _callbacks=None):
         """
@@ -98,7 +245,7 @@ class BasePredictor:
         self.imgsz = None
         self.device = None
         self.dataset = None
-        self.vid_path,self.vid_writer =None,None  # dict of {save_path: video_writer, ...}
+        self.writer = None  # ResultWriter of saved images, videos, labels and crops
         self.plotted_img = None
         self.data_path = None
         self.source_type = None
@@ -236,7 +383,6 @@ class BasePredictor:
             or any(getattr(self.dataset, "video_flag", [False]))
         ):  # videos
             LOGGER.warning(STREAM_WARNING)
-        self.vid_path, self.vid_writer = [None] * self.dataset.bs, [None] * self.dataset.bs
 
     @smart_inference_mode()
     def stream_inference(self, source=None, model=None, *args, **kwargs):
@@ -262,21 +408,165 @@ class BasePredictor:
                 self.done_warmup = True
 
             self.seen, self.windows, self.batch = 0, [], None
+            self.writer = ResultWriter(self.args.save_workers)
             profilers = (
-                ops.Profile(device=self.device),
+                ops.Profile(device=None if self.args.pipeline else self.device),  # no CUDA sync in the decode thread
                 ops.Profile(device=self.device),
                 ops.Profile(device=self.device),
             )
             self.run_callbacks("on_predict_start")
-            for self.batch in self.dataset:
-                names_dic = {}
-                self.run_callbacks("on_predict_batch_start")
-                paths, im0s, s = self.batch
+            try:
+                if self.args.pipeline:
+                    im = yield from self.pipelined_inference(profilers, *args, **kwargs)
+                else:
+                    for self.batch in self.dataset:
+                        self.run_callbacks("on_predict_batch_start")
+                        paths, im0s, s = self.batch
+
+                        # Preprocess
+                        with profilers[0]:
+                            im = self.preprocess(im0s)
+
+                        # Inference
+                        with profilers[1]:
+                            preds = self.inference(im, *args, **kwargs)
+                            if self.args.embed:
+                                yield from [preds] if isinstance(preds, torch.Tensor) else preds  # yield embeddings
+                                continue
+
+                        # Postprocess
+                        with profilers[2]:
+                            self.results = self.postprocess(preds, im, im0s)
+                        self.run_callbacks("on_predict_postprocess_end")
+
+                        # Visualize, save, write results
+                        n = len(im0s)
+                        for i in range(n):
+                            self.seen += 1
+                            self.results[i].speed = {
+                                "preprocess": profilers[0].dt * 1e3 / n,
+                                "inference": profilers[1].dt * 1e3 / n,
+                                "postprocess": profilers[2].dt * 1e3 / n,
+                            }
+                            if self.args.verbose or self.args.save or self.args.save_txt or self.args.show:
+                                s[i] += self.write_results(i, Path(paths[i]), im, s)
+
+                        # Print batch results
+                        if self.args.verbose:
+                            LOGGER.info("\n".join(s))
+
+                        self.run_callbacks("on_predict_batch_end")
+                        yield from self.results
+            finally:
+                self.writer.close()  # finish pending writes and release video writers
 
+        # Print final results
+        if self.args.verbose and self.seen:
+            t = tuple(x.t / self.seen * 1e3 for x in profilers)  # speeds per image
+            LOGGER.info(
+                f"Speed: %.1fms preprocess, %.1fms inference, %.1fms postprocess per image at shape "
+                f"{(min(self.args.batch, self.seen), 3, *im.shape[2:])}" % t
+            )
+        if self.args.save or self.args.save_txt or self.args.save_crop:
+            nl = len(list(self.save_dir.glob("labels/*.txt")))  # number of labels
+            s = f"\n{nl} label{'s' * (nl > 1)} saved to {self.save_dir / 'labels'}" if self.args.save_txt else ""
+            LOGGER.info(f"Results saved to {colorstr('bold', self.save_dir)}{s}")
+        self.run_callbacks("on_predict_end")
 
-                # Preprocess
-                with profilers[0]:
-                    im = self.preprocess(im0s)
+    def pipelined_inference(self, profilers, *args, **kwargs):
+        """
+        Pipelined stream_inference() loop, enabled with `pipeline=True`.
+
+        Source decoding and preprocessing run in a worker thread and drawing/saving of finished batches in a second
+        one, connected to the inference loop by bounded queues so that decoding batch N+1 and writing batch N-1 overlap
+        with inference on batch N. Results are yielded and callbacks run on the calling thread in source order. Stage
+        occupancy and queue wait times are logged at the end when verbose.
+
+        Args:
+            profilers (tuple): Preprocess, inference and postprocess ops.Profile timers of stream_inference(), the
+                preprocess timer does not synchronize CUDA, which would serialize the decode and inference stages.
+
+        Returns:
+            (torch.Tensor): The last preprocessed batch, as the return value of the generator.
+        """
+        decoded, finished = queue.Queue(2), queue.Queue(2)  # bounded, at most 2 batches buffered between stages
+        stop, errors = threading.Event(), []
+        stages = {k: ops.Profile() for k in ("decode", "write")}  # stage times of the worker threads
+        waits = {k: ops.Profile() for k in ("decode", "inference", "write")}  # time blocked on a queue per stage
+        write = self.args.verbose or self.args.save or self.args.save_txt or self.args.save_crop or self.args.show
+        threaded_write = write and not self.args.show  # cv2.imshow() must stay on the calling thread
+
+        def put(q, item):
+            """Puts item on queue q unless the pipeline is being stopped."""
+            while not stop.is_set():
+                try:
+                    return q.put(item, timeout=0.1)
+                except queue.Full:
+                    continue
+
+        def get(q):
+            """Gets the next item from queue q, or None once the pipeline is stopped and q is drained."""
+            while not (stop.is_set() and q.empty()):
+                try:
+                    return q.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+
+        def decode_worker():
+            """Reads and preprocesses batches from the dataset."""
+            try:
+                source = iter(self.dataset)
+                while not stop.is_set():
+                    with stages["decode"]:
+                        batch = next(source, None)
+                    if batch is None:
+                        break
+                    # Capture the per-batch dataset state now, the dataset moves on while the batch is written
+                    frame, mode = getattr(self.dataset, "count", 0), self.dataset.mode
+                    fps = getattr(self.dataset, "fps", 30)
+                    with profilers[0]:
+                        im = self.preprocess(batch[1])
+                    with waits["decode"]:
+                        put(decoded, (batch, im, profilers[0].dt, (frame, mode, fps)))
+            except Exception as e:
+                errors.append(e)
+            finally:
+                put(decoded, None)
+
+        def write_batch(results, paths, im, s, state):
+            """Visualizes, saves and logs the results of one batch, with the dataset (frame, mode, fps) of the batch."""
+            frame, mode, fps = state
+            with stages["write"]:
+                for i in range(len(results)):
+                    s[i] += self.write_results(i, Path(paths[i]), im, s, results, frame=frame, mode=mode, fps=fps)
+                if self.args.verbose:
+                    LOGGER.info("\n".join(s))
+
+        def write_worker():
+            """Writes finished batches in order."""
+            try:
+                for item in iter(lambda: get(finished), None):
+                    write_batch(*item)
+            except Exception as e:
+                errors.append(e)
+                stop.set()
+
+        threads = [threading.Thread(target=decode_worker, daemon=True)]
+        if threaded_write:
+            threads.append(threading.Thread(target=write_worker, daemon=True))
+        for t in threads:
+            t.start()
+
+        t0, im = time.time(), None
+        try:
+            while True:
+                with waits["inference"]:
+                    item = get(decoded)
+                if item is None:
+                    break
+                self.batch, im, dt, state = item
+                self.run_callbacks("on_predict_batch_start")
+                paths, im0s, s = self.batch
 
                 # Inference
                 with profilers[1]:
@@ -290,64 +580,47 @@ class BasePredictor:
                     self.results = self.postprocess(preds, im, im0s)
                 self.run_callbacks("on_predict_postprocess_end")
 
-                # Visualize, save, write results
                 n = len(im0s)
-                for i in range(n):
-                    self.seen += 1
-                    self.results[i].speed = {
-                        "preprocess": profilers[0].dt * 1e3 / n,
+                self.seen += n
+                for result in self.results:
+                    result.speed = {
+                        "preprocess": dt * 1e3 / n,
                         "inference": profilers[1].dt * 1e3 / n,
                         "postprocess": profilers[2].dt * 1e3 / n,
-
                     }
-                    # 后修改部分
-                    # p,im0 = path[i],None if self.source_type.tensor else im0s[i].copy()
-                    # p =Path(p)
-                    # 将结果转换为Python列表
-                    result_list = self.results[i].boxes.cls.tolist()
-                    # 初始化一个空字典用于存储数字和它们的出现次数
-                    count_dict = {}
-                    # 遍历列表，统计数字出现的次数
-                    for number in result_list:
-                        if number in count_dict:
-                            count_dict[number] += 1
-                        else:
-                            count_dict[number] = 1
-                    for k, v in count_dict.items():
-                        names_dic[self.model.names[k]] = v
-
-                    result_str = '| '.join([f'{key}:{value}' for key, value in names_dic.items()])
-                    # 后修改部分
-                    if self.args.verbose or self.args.save or self.args.save_txt or self.args.show:
-                        s[i] += self.write_results(i, Path(paths[i]), im, s)
-                    cv2.putText(self.plotted_img,result_str,(30,30),cv2.FONT_HERSHEY_SIMPLEX,1,(0,0,255),2,cv2.LINE_AA)
-
-                # Print batch results
-                if self.args.verbose:
-                    LOGGER.info("\n".join(s))
+
+                # Visualize, save, write results
+                if threaded_write:
+                    with waits["write"]:
+                        put(finished, (self.results, paths, im, s, state))
+                elif write:
+                    write_batch(self.results, paths, im, s, state)
 
                 self.run_callbacks("on_predict_batch_end")
                 yield from self.results
+        finally:
+            stop.set()  # stops decoding early if the consumer stopped iterating, the writer drains its queue first
+            for t in threads:
+                t.join()
+        if errors:
+            raise errors[0]
 
-        # Release assets
-        # for v in self.vid_writer.values():
-        #     if isinstance(v, cv2.VideoWriter):
-        #         v.release()
-        if isinstance(self.vid_writer[-1],cv2.VideoWriter):
-            self.vid_writer[-1].release()
-
-        # Print final results
         if self.args.verbose and self.seen:
-            t = tuple(x.t / self.seen * 1e3 for x in profilers)  # speeds per image
+            wall = time.time() - t0
+            busy = {
+                "decode": stages["decode"].t,
+                "preprocess": profilers[0].t,
+                "inference": profilers[1].t,
+                "postprocess": profilers[2].t,
+                "write": stages["write"].t,
+            }
             LOGGER.info(
-                f"Speed: %.1fms preprocess, %.1fms inference, %.1fms postprocess per image at shape "
-                f"{(min(self.args.batch, self.seen), 3, *im.shape[2:])}" % t
+                "Pipeline occupancy: "
+                + ", ".join(f"{k} {v / wall:.0%} ({v / self.seen * 1e3:.1f}ms/im)" for k, v in busy.items())
+                + "\nPipeline queue wait per image: "
+                + ", ".join(f"{k} {v.t / self.seen * 1e3:.1f}ms" for k, v in waits.items())
             )
-        if self.args.save or self.args.save_txt or self.args.save_crop:
-            nl = len(list(self.save_dir.glob("labels/*.txt")))  # number of labels
-            s = f"\n{nl} label{'s' * (nl > 1)} saved to {self.save_dir / 'labels'}" if self.args.save_txt else ""
-            LOGGER.info(f"Results saved to {colorstr('bold', self.save_dir)}{s}")
-        self.run_callbacks("on_predict_end")
+        return im
 
     def setup_model(self, model, verbose=True):
         """Initialize YOLO model with given parameters and set it to evaluation mode."""
@@ -372,21 +645,34 @@ class BasePredictor:
     #     if platform.system() == 'Linux' and p not in self.windows:
 
 
-    def write_results(self, i, p, im, s):
-        """Write inference results to a file or directory."""
+    def write_results(self, i, p, im, s, results=None, frame=None, mode=None, fps=None):
+        """
+        Write inference results to a file or directory.
+
+        Args:
+            i (int): Index of the image in the batch.
+            p (Path): Path of the image.
+            im (torch.Tensor): Preprocessed batch.
+            s (List[str]): Log strings of the batch.
+            results (List[Results], optional): Results of the batch, defaults to self.results.
+            frame (int, optional): Stream frame count, defaults to self.dataset.count.
+            mode (str, optional): Dataset mode of the batch, i.e. 'image' or 'video', defaults to self.dataset.mode.
+            fps (float | list, optional): Dataset FPS of the batch, defaults to self.dataset.fps.
+        """
         string = ""  # print string
         if len(im.shape) == 3:
             im = im[None]  # expand for batch dim
         if self.source_type.stream or self.source_type.from_img or self.source_type.tensor:  # batch_size >= 1
             string += f"{i}: "
-            frame = self.dataset.count
+            frame = self.dataset.count if frame is None else frame
         else:
             match = re.search(r"frame (\d+)/", s[i])
             frame = int(match.group(1)) if match else None  # 0 if frame undetermined
 
-        self.txt_path = self.save_dir / "labels" / (p.stem + ("" if self.dataset.mode == "image" else f"_{frame}"))
+        mode = self.dataset.mode if mode is None else mode
+        self.txt_path = self.save_dir / "labels" / (p.stem + ("" if mode == "image" else f"_{frame}"))
         string += "%gx%g " % im.shape[2:]
-        result = self.results[i]
+        result = (self.results if results is None else results)[i]
         result.save_dir = self.save_dir.__str__()  # used in other locations
         string += result.verbose() + f"{result.speed['inference']:.1f}ms"
 
@@ -398,47 +684,37 @@ class BasePredictor:
                 conf=self.args.show_conf,
                 labels=self.args.show_labels,
                 im_gpu=None if self.args.retina_masks else im[i],
+                counts=self.args.show_counts,
             )
 
         # Save results
         if self.args.save_txt:
-            result.save_txt(f"{self.txt_path}.txt", save_conf=self.args.save_conf)
+            result.save_txt(f"{self.txt_path}.txt", save_conf=self.args.save_conf, writer=self.writer)
         if self.args.save_crop:
-            result.save_crop(save_dir=self.save_dir / "crops", file_name=self.txt_path.stem)
+            result.save_crop(save_dir=self.save_dir / "crops", file_name=self.txt_path.stem, writer=self.writer)
         if self.args.show:
             self.show(str(p))
         if self.args.save:
-            self.save_predicted_images(str(self.save_dir / p.name), frame)
+            self.save_predicted_images(str(self.save_dir / p.name), frame, mode=mode, fps=fps)
 
         return string
 
-    def save_predicted_images(self, save_path="", frame=0):
-        """Save video predictions as mp4 at specified path."""
+    def save_predicted_images(self, save_path="", frame=0, mode=None, fps=None):
+        """Save video predictions as mp4 at specified path, with the dataset mode and FPS defaulting to the current."""
         im = self.plotted_img
+        mode = self.dataset.mode if mode is None else mode
 
         # Save videos and streams
-        if self.dataset.mode in {"stream", "video"}:
-            fps = self.dataset.fps if self.dataset.mode == "video" else 30
-            frames_path = f'{save_path.split(".", 1)[0]}_frames/'
-            if save_path not in self.vid_writer:  # new video
-                if self.args.save_frames:
-                    Path(frames_path).mkdir(parents=True, exist_ok=True)
-                suffix, fourcc = (".mp4", "avc1") if MACOS else (".avi", "WMV2") if WINDOWS else (".avi", "MJPG")
-                self.vid_writer[save_path] = cv2.VideoWriter(
-                    filename=str(Path(save_path).with_suffix(suffix)),
-                    fourcc=cv2.VideoWriter_fourcc(*fourcc),
-                    fps=fps,  # integer required, floats produce error in MP4 codec
-                    frameSize=(im.shape[1], im.shape[0]),  # (width, height)
-                )
-
-            # Save video
-            self.vid_writer[save_path].write(im)
+        if mode in {"stream", "video"}:
+            fps = (self.dataset.fps if fps is None else fps) if mode == "video" else 30
+            suffix, fourcc = (".mp4", "avc1") if MACOS else (".avi", "WMV2") if WINDOWS else (".avi", "MJPG")
+            self.writer.video(Path(save_path).with_suffix(suffix), im, fps, fourcc)
             if self.args.save_frames:
-                cv2.imwrite(f"{frames_path}{frame}.jpg", im)
+                self.writer.imwrite(f"{Path(save_path).with_suffix('')}_frames/{frame}.jpg", im)
 
         # Save images
         else:
-            cv2.imwrite(save_path, im)
+            self.writer.imwrite(save_path, im)
 
     def show(self, p=""):
         """Display an image in a window using OpenCV imshow()."""
@@ -451,37 +727,6 @@ class BasePredictor:
         cv2.waitKey(300 if self.dataset.mode == "image" else 1)  # 1 millisecond
 
 
-    def save_preds(self, vid_cap, idx, save_path):
-        """Save video predictions as mp4 at specified path."""
-        im0 = self.plotted_img
-        # Save imgs
-        if self.dataset.mode == 'image':
-            cv2.imwrite(save_path, im0)
-        else:  # 'video' or 'stream'
-            frames_path = f'{save_path.split(".", 1)[0]}_frames/'
-            if self.vid_path[idx] != save_path:  # new video
-                Path(frames_path).mkdir(parents=True, exist_ok=True)
-                self.vid_path[idx] = save_path
-                self.vid_frame[idx] = 0
-                if isinstance(self.vid_writer[idx], cv2.VideoWriter):
-                    self.vid_writer[idx].release()  # release previous video writer
-                if vid_cap:  # video
-                    fps = int(vid_cap.get(cv2.CAP_PROP_FPS))  # integer required, floats produce error in MP4 codec
-                    w = int(vid_cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-                    h = int(vid_cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-                else:  # stream
-                    fps, w, h = 30, im0.shape[1], im0.shape[0]
-                suffix, fourcc = ('.mp4', 'avc1') if MACOS else ('.avi', 'WMV2') if WINDOWS else ('.avi', 'MJPG')
-                self.vid_writer[idx] = cv2.VideoWriter(str(Path(save_path).with_suffix(suffix)),
-                                                       cv2.VideoWriter_fourcc(*fourcc), fps, (w, h))
-            # Write video
-            self.vid_writer[idx].write(im0)
-
-            # Write frame
-            cv2.imwrite(f'{frames_path}{self.vid_frame[idx]}.jpg', im0)
-            self.vid_frame[idx] += 1
-
-
     def run_callbacks(self, event: str):
         """Runs all registered callbacks for a specific event."""
         for callback in self.callbacks.get(event, []):
@@ -5,8 +5,9 @@ Ultralytics Results, Boxes and Masks classes for handling inference results.
 Usage: See https://docs.ultralytics.com/modes/predict/
 """
 
-from copy import deepcopy
+from copy import copy, deepcopy
 from functools import lru_cache
+from itertools import chain
 from pathlib import Path
 
 import numpy as np
@@ -77,6 +78,7 @@ class Results(SimpleClass):
         speed (dict): Dictionary of preprocess, inference, and postprocess speeds (ms/image).
         names (dict): Dictionary of class names.
         path (str): Path to the image file.
+        counts (torch.Tensor | numpy.ndarray, optional): Number of detections per class, computed on access.
 
     Methods:
         update(boxes=None, masks=None, probs=None, obb=None): Updates object attributes with new detection results.
@@ -84,6 +86,7 @@ class Results(SimpleClass):
         numpy(): Returns a copy of the Results object with all tensors as numpy arrays.
         cuda(): Returns a copy of the Results object with all tensors on GPU memory.
         to(*args, **kwargs): Returns a copy of the Results object with tensors on a specified device and dtype.
+        compact(): Returns a copy of the Results object with masks run-length encoded on CPU.
         new(): Returns a new Results object with the same image, path, and names.
         plot(...): Plots detection results on an input image, returning an annotated image.
         show(): Show annotated results to screen.
@@ -103,7 +106,8 @@ class Results(SimpleClass):
             path (str): The path to the image file.
             names (dict): A dictionary of class names.
             boxes (torch.tensor, optional): A 2D tensor of bounding box coordinates for each detection.
-            masks (torch.tensor, optional): A 3D tensor of detection masks, where each mask is a binary image.
+            masks (torch.tensor | Masks, optional): A 3D tensor of detection masks, where each mask is a binary image,
+                or a Masks object, i.e. with box-local tiles from ROI mask assembly.
             probs (torch.tensor, optional): A 1D tensor of probabilities of each class for classification task.
             keypoints (torch.tensor, optional): A 2D tensor of keypoint coordinates for each detection.
             obb (torch.tensor, optional): A 2D tensor of oriented bounding box coordinates for each detection.
@@ -111,7 +115,7 @@ class Results(SimpleClass):
         self.orig_img = orig_img
         self.orig_shape = orig_img.shape[:2]
         self.boxes = Boxes(boxes, self.orig_shape) if boxes is not None else None  # native size boxes
-        self.masks = Masks(masks, self.orig_shape) if masks is not None else None  # native size or imgsz masks
+        self.masks = self._masks(masks) if masks is not None else None  # native size or imgsz masks
         self.probs = Probs(probs) if probs is not None else None
         self.keypoints = Keypoints(keypoints, self.orig_shape) if keypoints is not None else None
         self.obb = OBB(obb, self.orig_shape) if obb is not None else None
@@ -132,17 +136,32 @@ class Results(SimpleClass):
             if v is not None:
                 return len(v)
 
+    @property
+    def counts(self):
+        """Return the number of detections per class as a tensor of length len(names), or None without detections."""
+        pred_boxes = self.obb if self.obb is not None else self.boxes
+        if pred_boxes is None:
+            return None
+        cls = pred_boxes.cls
+        if isinstance(cls, torch.Tensor):
+            return torch.bincount(cls.int(), minlength=len(self.names))
+        return np.bincount(cls.astype(int), minlength=len(self.names))
+
     def update(self, boxes=None, masks=None, probs=None, obb=None):
         """Update the boxes, masks, and probs attributes of the Results object."""
         if boxes is not None:
             self.boxes = Boxes(ops.clip_boxes(boxes, self.orig_shape), self.orig_shape)
         if masks is not None:
-            self.masks = Masks(masks, self.orig_shape)
+            self.masks = self._masks(masks)
         if probs is not None:
             self.probs = probs
         if obb is not None:
             self.obb = OBB(obb, self.orig_shape)
 
+    def _masks(self, masks):
+        """Return masks as a Masks object of this image, keeping given Masks objects such as tiled masks."""
+        return masks if isinstance(masks, Masks) else Masks(masks, self.orig_shape)
+
     def _apply(self, fn, *args, **kwargs):
         """
         Applies a function to all non-empty attributes and returns a new Results object with modified attributes. This
@@ -179,6 +198,13 @@ class Results(SimpleClass):
         """Return a copy of the Results object with tensors on the specified device and dtype."""
         return self._apply("to", *args, **kwargs)
 
+    def compact(self):
+        """Return a copy of the Results object with masks run-length encoded on CPU, see Masks.compact()."""
+        r = copy(self)
+        if self.masks is not None:
+            r.masks = self.masks.compact()
+        return r
+
     def new(self):
         """Return a new Results object with the same image, path, and names."""
         return Results(orig_img=self.orig_img, path=self.path, names=self.names)
@@ -201,6 +227,7 @@ class Results(SimpleClass):
         show=False,
         save=False,
         filename=None,
+        counts=False,
     ):
         """
         Plots the detection results on an input RGB image. Accepts a numpy array (cv2) or a PIL Image.
@@ -222,6 +249,7 @@ class Results(SimpleClass):
             show (bool): Whether to display the annotated image directly.
             save (bool): Whether to save the annotated image to `filename`.
             filename (str): Filename to save image to if save is True.
+            counts (bool): Whether to plot the number of detections per class.
 
         Returns:
             (numpy.ndarray): A numpy array of the annotated image.
@@ -292,6 +320,12 @@ class Results(SimpleClass):
             for k in reversed(self.keypoints.data):
                 annotator.kpts(k, self.orig_shape, radius=kpt_radius, kpt_line=kpt_line)
 
+        # Plot per-class counts
+        if counts and pred_boxes is not None:
+            text = " | ".join(f"{names[c]}:{n}" for c, n in enumerate(self.counts.tolist()) if n)
+            x = round(self.orig_shape[0] * 0.03)
+            annotator.text([x, x], text, txt_color=(0, 0, 255))
+
         # Show results
         if show:
             annotator.show(self.path)
@@ -323,18 +357,19 @@ class Results(SimpleClass):
         if probs is not None:
             log_string += f"{', '.join(f'{self.names[j]} {probs.data[j]:.2f}' for j in probs.top5)}, "
         if boxes:
-            for c in boxes.cls.unique():
-                n = (boxes.cls == c).sum()  # detections per class
-                log_string += f"{n} {self.names[int(c)]}{'s' * (n > 1)}, "
+            for c, n in enumerate(self.counts.tolist()):  # detections per class
+                if n:
+                    log_string += f"{n} {self.names[c]}{'s' * (n > 1)}, "
         return log_string
 
-    def save_txt(self, txt_file, save_conf=False):
+    def save_txt(self, txt_file, save_conf=False, writer=None):
         """
         Save predictions into txt file.
 
         Args:
             txt_file (str): txt file path.
             save_conf (bool): save confidence score or not.
+            writer (ResultWriter, optional): Writer to hand the lines to instead of appending them to the file here.
         """
         is_obb = self.obb is not None
         boxes = self.obb if is_obb else self.boxes
@@ -346,31 +381,35 @@ class Results(SimpleClass):
             # Classify
             [texts.append(f"{probs.data[j]:.2f} {self.names[j]}") for j in probs.top5]
         elif boxes:
-            # Detect/segment/pose
-            for j, d in enumerate(boxes):
-                c, conf, id = int(d.cls), float(d.conf), None if d.id is None else int(d.id.item())
-                line = (c, *(d.xyxyxyxyn.view(-1) if is_obb else d.xywhn.view(-1)))
-                if masks:
-                    seg = masks[j].xyn[0].copy().reshape(-1)  # reversed mask.xyn, (n,2) to (n*2)
-                    line = (c, *seg)
-                if kpts is not None:
-                    kpt = torch.cat((kpts[j].xyn, kpts[j].conf[..., None]), 2) if kpts[j].has_visible else kpts[j].xyn
-                    line += (*kpt.reshape(-1).tolist(),)
-                line += (conf,) * save_conf + (() if id is None else (id,))
-                texts.append(("%g " * len(line)).rstrip() % line)
-
-        if texts:
+            # Detect/segment/pose, with every field converted for all boxes at once rather than per box
+            lines = (boxes.xyxyxyxyn.flatten(1) if is_obb else boxes.xywhn).tolist()
+            lines = [(c, *line) for c, line in zip(boxes.cls.int().tolist(), lines)]
+            if masks:
+                lines = [(c, *seg.reshape(-1)) for (c, *_), seg in zip(lines, masks.xyn)]  # (n,2) to (n*2)
+            if kpts is not None:
+                kpt = torch.cat((kpts.xyn, kpts.conf[..., None]), 2) if kpts.has_visible else kpts.xyn
+                lines = [line + tuple(k) for line, k in zip(lines, kpt.flatten(1).tolist())]
+            if save_conf:
+                lines = [line + (conf,) for line, conf in zip(lines, boxes.conf.tolist())]
+            if boxes.is_track:
+                lines = [line + (id,) for line, id in zip(lines, boxes.id.int().tolist())]
+            texts = [("%g " * len(line)).rstrip() % line for line in lines]
+
+        if texts and writer is not None:
+            writer.text(txt_file, texts)
+        elif texts:
             Path(txt_file).parent.mkdir(parents=True, exist_ok=True)  # make directory
             with open(txt_file, "a") as f:
                 f.writelines(text + "\n" for text in texts)
 
-    def save_crop(self, save_dir, file_name=Path("im.jpg")):
+    def save_crop(self, save_dir, file_name=Path("im.jpg"), writer=None):
         """
         Save cropped predictions to `save_dir/cls/file_name.jpg`.
 
         Args:
             save_dir (str | pathlib.Path): Save path.
             file_name (str | pathlib.Path): File name.
+            writer (ResultWriter, optional): Writer to hand the crops to instead of encoding them here.
         """
         if self.probs is not None:
             LOGGER.warning("WARNING ⚠️ Classify task do not support `save_crop`.")
@@ -378,13 +417,11 @@ class Results(SimpleClass):
         if self.obb is not None:
             LOGGER.warning("WARNING ⚠️ OBB task do not support `save_crop`.")
             return
-        for d in self.boxes:
-            save_one_box(
-                d.xyxy,
-                self.orig_img.copy(),
-                file=Path(save_dir) / self.names[int(d.cls)] / f"{Path(file_name)}.jpg",
-                BGR=True,
-            )
+        for d in self.boxes:  # crops are sliced from the shared original image, which is never modified
+            file = Path(save_dir) / self.names[int(d.cls)] / f"{Path(file_name)}.jpg"
+            crop = save_one_box(d.xyxy, self.orig_img, file=file, BGR=True, save=writer is None)
+            if writer is not None:
+                writer.crop(file, crop)
 
     def summary(self, normalize=False, decimals=5):
         """Convert the results to a summarized format."""
@@ -392,35 +429,29 @@ class Results(SimpleClass):
             LOGGER.warning("Warning: Classify results do not support the `summary()` method yet.")
             return
 
-        # Create list of detection dictionaries
-        results = []
-        data = self.boxes.data.cpu().tolist()
+        # Create list of detection dictionaries, rounding each field for all detections at once
+        data = self.boxes.data.cpu().double().numpy()  # xyxy, track_id if tracking, conf, class_id
         h, w = self.orig_shape if normalize else (1, 1)
-        for i, row in enumerate(data):  # xyxy, track_id if tracking, conf, class_id
-            box = {
-                "x1": round(row[0] / w, decimals),
-                "y1": round(row[1] / h, decimals),
-                "x2": round(row[2] / w, decimals),
-                "y2": round(row[3] / h, decimals),
-            }
-            conf = round(row[-2], decimals)
-            class_id = int(row[-1])
-            result = {"name": self.names[class_id], "class": class_id, "confidence": conf, "box": box}
-            if self.boxes.is_track:
-                result["track_id"] = int(row[-3])  # track ID
-            if self.masks:
+        boxes = (data[:, :4] / (w, h, w, h)).round(decimals).tolist()
+        classes = data[:, -1].astype(int).tolist()
+        results = [
+            {"name": self.names[c], "class": c, "confidence": conf, "box": dict(zip(("x1", "y1", "x2", "y2"), box))}
+            for c, conf, box in zip(classes, data[:, -2].round(decimals).tolist(), boxes)
+        ]
+        if self.boxes.is_track:
+            for result, track_id in zip(results, data[:, -3].astype(int).tolist()):
+                result["track_id"] = track_id
+        if self.masks:
+            for result, xy in zip(results, self.masks.xy):
                 result["segments"] = {
-                    "x": (self.masks.xy[i][:, 0] / w).round(decimals).tolist(),
-                    "y": (self.masks.xy[i][:, 1] / h).round(decimals).tolist(),
+                    "x": (xy[:, 0] / w).round(decimals).tolist(),
+                    "y": (xy[:, 1] / h).round(decimals).tolist(),
                 }
-            if self.keypoints is not None:
-                x, y, visible = self.keypoints[i].data[0].cpu().unbind(dim=1)  # torch Tensor
-                result["keypoints"] = {
-                    "x": (x / w).numpy().round(decimals).tolist(),  # decimals named argument required
-                    "y": (y / h).numpy().round(decimals).tolist(),
-                    "visible": visible.numpy().round(decimals).tolist(),
-                }
-            results.append(result)
+        if self.keypoints is not None:
+            x, y, visible = self.keypoints.data.cpu().unbind(dim=2)  # torch Tensors (n, k)
+            x, y, visible = ((v / g).numpy().round(decimals).tolist() for v, g in ((x, w), (y, h), (visible, 1)))
+            for result, *kpt in zip(results, x, y, visible):
+                result["keypoints"] = dict(zip(("x", "y", "visible"), kpt))
 
         return results
 
@@ -525,40 +556,187 @@ class Masks(BaseTensor):
     """
     A class for storing and manipulating detection masks.
 
+    Masks are stored either as a dense (n, h, w) tensor or as box-local tiles with their (x, y) offsets in the (h, w)
+    mask frame. Tiles come from ROI mask assembly (`roi_masks=True`) or, run-length encoded on CPU, from `compact()`.
+    Encoded tiles are decoded and tiles are pasted into dense masks only when `tiles` or `data` is accessed, and the
+    segments of tiled masks are traced per tile.
+
     Attributes:
         xy (list): A list of segments in pixel coordinates.
         xyn (list): A list of normalized segments.
+        tiles (list, optional): Box-local boolean masks, one per instance.
+        offsets (torch.Tensor | numpy.ndarray, optional): The (x, y) position of each tile in the mask frame.
+        rle (list, optional): Column-major run lengths of each tile, see `ops.masks2rle()`.
+        sizes (numpy.ndarray, optional): The (h, w) size of each run-length encoded tile.
 
     Methods:
         cpu(): Returns the masks tensor on CPU memory.
         numpy(): Returns the masks tensor as a numpy array.
         cuda(): Returns the masks tensor on GPU memory.
         to(device, dtype): Returns the masks tensor with the specified device and dtype.
+        compact(): Returns the masks run-length encoded on CPU, cropped to the region each mask covers.
     """
 
-    def __init__(self, masks, orig_shape) -> None:
-        """Initialize the Masks class with the given masks tensor and original image shape."""
-        if masks.ndim == 2:
-            masks = masks[None, :]
-        super().__init__(masks, orig_shape)
+    def __init__(self, masks, orig_shape, offsets=None, shape=None, sizes=None) -> None:
+        """
+        Initialize the Masks class with the given masks tensor and original image shape.
+
+        Args:
+            masks (torch.Tensor | numpy.ndarray | list): Dense masks of shape (n, h, w), a list of n tiles, or with
+                sizes, a list of n run-length encoded tiles.
+            orig_shape (tuple): Original shape of image.
+            offsets (torch.Tensor | numpy.ndarray, optional): The (n, 2) position of the tiles in the mask frame.
+            shape (tuple, optional): The (h, w) size of the mask frame the tiles are placed in.
+            sizes (numpy.ndarray, optional): The (n, 2) size of the run-length encoded tiles.
+        """
+        self.offsets, self.sizes, self._shape = offsets, sizes, shape
+        self.rle, self._tiles, self._data = None, None, None
+        if offsets is None:
+            if masks.ndim == 2:
+                masks = masks[None, :]
+            super().__init__(masks, orig_shape)
+            return
+        if sizes is None:
+            self._tiles = list(masks)
+        else:
+            self.rle = list(masks)
+        self.orig_shape = orig_shape
+
+    def __getstate__(self):
+        """Return the state for pickling, without the decoded tiles and masks of run-length encoded masks."""
+        state = self.__dict__.copy()
+        if self.rle is not None:
+            state["_tiles"] = state["_data"] = None
+        return state
+
+    @property
+    def tiles(self):
+        """Return the tiles of tiled masks, decoding run-length encoded tiles on first access."""
+        if self._tiles is None and self.rle is not None:
+            tiles = ops.rle2masks(self.rle, self.sizes)
+            self._tiles = tiles if isinstance(self.offsets, np.ndarray) else [torch.from_numpy(x) for x in tiles]
+        return self._tiles
+
+    @property
+    def data(self):
+        """Return the dense masks, pasting the tiles into full-frame masks on first access."""
+        if self._data is None:
+            h, w = self._shape
+            if isinstance(self.offsets, np.ndarray):
+                self._data = np.zeros((len(self), h, w), dtype=np.float32)
+            else:
+                self._data = torch.zeros((len(self), h, w), device=self.offsets.device)
+            for mask, tile, (x, y) in zip(self._data, self.tiles, self.offsets.tolist()):
+                mask[int(y) : int(y) + tile.shape[0], int(x) : int(x) + tile.shape[1]] = tile
+        return self._data
+
+    @data.setter
+    def data(self, data):
+        """Set the dense masks."""
+        self._data = data
+
+    @property
+    def shape(self):
+        """Return the shape of the masks, without pasting tiled masks."""
+        return self.data.shape if self.offsets is None else (len(self), *self._shape)
+
+    def compact(self):
+        """
+        Return the masks run-length encoded on CPU, cropped to the region each mask covers.
+
+        Encoded masks take a fraction of the memory of dense masks and pickle quickly, and are decoded again on access.
+
+        Returns:
+            (Masks): A new Masks object, or self if the masks are already encoded.
+        """
+        if self.rle is not None:
+            return self
+        dense = self.offsets is None
+        if dense:  # crop dense masks to the box around their pixels
+            masks = torch.as_tensor(self.data).to(torch.uint8).cpu().numpy()
+            boxes = ops.masks2boxes(masks)
+            tiles = [m[y1:y2, x1:x2] for m, (x1, y1, x2, y2) in zip(masks, boxes.tolist())]
+            offsets = boxes[:, :2]
+        else:  # crop tiles to the box around their pixels
+            tiles = [torch.as_tensor(x).cpu().numpy() for x in self.tiles]
+            boxes = np.concatenate([ops.masks2boxes(x[None]) for x in tiles]).reshape(-1, 4)
+            tiles = [m[y1:y2, x1:x2] for m, (x1, y1, x2, y2) in zip(tiles, boxes.tolist())]
+            offsets = np.asarray(self.offsets.tolist(), dtype=np.int64).reshape(-1, 2) + boxes[:, :2]
+        if not isinstance(self.data if dense else self.offsets, np.ndarray):
+            offsets = torch.from_numpy(offsets)
+        sizes = np.array([x.shape for x in tiles], dtype=np.int64).reshape(-1, 2)
+        return self.__class__(ops.masks2rle(tiles), self.orig_shape, offsets, self.shape[1:], sizes)
+
+    def _apply_tiles(self, fn):
+        """Return a copy of tiled masks with fn applied to the tiles and offsets."""
+        return self.__class__([fn(x) for x in self.tiles], self.orig_shape, fn(self.offsets), self._shape)
+
+    def cpu(self):
+        """Return a copy of the masks on CPU memory."""
+        if self.offsets is None:
+            return super().cpu()
+        if self.rle is not None or isinstance(self.offsets, np.ndarray):
+            return self
+        return self._apply_tiles(lambda x: x.cpu())
+
+    def numpy(self):
+        """Return a copy of the masks as numpy arrays."""
+        if self.offsets is None:
+            return super().numpy()
+        if isinstance(self.offsets, np.ndarray):
+            return self
+        if self.rle is not None:
+            return self.__class__(self.rle, self.orig_shape, self.offsets.numpy(), self._shape, self.sizes)
+        return self._apply_tiles(lambda x: x.numpy())
+
+    def cuda(self):
+        """Return a copy of the masks on GPU memory."""
+        return super().cuda() if self.offsets is None else self._apply_tiles(lambda x: torch.as_tensor(x).cuda())
+
+    def to(self, *args, **kwargs):
+        """Return a copy of the masks with the specified device and dtype, offsets keep their dtype."""
+        if self.offsets is None:
+            return super().to(*args, **kwargs)
+        masks = self._apply_tiles(lambda x: torch.as_tensor(x).to(*args, **kwargs))
+        masks.offsets = masks.offsets.to(torch.as_tensor(self.offsets).dtype)
+        return masks
+
+    def __len__(self):
+        """Return the number of masks."""
+        if self.offsets is None:
+            return len(self.data)
+        return len(self.rle if self.rle is not None else self._tiles)
+
+    def __getitem__(self, idx):
+        """Return a Masks object with the specified index of the masks."""
+        if self.offsets is None:
+            return super().__getitem__(idx)
+        if isinstance(idx, torch.Tensor):
+            idx = idx.cpu().numpy()
+        idx = np.atleast_1d(np.arange(len(self))[idx]).tolist()
+        if self.rle is not None:
+            rle = [self.rle[i] for i in idx]
+            return self.__class__(rle, self.orig_shape, self.offsets[idx], self._shape, self.sizes[idx])
+        return self.__class__([self._tiles[i] for i in idx], self.orig_shape, self.offsets[idx], self._shape)
+
+    def _segments(self):
+        """Return the mask contours in mask frame coordinates, traced tile by tile for tiled masks."""
+        if self.offsets is None:
+            return ops.masks2segments(torch.as_tensor(self.data))
+        offsets = np.asarray(self.offsets.tolist(), dtype=np.float32).reshape(-1, 2)
+        return [ops.masks2segments(torch.as_tensor(x)[None])[0] + o for x, o in zip(self.tiles, offsets)]
 
     @property
     @lru_cache(maxsize=1)
     def xyn(self):
         """Return normalized segments."""
-        return [
-            ops.scale_coords(self.data.shape[1:], x, self.orig_shape, normalize=True)
-            for x in ops.masks2segments(self.data)
-        ]
+        return [ops.scale_coords(self.shape[1:], x, self.orig_shape, normalize=True) for x in self._segments()]
 
     @property
     @lru_cache(maxsize=1)
     def xy(self):
         """Return segments in pixel coordinates."""
-        return [
-            ops.scale_coords(self.data.shape[1:], x, self.orig_shape, normalize=False)
-            for x in ops.masks2segments(self.data)
-        ]
+        return [ops.scale_coords(self.shape[1:], x, self.orig_shape, normalize=False) for x in self._segments()]
 
 
 class Keypoints(BaseTensor):
@@ -742,3 +920,131 @@ class OBB(BaseTensor):
         y2 = self.xyxyxyxy[..., 1].max(1).values
         xyxy = [x1, y1, x2, y2]
         return np.stack(xyxy, axis=-1) if isinstance(self.data, np.ndarray) else torch.stack(xyxy, dim=-1)
+
+
+def results_to_columns(results, normalize=False):
+    """
+    Convert a list of Results into flat per-detection columns in one vectorized pass.
+
+    The boxes of all results are concatenated and moved to the CPU once, so no Python code runs per detection. Every
+    column is a 1D numpy array with one row per detection: 'image' (index into `results`), 'name', 'cls', 'conf', the
+    box as 'x1', 'y1', 'x2', 'y2' ('x', 'y', 'w', 'h', 'r' for OBB results), 'track_id' if any result is tracked (-1
+    for untracked rows) and 'kpt{i}_x', 'kpt{i}_y', 'kpt{i}_conf' per keypoint for pose results. Classification
+    results have no detections and add no rows.
+
+    Args:
+        results (List[Results]): Results of a prediction run.
+        normalize (bool): Normalize box and keypoint coordinates by the width and height of their image.
+
+    Returns:
+        (dict): Column names mapped to numpy arrays of equal length.
+
+    Example:
+        ```python
+        from ultralytics import YOLO
+        from ultralytics.engine.results import results_to_columns, save_columns
+
+        columns = results_to_columns(YOLO('yolov8n.pt')('path/to/images/'))
+        save_columns(columns, 'predictions.ndjson')
+        ```
+    """
+    is_obb = any(r.obb is not None for r in results)
+    boxes = [r.obb if is_obb else r.boxes for r in results]
+    index = [i for i, b in enumerate(boxes) if b is not None and len(b)]
+    is_track = any(boxes[i].is_track for i in index)
+    is_pose = bool(index) and all(results[i].keypoints is not None for i in index)
+    data, kpts = [], []
+    for i in index:
+        d = torch.as_tensor(boxes[i].data).float()
+        if is_track and not boxes[i].is_track:
+            d = torch.cat((d[:, :-2], torch.full_like(d[:, :1], -1), d[:, -2:]), 1)  # untracked rows get id -1
+        data.append(d)
+        if is_pose:
+            kpts.append(torch.as_tensor(results[i].keypoints.data).float())
+
+    n = 5 if is_obb else 4
+    data = torch.cat(data).cpu().numpy() if data else np.zeros((0, n + 2 + is_track), dtype=np.float32)
+    counts = [len(boxes[i]) for i in index]
+    image = np.repeat(np.array(index, dtype=np.int64), counts)
+    coords = data[:, :n].copy()
+    kpts = torch.cat(kpts).cpu().numpy() if is_pose else None
+    if normalize:
+        hw = np.array([results[i].orig_shape for i in index], dtype=np.float32).reshape(-1, 2).repeat(counts, 0)
+        coords[:, :4] /= hw[:, [1, 0, 1, 0]]
+        if is_pose:
+            kpts[..., :2] /= hw[:, None, ::-1]
+
+    cls = data[:, -1].astype(np.int64)
+    names = results[0].names if results else {}
+    lut = np.array([str(names.get(i, i)) for i in range(max(names, default=-1) + 1)], dtype=str)
+    columns = {"image": image, "name": lut[cls] if len(cls) else np.array([], dtype=str), "cls": cls}
+    columns["conf"] = np.ascontiguousarray(data[:, -2])
+    keys = ("x", "y", "w", "h", "r") if is_obb else ("x1", "y1", "x2", "y2")
+    columns.update(zip(keys, np.ascontiguousarray(coords.T)))
+    if is_track:
+        columns["track_id"] = data[:, -3].astype(np.int64)
+    if is_pose:
+        for j, kpt in enumerate(np.ascontiguousarray(kpts.transpose(1, 2, 0))):  # (k, 2 or 3, n)
+            columns.update(zip((f"kpt{j}_x", f"kpt{j}_y", f"kpt{j}_conf"), kpt))
+    return columns
+
+
+def save_columns(columns, file, decimals=5, chunk=100_000):
+    """
+    Write columns from `results_to_columns()` to an NDJSON, CSV or Parquet file, picked by the file suffix.
+
+    NDJSON and CSV rows are formatted with a single %-format call per chunk of rows instead of one per detection, with
+    floats in fixed-point notation. Parquet is written with pyarrow, if it is installed.
+
+    Args:
+        columns (dict): Column names mapped to numpy arrays of equal length.
+        file (str | Path): Output file, one of '*.ndjson', '*.jsonl', '*.csv' or '*.parquet'.
+        decimals (int): Decimal places of float values in NDJSON and CSV files.
+        chunk (int): Rows formatted per write in NDJSON and CSV files.
+
+    Returns:
+        (Path): The written file.
+    """
+    import json
+
+    file = Path(file)
+    suffix = file.suffix.lower()
+    if suffix not in {".ndjson", ".jsonl", ".csv", ".parquet"}:
+        raise ValueError(f"Unsupported file '{file}', valid suffixes are .ndjson, .jsonl, .csv and .parquet.")
+    file.parent.mkdir(parents=True, exist_ok=True)
+    if suffix == ".parquet":
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ModuleNotFoundError(
+                f"Writing '{file}' requires pyarrow, install it with 'pip install pyarrow' or use .ndjson or .csv."
+            ) from e
+
+        pq.write_table(pa.table({k: v.tolist() if v.dtype.kind == "U" else v for k, v in columns.items()}), file)
+        return file
+
+    # Quote strings for the output format once per unique value, then convert chunks of rows to Python objects
+    arrays, specs = [], []
+    for v in columns.values():
+        if v.dtype.kind == "U":
+            unique, inverse = np.unique(v, return_inverse=True)
+            if suffix == ".csv":
+                quoted = ['"' + s.replace('"', '""') + '"' if any(c in s for c in ',"\n') else s for s in unique]
+            else:
+                quoted = [json.dumps(s) for s in unique]
+            v = np.array(quoted, dtype=object)[inverse.reshape(-1)]
+        arrays.append(v)
+        specs.append(f"%.{decimals}f" if v.dtype.kind == "f" else "%d" if v.dtype.kind in "iub" else "%s")
+    if suffix == ".csv":
+        header, row = ",".join(columns) + "\n", ",".join(specs) + "\n"
+    else:
+        header, row = "", "{" + ",".join(f"{json.dumps(k)}:{x}" for k, x in zip(columns, specs)) + "}\n"
+
+    n = len(arrays[0]) if arrays else 0
+    with open(file, "w") as f:
+        f.write(header)
+        for i in range(0, n, chunk):
+            values = zip(*(v[i : i + chunk].tolist() for v in arrays))
+            f.write((row * min(chunk, n - i)) % tuple(chain.from_iterable(values)))
+    return file
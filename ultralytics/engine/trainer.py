@@ -141,6 +141,8 @@ class BaseTrainer:
         self.loss_names = ["Loss"]
         self.csv = self.save_dir / "results.csv"
         self.plot_idx = [0, 1, 2]
+        self.transform_profile = {}  # {transform: [calls, seconds, bytes]} of this epoch, if args.profile_transforms
+        self.batch_augment = None  # augmentations of collated batches on the training device, if args.batch_augment
 
         # Callbacks
         self.callbacks = _callbacks or callbacks.get_default_callbacks()
@@ -274,6 +276,9 @@ class BaseTrainer:
         # Dataloaders
         batch_size = self.batch_size // max(world_size, 1)
         self.train_loader = self.get_dataloader(self.trainset, batch_size=batch_size, rank=RANK, mode="train")
+        if self.args.prefetch and hasattr(self.train_loader, "prefetch"):
+            self.train_loader.prefetch(self.device)
+        self.batch_augment = self.build_batch_augment()
         if RANK in {-1, 0}:
             # Note: When training DOTA dataset, double batch size could get OOM on images with >2000 objects.
             self.test_loader = self.get_dataloader(
@@ -351,6 +356,8 @@ class BaseTrainer:
             self.optimizer.zero_grad()
             for i, batch in pbar:
                 self.run_callbacks("on_train_batch_start")
+                if "transform_profile" in batch:
+                    self.update_transform_profile(batch.pop("transform_profile"))
                 # Warmup
                 ni = i + nb * epoch
                 if ni <= nw:
@@ -367,6 +374,8 @@ class BaseTrainer:
                 # Forward
                 with torch.cuda.amp.autocast(self.amp):
                     batch = self.preprocess_batch(batch)
+                    if self.batch_augment is not None:
+                        batch = self.batch_augment(batch)
                     self.loss, self.loss_items = self.model(batch)
                     if RANK != -1:
                         self.loss *= world_size
@@ -410,6 +419,10 @@ class BaseTrainer:
             self.lr = {f"lr/pg{ir}": x["lr"] for ir, x in enumerate(self.optimizer.param_groups)}  # for loggers
             self.run_callbacks("on_train_epoch_end")
             if RANK in {-1, 0}:
+                if self.transform_profile:
+                    self.log_transform_profile()
+                if (self.args.prefetch or self.args.profile_transforms) and getattr(self.train_loader, "steps", 0):
+                    self.log_data_wait()
                 final_epoch = epoch + 1 >= self.epochs
                 self.ema.update_attr(self.model, include=["yaml", "nc", "args", "names", "stride", "class_weights"])
 
@@ -547,6 +560,10 @@ class BaseTrainer:
         """Allows custom preprocessing model inputs and ground truths depending on task type."""
         return batch
 
+    def build_batch_augment(self):
+        """Returns a callable that augments preprocessed training batches, or None to augment per image only."""
+        return None
+
     def validate(self):
         """
         Runs validation on test set using self.validator.
@@ -596,6 +613,38 @@ class BaseTrainer:
         """Returns a string describing training progress."""
         return ""
 
+    def update_transform_profile(self, profiles):
+        """Accumulates the per-sample {transform: (seconds, bytes)} records of a batch from the dataloader workers."""
+        for profile in profiles:
+            for k, (dt, nbytes) in profile.items():
+                x = self.transform_profile.setdefault(k, [0, 0.0, 0])
+                x[0] += 1
+                x[1] += dt
+                x[2] += nbytes
+
+    def log_transform_profile(self):
+        """Logs the mean time and output image size of every dataloader transform in this epoch and resets them."""
+        total = sum(x[1] for x in self.transform_profile.values())
+        s = ("%22s" + "%11s" * 4) % ("Transform", "Calls", "ms/img", "Time %", "Output KB")
+        for k, (n, dt, nbytes) in self.transform_profile.items():
+            s += ("\n%22s%11i" + "%11.3g" * 3) % (k, n, dt / n * 1e3, dt / max(total, 1e-9) * 100, nbytes / n / 1024)
+        n = max(x[0] for x in self.transform_profile.values())
+        LOGGER.info(
+            f"Transform profile of {n} images over {self.train_loader.num_workers or 1} dataloader workers, "
+            f"{total / n * 1e3:.3g} ms/img in total\n{s}"
+        )
+        self.transform_profile = {}
+
+    def log_data_wait(self):
+        """Logs how long the training loop of the last epoch waited for the dataloader per step."""
+        loader = self.train_loader
+        dt = time.perf_counter() - loader.t_start
+        LOGGER.info(
+            f"{colorstr('dataloader:')} waited {loader.wait / loader.steps * 1e3:.1f} ms/step for data, "
+            f"{loader.wait / dt:.1%} of {dt:.1f}s in {loader.steps} steps"
+            f"{', prefetching' if getattr(loader, 'device', None) is not None else ''}"
+        )
+
     # TODO: may need to put these following functions into callback
     def plot_training_samples(self, batch, ni):
         """Plots training samples during YOLO training."""
@@ -229,14 +229,14 @@ class BaseValidator:
         Returns:
             (torch.Tensor): Correct tensor of shape(N,10) for 10 IoU thresholds.
         """
-        # Dx10 matrix, where D - detections, 10 - IoU thresholds
-        correct = np.zeros((pred_classes.shape[0], self.iouv.shape[0])).astype(bool)
         # LxD matrix where L - labels (rows), D - detections (columns)
         correct_class = true_classes[:, None] == pred_classes
         iou = iou * correct_class  # zero out the wrong classes
-        iou = iou.cpu().numpy()
-        for i, threshold in enumerate(self.iouv.cpu().tolist()):
-            if use_scipy:
+        if use_scipy:
+            # Dx10 matrix, where D - detections, 10 - IoU thresholds
+            correct = np.zeros((pred_classes.shape[0], self.iouv.shape[0])).astype(bool)
+            iou = iou.cpu().numpy()
+            for i, threshold in enumerate(self.iouv.cpu().tolist()):
                 # WARNING: known issue that reduces mAP in https://github.com/ultralytics/ultralytics/pull/4708
                 import scipy  # scope import to avoid importing for all commands
 
@@ -246,17 +246,19 @@ class BaseValidator:
                     valid = cost_matrix[labels_idx, detections_idx] > 0
                     if valid.any():
                         correct[detections_idx[valid], i] = True
-            else:
-                matches = np.nonzero(iou >= threshold)  # IoU > threshold and classes match
-                matches = np.array(matches).T
-                if matches.shape[0]:
-                    if matches.shape[0] > 1:
-                        matches = matches[iou[matches[:, 0], matches[:, 1]].argsort()[::-1]]
-                        matches = matches[np.unique(matches[:, 1], return_index=True)[1]]
-                        # matches = matches[matches[:, 2].argsort()[::-1]]
-                        matches = matches[np.unique(matches[:, 0], return_index=True)[1]]
-                    correct[matches[:, 1].astype(int), i] = True
-        return torch.tensor(correct, dtype=torch.bool, device=pred_classes.device)
+            return torch.tensor(correct, dtype=torch.bool, device=pred_classes.device)
+
+        # Every detection is matched to its highest IoU label, then each label keeps its lowest index detection. Both
+        # choices are threshold independent, so all thresholds are resolved together with a single scatter
+        if not iou.numel():
+            return torch.zeros(pred_classes.shape[0], self.iouv.shape[0], dtype=torch.bool, device=pred_classes.device)
+        best_iou, best_label = iou.max(0)  # (D, )
+        valid = best_iou[:, None] >= self.iouv.to(iou.device)  # (D, 10) IoU > threshold and classes match
+        n, index = valid.shape[0], best_label[:, None].expand_as(valid)
+        det = torch.arange(n, device=iou.device)[:, None].expand_as(valid)
+        first = iou.new_full((iou.shape[0], valid.shape[1]), n, dtype=torch.long)  # first valid detection per label
+        first.scatter_reduce_(0, index, det.masked_fill(~valid, n), "amin")
+        return (first.gather(0, index) == det).to(pred_classes.device)
 
     def add_callback(self, event: str, callback):
         """Appends the given callback."""
@@ -10,7 +10,7 @@ from ultralytics.data import build_dataloader, build_yolo_dataset, converter
 from ultralytics.engine.validator import BaseValidator
 from ultralytics.utils import LOGGER, ops
 from ultralytics.utils.checks import check_requirements
-from ultralytics.utils.metrics import ConfusionMatrix, DetMetrics, box_iou
+from ultralytics.utils.metrics import APHistogram, ConfusionMatrix, DetMetrics, box_iou
 from ultralytics.utils.plotting import output_to_target, plot_images
 
 
@@ -77,7 +77,26 @@ class DetectionValidator(BaseValidator):
         self.confusion_matrix = ConfusionMatrix(nc=self.nc, conf=self.args.conf)
         self.seen = 0
         self.jdict = []
-        self.stats = dict(tp=[], conf=[], pred_cls=[], target_cls=[])
+        self.stats = self.init_stats("tp")
+
+    def init_stats(self, *keys):
+        """
+        Returns empty validation statistics for the given true positive keys.
+
+        These are lists of per-image tensors of the true positives, confidences, predicted and target classes, or with
+        `ap_bins` set, one streaming APHistogram per true positive key with memory independent of the dataset size.
+        """
+        if self.args.ap_bins:
+            return {k: APHistogram(self.nc, self.niou, self.args.ap_bins, self.device) for k in keys}
+        return {k: [] for k in (*keys, "conf", "pred_cls", "target_cls")}
+
+    def update_stats(self, stat):
+        """Adds the statistics of one image to the per-image lists or the streaming AP histograms."""
+        for k, v in self.stats.items():
+            if isinstance(v, APHistogram):
+                v.update(stat[k], stat["conf"], stat["pred_cls"], stat["target_cls"])
+            else:
+                v.append(stat[k])
 
     def get_desc(self):
         """Return a formatted string summarizing class metrics of YOLO model."""
@@ -93,6 +112,7 @@ class DetectionValidator(BaseValidator):
             multi_label=True,
             agnostic=self.args.single_cls,
             max_det=self.args.max_det,
+            batched=self.args.batch_nms,
         )
 
     def _prepare_batch(self, si, batch):
@@ -132,8 +152,7 @@ class DetectionValidator(BaseValidator):
             stat["target_cls"] = cls
             if npr == 0:
                 if nl:
-                    for k in self.stats.keys():
-                        self.stats[k].append(stat[k])
+                    self.update_stats(stat)
                     if self.args.plots:
                         self.confusion_matrix.process_batch(detections=None, gt_bboxes=bbox, gt_cls=cls)
                 continue
@@ -150,8 +169,7 @@ class DetectionValidator(BaseValidator):
                 stat["tp"] = self._process_batch(predn, bbox, cls)
                 if self.args.plots:
                     self.confusion_matrix.process_batch(predn, bbox, cls)
-            for k in self.stats.keys():
-                self.stats[k].append(stat[k])
+            self.update_stats(stat)
 
             # Save
             if self.args.save_json:
@@ -167,12 +185,16 @@ class DetectionValidator(BaseValidator):
 
     def get_stats(self):
         """Returns metrics statistics and results dictionary."""
-        stats = {k: torch.cat(v, 0).cpu().numpy() for k, v in self.stats.items()}  # to numpy
+        if self.args.ap_bins:
+            stats = dict(self.stats, conf=None, pred_cls=None, target_cls=None)  # histograms replace the arrays
+            self.nt_per_class = stats["tp"].nt.cpu().numpy()  # number of targets per class
+        else:
+            stats = {k: torch.cat(v, 0).cpu().numpy() for k, v in self.stats.items()}  # to numpy
+            self.nt_per_class = np.bincount(
+                stats["target_cls"].astype(int), minlength=self.nc
+            )  # number of targets per class
         if len(stats) and stats["tp"].any():
             self.metrics.process(**stats)
-        self.nt_per_class = np.bincount(
-            stats["target_cls"].astype(int), minlength=self.nc
-        )  # number of targets per class
         return self.metrics.results_dict
 
     def print_results(self):
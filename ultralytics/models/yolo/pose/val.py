@@ -72,6 +72,7 @@ class PoseValidator(DetectionValidator):
             agnostic=self.args.single_cls,
             max_det=self.args.max_det,
             nc=self.nc,
+            batched=self.args.batch_nms,
         )
 
     def init_metrics(self, model):
@@ -81,7 +82,7 @@ class PoseValidator(DetectionValidator):
         is_pose = self.kpt_shape == [17, 3]
         nkpt = self.kpt_shape[0]
         self.sigma = OKS_SIGMA if is_pose else np.ones(nkpt) / nkpt
-        self.stats = dict(tp_p=[], tp=[], conf=[], pred_cls=[], target_cls=[])
+        self.stats = self.init_stats("tp_p", "tp")
 
     def _prepare_batch(self, si, batch):
         """Prepares a batch for processing by converting keypoints to float and moving to device."""
@@ -120,8 +121,7 @@ class PoseValidator(DetectionValidator):
             stat["target_cls"] = cls
             if npr == 0:
                 if nl:
-                    for k in self.stats.keys():
-                        self.stats[k].append(stat[k])
+                    self.update_stats(stat)
                     if self.args.plots:
                         self.confusion_matrix.process_batch(detections=None, gt_bboxes=bbox, gt_cls=cls)
                 continue
@@ -140,8 +140,7 @@ class PoseValidator(DetectionValidator):
                 if self.args.plots:
                     self.confusion_matrix.process_batch(predn, bbox, cls)
 
-            for k in self.stats.keys():
-                self.stats[k].append(stat[k])
+            self.update_stats(stat)
 
             # Save
             if self.args.save_json:
@@ -1,6 +1,6 @@
 # Ultralytics YOLO 🚀, AGPL-3.0 license
 
-from ultralytics.engine.results import Results
+from ultralytics.engine.results import Masks, Results
 from ultralytics.models.yolo.detect.predict import DetectionPredictor
 from ultralytics.utils import DEFAULT_CFG, ops
 
@@ -35,6 +35,7 @@ class SegmentationPredictor(DetectionPredictor):
             max_det=self.args.max_det,
             nc=len(self.model.names),
             classes=self.args.classes,
+            batched=self.args.batch_nms,
         )
 
         if not isinstance(orig_imgs, list):  # input images are a torch.Tensor, not a list
@@ -47,6 +48,15 @@ class SegmentationPredictor(DetectionPredictor):
             img_path = self.batch[0][i]
             if not len(pred):  # save empty boxes
                 masks = None
+            elif self.args.roi_masks:  # box-local mask tiles, full-frame masks are built on access
+                native = self.args.retina_masks
+                if native:
+                    pred[:, :4] = ops.scale_boxes(img.shape[2:], pred[:, :4], orig_img.shape)
+                shape = orig_img.shape[:2] if native else img.shape[2:]
+                tiles, offsets = ops.process_mask_roi(proto[i], pred[:, 6:], pred[:, :4], shape, native=native)
+                masks = Masks(tiles, orig_img.shape[:2], offsets=offsets, shape=shape)
+                if not native:
+                    pred[:, :4] = ops.scale_boxes(img.shape[2:], pred[:, :4], orig_img.shape)
             elif self.args.retina_masks:
                 pred[:, :4] = ops.scale_boxes(img.shape[2:], pred[:, :4], orig_img.shape)
                 masks = ops.process_mask_native(proto[i], pred[:, 6:], pred[:, :4], orig_img.shape[:2])  # HWC
@@ -54,4 +64,6 @@ class SegmentationPredictor(DetectionPredictor):
                 masks = ops.process_mask(proto[i], pred[:, 6:], pred[:, :4], img.shape[2:], upsample=True)  # HWC
                 pred[:, :4] = ops.scale_boxes(img.shape[2:], pred[:, :4], orig_img.shape)
             results.append(Results(orig_img, path=img_path, names=self.model.names, boxes=pred[:, :6], masks=masks))
+            if self.args.compact_masks and masks is not None:
+                results[-1].masks = results[-1].masks.compact()
         return results
@@ -51,7 +51,7 @@ class SegmentationValidator(DetectionValidator):
             self.process = ops.process_mask_upsample  # more accurate
         else:
             self.process = ops.process_mask  # faster
-        self.stats = dict(tp_m=[], tp=[], conf=[], pred_cls=[], target_cls=[])
+        self.stats = self.init_stats("tp_m", "tp")
 
     def get_desc(self):
         """Return a formatted description of evaluation metrics."""
@@ -80,6 +80,7 @@ class SegmentationValidator(DetectionValidator):
             agnostic=self.args.single_cls,
             max_det=self.args.max_det,
             nc=self.nc,
+            batched=self.args.batch_nms,
         )
         proto = preds[1][-1] if len(preds[1]) == 3 else preds[1]  # second output is len 3 if pt, but only 1 if exported
         return p, proto
@@ -114,8 +115,7 @@ class SegmentationValidator(DetectionValidator):
             stat["target_cls"] = cls
             if npr == 0:
                 if nl:
-                    for k in self.stats.keys():
-                        self.stats[k].append(stat[k])
+                    self.update_stats(stat)
                     if self.args.plots:
                         self.confusion_matrix.process_batch(detections=None, gt_bboxes=bbox, gt_cls=cls)
                 continue
@@ -138,8 +138,7 @@ class SegmentationValidator(DetectionValidator):
                 if self.args.plots:
                     self.confusion_matrix.process_batch(predn, bbox, cls)
 
-            for k in self.stats.keys():
-                self.stats[k].append(stat[k])
+            self.update_stats(stat)
 
             pred_masks = torch.as_tensor(pred_masks, dtype=torch.uint8)
             if self.args.plots and self.batch_i < 3:
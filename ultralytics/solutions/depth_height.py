@@ -0,0 +1,271 @@
+# Ultralytics YOLO 🚀, AGPL-3.0 license
+
+import numpy as np
+
+
+def roi_points_from_depth(depth_m, intr, x1, y1, x2, y2, step=4):
+    """
+    Back-projects a strided pixel grid of a depth image region into 3D camera coordinates.
+
+    Args:
+        depth_m (np.ndarray): Depth image in meters of shape (h, w).
+        intr (pyrealsense2.intrinsics): Camera intrinsics with fx, fy, ppx and ppy attributes.
+        x1, y1, x2, y2 (int): Region in pixels.
+        step (int): Sampling stride in pixels.
+
+    Returns:
+        (np.ndarray | None): Points of shape (n, 3) with valid depth, or None if there are none.
+    """
+    h, w = depth_m.shape[:2]
+    x1, y1, x2, y2 = max(0, x1), max(0, y1), min(w - 1, x2), min(h - 1, y2)
+    if x2 <= x1 or y2 <= y1:
+        return None
+    gx, gy = np.meshgrid(np.arange(x1, x2, step, dtype=np.int32), np.arange(y1, y2, step, dtype=np.int32))
+    z = depth_m[gy, gx].astype(np.float32)
+    mask = np.isfinite(z) & (z > 0.05) & (z < 10.0)
+    if not mask.any():
+        return None
+    u, v, z = gx[mask].astype(np.float32), gy[mask].astype(np.float32), z[mask]
+    return np.stack(((u - intr.ppx) / intr.fx * z, (v - intr.ppy) / intr.fy * z, z), 1)
+
+
+def _fit_plane_lstsq(points):
+    """Least-squares plane (n, d) through points via SVD, with the normal oriented towards the camera (n_z < 0)."""
+    cen = points.mean(0)
+    n = np.linalg.svd(points - cen, full_matrices=False)[2][-1]
+    n /= np.linalg.norm(n)
+    d = -float(n @ cen)
+    return (-n, -d) if n[2] > 0 else (n, d)
+
+
+def fit_plane_ransac(points, iters=300, dist_thresh=0.004, min_inliers=100, seed=123, chunk=64):
+    """
+    Fits a plane to 3D points with RANSAC, evaluating all hypotheses as batched matrix products.
+
+    All 3-point samples are drawn up front and scored in chunks of `chunk` hypotheses with a single (n, chunk) distance
+    matrix each, instead of one Python iteration per hypothesis. The best hypothesis is refined by least squares on its
+    inliers.
+
+    Args:
+        points (np.ndarray): Points of shape (n, 3).
+        iters (int): Number of RANSAC hypotheses.
+        dist_thresh (float): Inlier distance threshold in meters.
+        min_inliers (int): Minimum number of points and inliers for a valid plane.
+        seed (int): Random seed of the hypothesis sampler.
+        chunk (int): Number of hypotheses scored per matrix product, bounds memory to n * chunk floats.
+
+    Returns:
+        (tuple | None): Plane (n, d) with unit normal n of shape (3,) and offset d, so that n @ p + d is the signed
+            distance of point p, or None if no plane was found.
+    """
+    if points is None or len(points) < min_inliers:
+        return None
+    points = np.asarray(points, dtype=np.float32)
+    rng = np.random.default_rng(seed)
+    p0, p1, p2 = points[rng.integers(0, len(points), (3, iters))]  # (iters, 3) each
+    n = np.cross(p1 - p0, p2 - p0)
+    norm = np.linalg.norm(n, axis=1)
+    valid = norm > 1e-6  # skip degenerate (collinear or repeated) samples
+    n, p0 = n[valid] / norm[valid, None], p0[valid]
+    if not len(n):
+        return None
+    d = -(n * p0).sum(1)
+
+    counts = np.concatenate(
+        [(np.abs(points @ n[i : i + chunk].T + d[i : i + chunk]) < dist_thresh).sum(0) for i in range(0, len(n), chunk)]
+    )
+    best = counts.argmax()
+    if counts[best] < min_inliers:
+        return None
+    inliers = np.abs(points @ n[best] + d[best]) < dist_thresh
+    n, d = _fit_plane_lstsq(points[inliers])
+    return n.astype(np.float32), d
+
+
+class GroundPlane:
+    """
+    A class to track the ground plane of a depth camera across frames.
+
+    The plane is initialized from the mean normal and median offset of RANSAC fits over the first `warmup` frames, and
+    afterwards refined incrementally: each frame the ground points within `dist_thresh` of the current plane are refit
+    by least squares and blended into the estimate, which is much cheaper than a new RANSAC fit. A full RANSAC refit is
+    only triggered when the inlier ratio drops below `min_inlier_ratio`, i.e. when the camera moved.
+
+    Attributes:
+        plane (tuple | None): Current plane (n, d), None until initialized.
+        refits (int): Number of RANSAC refits after initialization.
+
+    Example:
+        ```python
+        from ultralytics.solutions.depth_height import GroundPlane, box_heights
+
+        ground = GroundPlane()
+        for color, depth_m, intr in frames:
+            plane = ground.update(depth_m, intr)
+            if plane is not None:
+                heights = box_heights(depth_m, intr, boxes, plane)
+        ```
+    """
+
+    def __init__(self, warmup=10, roi=0.85, step=4, iters=300, dist_thresh=0.004, momentum=0.9, min_inlier_ratio=0.3):
+        """
+        Initializes the GroundPlane estimator.
+
+        Args:
+            warmup (int): Number of frames with a valid RANSAC fit used to initialize the plane.
+            roi (float): Top of the image region holding ground pixels, as a fraction of the image height.
+            step (int): Sampling stride of ground pixels.
+            iters (int): Number of RANSAC hypotheses per fit.
+            dist_thresh (float): Inlier distance threshold in meters.
+            momentum (float): Weight of the previous estimate when blending in a refined plane.
+            min_inlier_ratio (float): Inlier ratio below which the plane is refit with RANSAC.
+        """
+        self.warmup = warmup
+        self.roi = roi
+        self.step = step
+        self.iters = iters
+        self.dist_thresh = dist_thresh
+        self.momentum = momentum
+        self.min_inlier_ratio = min_inlier_ratio
+        self.plane = None
+        self.refits = 0
+        self._fits = []  # RANSAC fits collected during warmup
+
+    def _ground_points(self, depth_m, intr):
+        """Returns the 3D points of the ground region of a depth image."""
+        h, w = depth_m.shape[:2]
+        return roi_points_from_depth(depth_m, intr, 0, int(h * self.roi), w, h, step=self.step)
+
+    def update(self, depth_m, intr):
+        """
+        Updates the plane estimate with a new depth frame.
+
+        Args:
+            depth_m (np.ndarray): Depth image in meters of shape (h, w).
+            intr (pyrealsense2.intrinsics): Camera intrinsics with fx, fy, ppx and ppy attributes.
+
+        Returns:
+            (tuple | None): Current plane (n, d), or None while still warming up.
+        """
+        points = self._ground_points(depth_m, intr)
+        if points is None:
+            return self.plane
+
+        if self.plane is None:  # warmup, average independent RANSAC fits
+            fit = fit_plane_ransac(points, self.iters, self.dist_thresh)
+            if fit is not None:
+                self._fits.append(fit)
+            if len(self._fits) >= self.warmup:
+                ns = np.stack([f[0] for f in self._fits])
+                n = (ns / np.linalg.norm(ns, axis=1, keepdims=True)).mean(0)
+                n, d = (n / np.linalg.norm(n)).astype(np.float32), float(np.median([f[1] for f in self._fits]))
+                self.plane = (-n, -d) if d < 0 else (n, d)
+                self._fits = []
+            return self.plane
+
+        n, d = self.plane
+        inliers = np.abs(points @ n + d) < self.dist_thresh
+        if inliers.mean() < self.min_inlier_ratio:  # camera moved, refit from scratch
+            fit = fit_plane_ransac(points, self.iters, self.dist_thresh)
+            if fit is not None:
+                self.plane, self.refits = fit if fit[1] >= 0 else (-fit[0], -fit[1]), self.refits + 1
+            return self.plane
+        if inliers.sum() >= 3:
+            n_new, d_new = _fit_plane_lstsq(points[inliers])
+            if n_new @ n < 0:  # keep orientation consistent with the current estimate
+                n_new, d_new = -n_new, -d_new
+            m = self.momentum
+            n_blend = m * n + (1 - m) * n_new
+            norm = np.linalg.norm(n_blend)
+            self.plane = ((n_blend / norm).astype(np.float32), float((m * d + (1 - m) * d_new) / norm))
+        return self.plane
+
+    def reset(self):
+        """Discards the current plane estimate."""
+        self.plane, self.refits, self._fits = None, 0, []
+
+
+def _box_points(depth_m, intr, boxes, step):
+    """
+    Gathers the strided depth samples of all boxes in one indexing operation.
+
+    Returns:
+        (tuple): Box index of shape (n, ), 3D points of shape (n, 3) and the number of valid points per box.
+    """
+    h, w = depth_m.shape[:2]
+    x1, y1 = np.clip(boxes[:, 0], 0, w - 1), np.clip(boxes[:, 1], 0, h - 1)
+    x2, y2 = np.clip(boxes[:, 2], 0, w - 1), np.clip(boxes[:, 3], 0, h - 1)
+    nx, ny = np.maximum(-(-(x2 - x1) // step), 0), np.maximum(-(-(y2 - y1) // step), 0)  # samples per axis, ceil
+    sizes = nx * ny
+    b = np.repeat(np.arange(len(boxes)), sizes)  # box index of every sample
+    k = np.arange(len(b)) - np.repeat(np.cumsum(sizes) - sizes, sizes)  # sample index within its box
+    gx, gy = x1[b] + k % nx[b] * step, y1[b] + k // nx[b] * step
+    z = depth_m[gy, gx].astype(np.float32)
+    valid = np.isfinite(z) & (z > 0.05) & (z < 10.0)
+    b, gx, gy, z = b[valid], gx[valid], gy[valid], z[valid]
+    points = np.stack(((gx - intr.ppx) / intr.fx * z, (gy - intr.ppy) / intr.fy * z, z), 1)
+    return b, points, np.bincount(b, minlength=len(boxes))
+
+
+def _grouped_sorted(b, h, nb):
+    """Sorts values h by group b and by value within each group, returning sorted values, group starts and counts."""
+    order = np.lexsort((h, b))
+    counts = np.bincount(b, minlength=nb)
+    return h[order], np.cumsum(counts) - counts, counts
+
+
+def box_heights(depth_m, intr, boxes, plane, top_ratio=0.02, step=2, fallback_step=3, max_height=1.5):
+    """
+    Estimates the height above the ground plane of all boxes of a frame at once.
+
+    The upper 70% of each box, shrunk by 12% on both sides, is sampled in a single gather over all boxes and the height
+    of a box is the median of its top `top_ratio` point heights. Boxes with too few valid samples fall back to the 95th
+    percentile of the heights over the whole box sampled with `fallback_step`.
+
+    Args:
+        depth_m (np.ndarray): Depth image in meters of shape (h, w).
+        intr (pyrealsense2.intrinsics): Camera intrinsics with fx, fy, ppx and ppy attributes.
+        boxes (np.ndarray): Boxes of shape (n, 4) in xyxy pixel format.
+        plane (tuple): Ground plane (n, d) from GroundPlane or fit_plane_ransac().
+        top_ratio (float): Fraction of the highest points averaged into the height.
+        step (int): Sampling stride in pixels.
+        fallback_step (int): Sampling stride of the whole-box fallback, None to disable it.
+        max_height (float): Heights outside (0, max_height) meters are ignored.
+
+    Returns:
+        (np.ndarray): Heights in meters of shape (n, ), NaN where no height could be estimated.
+    """
+    boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4).round().astype(int)
+    n, d = plane
+    heights = np.full(len(boxes), np.nan, dtype=np.float32)
+    if not len(boxes):
+        return heights
+
+    # Primary estimate, median of the highest points in the shrunk upper part of each box
+    w, h = boxes[:, 2] - boxes[:, 0], boxes[:, 3] - boxes[:, 1]
+    dx, dy = (w * 0.12).astype(int), (h * 0.7).astype(int)
+    roi = np.stack((boxes[:, 0] + dx, boxes[:, 1], boxes[:, 2] - dx, boxes[:, 1] + dy), 1)
+    b, points, npts = _box_points(depth_m, intr, roi, step)
+    hh = points @ n + d
+    keep = (hh > 0.0) & (hh < max_height) & (npts[b] >= 40)
+    values, starts, counts = _grouped_sorted(b[keep], hh[keep], len(boxes))
+    ok = (counts >= 20) & (w >= 6) & (h >= 6)
+    k = np.maximum(10, (top_ratio * counts).astype(int))
+    lo, hi = starts + counts - k + (k - 1) // 2, starts + counts - k + k // 2  # middle of the top-k
+    heights[ok] = (values[lo[ok]] + values[hi[ok]]) / 2
+
+    # Fallback, 95th percentile over the whole box
+    if fallback_step and (~ok).any():
+        i = np.nonzero(~ok)[0]
+        b, points, npts = _box_points(depth_m, intr, boxes[i], fallback_step)
+        hh = points @ n + d
+        keep = (hh > 0.0) & (hh < max_height) & (npts[b] >= 20)
+        values, starts, counts = _grouped_sorted(b[keep], hh[keep], len(i))
+        ok = counts >= 10
+        pos = (counts - 1) * 0.95  # linear interpolation as np.percentile()
+        lo = np.floor(pos).astype(int)
+        hi = np.minimum(lo + 1, np.maximum(counts - 1, 0))
+        frac = (pos - lo)[ok]
+        lo, hi = (starts + lo)[ok], (starts + hi)[ok]
+        heights[i[ok]] = values[lo] + frac * (values[hi] - values[lo])
+    return heights
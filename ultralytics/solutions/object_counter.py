@@ -4,6 +4,7 @@ from collections import defaultdict
 
 import cv2
 
+from ultralytics.solutions.region_counter import RegionCounter
 from ultralytics.utils.checks import check_imshow, check_requirements
 from ultralytics.utils.plotting import Annotator, colors
 
@@ -26,6 +27,7 @@ class ObjectCounter:
         self.reg_pts = [(20, 400), (1260, 400)]
         self.line_dist_thresh = 15
         self.counting_region = None
+        self.region_counter = None  # vectorized point-in-polygon tests for polygon regions
         self.region_color = (255, 0, 255)
         self.region_thickness = 5
 
@@ -118,6 +120,7 @@ class ObjectCounter:
             print("Polygon Counter Initiated.")
             self.reg_pts = reg_pts
             self.counting_region = Polygon(self.reg_pts)
+            self.region_counter = RegionCounter([self.reg_pts])
         else:
             print("Invalid Region points provided, region_points must be 2 for lines or >= 3 for polygons.")
             print("Using Line Counter Now")
@@ -161,6 +164,8 @@ class ObjectCounter:
             if self.is_drawing and self.selected_point is not None:
                 self.reg_pts[self.selected_point] = (x, y)
                 self.counting_region = Polygon(self.reg_pts)
+                if self.region_counter is not None:
+                    self.region_counter.set_region(0, self.reg_pts)
 
         elif event == cv2.EVENT_LBUTTONUP:
             self.is_drawing = False
@@ -177,8 +182,12 @@ class ObjectCounter:
             clss = tracks[0].boxes.cls.cpu().tolist()
             track_ids = tracks[0].boxes.id.int().cpu().tolist()
 
+            # Test all centroids against the polygon at once
+            if len(self.reg_pts) >= 3:
+                is_inside_all = self.region_counter.contains((boxes[:, :2] + boxes[:, 2:]).numpy() / 2)[:, 0]
+
             # Extract tracks
-            for box, track_id, cls in zip(boxes, track_ids, clss):
+            for i, (box, track_id, cls) in enumerate(zip(boxes, track_ids, clss)):
                 # Draw bounding box
                 self.annotator.box_label(box, label=f"{self.names[cls]}#{track_id}", color=colors(int(track_id), True))
 
@@ -206,7 +215,7 @@ class ObjectCounter:
 
                 # Count objects in any polygon
                 if len(self.reg_pts) >= 3:
-                    is_inside = self.counting_region.contains(Point(track_line[-1]))
+                    is_inside = is_inside_all[i]
 
                     if prev_position is not None and is_inside and track_id not in self.count_ids:
                         self.count_ids.append(track_id)
@@ -0,0 +1,120 @@
+# Ultralytics YOLO 🚀, AGPL-3.0 license
+
+import cv2
+import numpy as np
+import torch
+
+
+class RegionCounter:
+    """
+    A class to count unique tracked objects whose box centroids fall inside one or more polygon regions.
+
+    All centroids are tested against all regions in a single NumPy pass, either with a crossing-number test against
+    precomputed polygon edge arrays or, when the frame size is known, with a lookup into rasterized region masks.
+
+    Attributes:
+        names (list): Names of the regions.
+        polygons (list): Region vertices, one (n, 2) array per region.
+        imgsz (tuple, optional): Frame size (h, w) used to rasterize the regions into masks.
+        seen_ids (list): Set of counted track IDs per region.
+        counts (np.ndarray): Number of unique track IDs seen in each region.
+
+    Example:
+        ```python
+        from ultralytics.solutions.region_counter import RegionCounter
+
+        counter = RegionCounter({'Polygon': [(50, 80), (250, 20), (450, 80), (400, 350), (100, 350)]})
+        results = model.track(frame, persist=True)
+        counts = counter.update(results[0].boxes.xyxy, results[0].boxes.id)
+        ```
+    """
+
+    def __init__(self, regions, imgsz=None):
+        """
+        Initializes the RegionCounter with polygon regions.
+
+        Args:
+            regions (dict | list): Dictionary of {name: points} or list of points, each with >= 3 (x, y) vertices.
+            imgsz (tuple, optional): Frame size (h, w). If given, point tests use rasterized region masks.
+        """
+        if not isinstance(regions, dict):
+            regions = {str(i): points for i, points in enumerate(regions)}
+        self.names = list(regions)
+        self.polygons = [np.asarray(points, dtype=np.float32).reshape(-1, 2) for points in regions.values()]
+        assert all(len(p) >= 3 for p in self.polygons), "Regions must have at least 3 points."
+        self.imgsz = imgsz
+        self.seen_ids = [set() for _ in self.polygons]
+        self.counts = np.zeros(len(self.polygons), dtype=int)
+        self._build()
+
+    def _build(self):
+        """Precomputes the concatenated edge arrays of all regions and, if imgsz is set, their rasterized masks."""
+        self._edges = np.concatenate([np.concatenate((p, np.roll(p, -1, 0)), 1) for p in self.polygons])  # x1y1x2y2
+        self._starts = np.cumsum([0] + [len(p) for p in self.polygons[:-1]])  # first edge index of each region
+        if self.imgsz is not None:
+            h, w = self.imgsz[:2]
+            self._masks = np.zeros((h, w, len(self.polygons)), dtype=bool)
+            for i, p in enumerate(self.polygons):
+                mask = np.zeros((h, w), dtype=np.uint8)
+                cv2.fillPoly(mask, [p.round().astype(np.int32)], 1)
+                self._masks[..., i] = mask.astype(bool)
+
+    def set_region(self, i, points):
+        """Replaces the vertices of region i, i.e. after the region was moved with the mouse."""
+        self.polygons[i] = np.asarray(points, dtype=np.float32).reshape(-1, 2)
+        self._build()
+
+    def contains(self, points):
+        """
+        Tests all points against all regions at once.
+
+        Args:
+            points (np.ndarray): Points of shape (n, 2) in pixels.
+
+        Returns:
+            (np.ndarray): Boolean array of shape (n, num_regions), True where a point lies inside a region.
+        """
+        points = np.asarray(points, dtype=np.float32).reshape(-1, 2)
+        if self.imgsz is not None:
+            h, w = self._masks.shape[:2]
+            x, y = points.round().astype(int).T
+            valid = (x >= 0) & (x < w) & (y >= 0) & (y < h)
+            inside = np.zeros((len(points), len(self.polygons)), dtype=bool)
+            inside[valid] = self._masks[y[valid], x[valid]]
+            return inside
+
+        px, py = points[:, :1], points[:, 1:]  # (n, 1)
+        x1, y1, x2, y2 = self._edges.T  # (e, )
+        with np.errstate(divide="ignore", invalid="ignore"):  # horizontal edges never straddle py
+            crossings = ((y1 > py) != (y2 > py)) & (px < (x2 - x1) * (py - y1) / (y2 - y1) + x1)  # (n, e)
+        return (np.add.reduceat(crossings.astype(np.uint8), self._starts, axis=1) & 1).astype(bool)  # odd crossings
+
+    def update(self, boxes, track_ids=None):
+        """
+        Counts the tracked objects whose box centroid lies inside each region.
+
+        Args:
+            boxes (torch.Tensor | np.ndarray): Boxes of shape (n, 4) in xyxy format.
+            track_ids (torch.Tensor | np.ndarray | list, optional): Track IDs of the boxes. Untracked boxes are not
+                counted.
+
+        Returns:
+            (np.ndarray): Number of unique track IDs seen in each region so far.
+        """
+        if track_ids is None or not len(boxes):
+            return self.counts
+        if isinstance(boxes, torch.Tensor):
+            boxes = boxes.cpu().numpy()
+        if isinstance(track_ids, torch.Tensor):
+            track_ids = track_ids.cpu().numpy()
+        boxes, track_ids = np.asarray(boxes), np.asarray(track_ids).astype(int)
+        inside = self.contains((boxes[:, :2] + boxes[:, 2:4]) / 2)
+        for seen, k in zip(self.seen_ids, inside.T):
+            seen.update(track_ids[k].tolist())
+        self.counts = np.array([len(seen) for seen in self.seen_ids])
+        return self.counts
+
+    def reset(self):
+        """Clears all counted track IDs."""
+        self.seen_ids = [set() for _ in self.polygons]
+        self.counts = np.zeros(len(self.polygons), dtype=int)
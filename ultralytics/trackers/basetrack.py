@@ -103,3 +103,93 @@ class BaseTrack:
     def reset_id():
         """Reset the global track ID counter."""
         BaseTrack._count = 0
+
+
+class TrackTable:
+    """
+    Structure-of-arrays store holding the state of all tracks of a tracker in contiguous NumPy arrays.
+
+    Each column is a preallocated array with one row per track, so that trackers can predict, update and match all
+    tracks with single array operations on row indices instead of looping over per-object track instances. Columns are
+    accessed as attributes, e.g. `table.mean[rows]`, and are views into the first `len(table)` rows.
+
+    Attributes:
+        columns (dict): Column name to (row shape, dtype, fill value) mapping.
+        n (int): Number of tracks in the table.
+
+    Methods:
+        append(**values): Appends rows and returns their indices.
+        keep(rows): Keeps only the given rows in the given order.
+        reset(): Removes all rows.
+    """
+
+    columns = {
+        "mean": ((8,), np.float64, 0),
+        "covariance": ((8, 8), np.float64, 0),
+        "state": ((), np.int8, TrackState.New),
+        "is_activated": ((), bool, False),
+        "track_id": ((), np.int64, 0),
+        "score": ((), np.float32, 0),
+        "cls": ((), np.float32, 0),
+        "idx": ((), np.int64, 0),
+        "angle": ((), np.float32, np.nan),
+        "tracklet_len": ((), np.int64, 0),
+        "frame_id": ((), np.int64, 0),
+        "start_frame": ((), np.int64, 0),
+    }
+
+    def __init__(self, capacity=64):
+        """Initializes an empty table with room for `capacity` tracks."""
+        self.n = 0
+        self._data = {k: np.full((capacity, *shape), fill, dtype=t) for k, (shape, t, fill) in self.columns.items()}
+
+    def __len__(self):
+        """Returns the number of tracks."""
+        return self.n
+
+    def __getattr__(self, name):
+        """Returns a view of the first `n` rows of column `name`."""
+        data = self.__dict__.get("_data")
+        if data is None or name not in data:
+            raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
+        return data[name][: self.n]
+
+    def _reserve(self, size):
+        """Grows the preallocated arrays to hold at least `size` rows, doubling the capacity to amortize copies."""
+        capacity = len(self._data["state"])
+        if size <= capacity:
+            return
+        capacity = max(size, 2 * capacity)
+        for k, (shape, t, fill) in self.columns.items():
+            data = np.full((capacity, *shape), fill, dtype=t)
+            data[: self.n] = self._data[k][: self.n]
+            self._data[k] = data
+
+    def append(self, **values):
+        """
+        Appends rows to the table, columns not given are set to their fill value.
+
+        Args:
+            **values (np.ndarray): Column values with one row per new track.
+
+        Returns:
+            (np.ndarray): Row indices of the new tracks.
+        """
+        m = len(next(iter(values.values())))
+        self._reserve(self.n + m)
+        i, j = self.n, self.n + m
+        for k, (_, _, fill) in self.columns.items():
+            self._data[k][i:j] = values[k] if k in values else fill
+        self.n = j
+        return np.arange(i, j)
+
+    def keep(self, rows):
+        """Keeps only the given rows in the given order, compacting the arrays in place."""
+        rows = np.asarray(rows, dtype=int)
+        for data in self._data.values():
+            data[: len(rows)] = data[rows]
+        self.n = len(rows)
+
+    def reset(self):
+        """Removes all rows."""
+        self.n = 0
@@ -6,7 +6,6 @@ import numpy as np
 
 from .basetrack import TrackState
 from .byte_tracker import BYTETracker, STrack
-from .utils import matching
 from .utils.gmc import GMC
 from .utils.kalman_filter import KalmanFilterXYWH
 
@@ -135,19 +134,20 @@ class BOTSORT(BYTETracker):
 
     Methods:
         get_kalmanfilter(): Returns an instance of KalmanFilterXYWH for object tracking.
-        init_track(dets, scores, cls, img): Initialize track with detections, scores, and classes.
-        get_dists(tracks, detections): Get distances between tracks and detections using IoU and (optionally) ReID.
-        multi_predict(tracks): Predict and track multiple objects with YOLOv8 model.
+        xywh_to_measurement(xywh): Converts boxes to the Kalman filter measurement (x, y, w, h).
+        mean_to_xywh(mean): Converts Kalman filter states to boxes.
 
     Usage:
         bot_sort = BOTSORT(args, frame_rate)
-        bot_sort.init_track(dets, scores, cls, img)
-        bot_sort.multi_predict(tracks)
+        tracks = bot_sort.update(results, img)
 
     Note:
-        The class is designed to work with the YOLOv8 object detection model and supports ReID only if enabled via args.
+        The class is designed to work with the YOLOv8 object detection model. ReID is not supported yet, so tracks are
+        matched on IoU fused with detection scores.
     """
 
+    reset_velocity = slice(6, 8)  # velocity components zeroed when predicting lost tracks
+
     def __init__(self, args, frame_rate=30):
         """Initialize YOLOv8 object with ReID module and GMC algorithm."""
         super().__init__(args, frame_rate)
@@ -158,41 +158,21 @@ class BOTSORT(BYTETracker):
         if args.with_reid:
             # Haven't supported BoT-SORT(reid) yet
             self.encoder = None
-        self.gmc = GMC(method=args.gmc_method)
+        self.gmc = GMC(method=args.gmc_method, interval=getattr(args, "gmc_interval", 1))
 
     def get_kalmanfilter(self):
         """Returns an instance of KalmanFilterXYWH for object tracking."""
         return KalmanFilterXYWH()
 
-    def init_track(self, dets, scores, cls, img=None):
-        """Initialize track with detections, scores, and classes."""
-        if len(dets) == 0:
-            return []
-        if self.args.with_reid and self.encoder is not None:
-            features_keep = self.encoder.inference(img, dets)
-            return [BOTrack(xyxy, s, c, f) for (xyxy, s, c, f) in zip(dets, scores, cls, features_keep)]  # detections
-        else:
-            return [BOTrack(xyxy, s, c) for (xyxy, s, c) in zip(dets, scores, cls)]  # detections
-
-    def get_dists(self, tracks, detections):
-        """Get distances between tracks and detections using IoU and (optionally) ReID embeddings."""
-        dists = matching.iou_distance(tracks, detections)
-        dists_mask = dists > self.proximity_thresh
-
-        # TODO: mot20
-        # if not self.args.mot20:
-        dists = matching.fuse_score(dists, detections)
-
-        if self.args.with_reid and self.encoder is not None:
-            emb_dists = matching.embedding_distance(tracks, detections) / 2.0
-            emb_dists[emb_dists > self.appearance_thresh] = 1.0
-            emb_dists[dists_mask] = 1.0
-            dists = np.minimum(dists, emb_dists)
-        return dists
-
-    def multi_predict(self, tracks):
-        """Predict and track multiple objects with YOLOv8 model."""
-        BOTrack.multi_predict(tracks)
+    @staticmethod
+    def xywh_to_measurement(xywh):
+        """Kalman filter measurements are boxes (center x, center y, width, height)."""
+        return np.asarray(xywh, dtype=float).copy()
+
+    @staticmethod
+    def mean_to_xywh(mean):
+        """Convert Nx8 Kalman filter states (x, y, w, h, ...) to boxes (center x, center y, width, height)."""
+        return mean[:, :4].copy()
 
     def reset(self):
         """Reset tracker."""
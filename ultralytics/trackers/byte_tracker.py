@@ -2,10 +2,10 @@
 
 import numpy as np
 
-from .basetrack import BaseTrack, TrackState
+from .basetrack import BaseTrack, TrackState, TrackTable
 from .utils import matching
 from .utils.kalman_filter import KalmanFilterXYAH
-from ..utils.ops import xywh2ltwh
+from ..utils.ops import xywh2ltwh, xywh2xyxy
 from ..utils import LOGGER
 
 
@@ -214,36 +214,41 @@ class BYTETracker:
     BYTETracker: A tracking algorithm built on top of YOLOv8 for object detection and tracking.
 
     The class is responsible for initializing, updating, and managing the tracks for detected objects in a video
-    sequence. It maintains the state of tracked, lost, and removed tracks over frames, utilizes Kalman filtering for
-    predicting the new object locations, and performs data association.
+    sequence. It maintains the state of tracked and lost tracks over frames, utilizes Kalman filtering for predicting
+    the new object locations, and performs data association.
+
+    All tracks are stored in a structure-of-arrays TrackTable, ordered with tracked tracks before lost tracks, and each
+    step of the update operates on arrays of row indices, so the cost per frame is dominated by a few batched Kalman
+    filter and IoU operations rather than per-track Python objects. `update_steps()` yields these operations, which lets
+    `multi_update()` run them for several trackers, e.g. one per video stream, as single batched operations.
 
     Attributes:
-        tracked_stracks (list[STrack]): List of successfully activated tracks.
-        lost_stracks (list[STrack]): List of lost tracks.
-        removed_stracks (list[STrack]): List of removed tracks.
+        tracks (TrackTable): Table of tracked and lost tracks.
         frame_id (int): The current frame ID.
+        id_count (int): The last track ID assigned by this tracker.
         args (namespace): Command-line arguments.
         max_time_lost (int): The maximum frames for a track to be considered as 'lost'.
         kalman_filter (object): Kalman Filter object.
 
     Methods:
         update(results, img=None): Updates object tracker with new detections.
+        multi_update(trackers, results, imgs): Updates several trackers with batched Kalman filter and IoU steps.
+        update_steps(results, img=None): Generator running an update step by step.
         get_kalmanfilter(): Returns a Kalman filter object for tracking bounding boxes.
-        init_track(dets, scores, cls, img=None): Initialize object tracking with detections.
-        get_dists(tracks, detections): Calculates the distance between tracks and detections.
-        multi_predict(tracks): Predicts the location of tracks.
-        reset_id(): Resets the ID counter of STrack.
-        joint_stracks(tlista, tlistb): Combines two lists of stracks.
-        sub_stracks(tlista, tlistb): Filters out the stracks present in the second list from the first list.
-        remove_duplicate_stracks(stracksa, stracksb): Removes duplicate stracks based on IoU.
+        init_track(mean, covariance, dets, scores, cls): Start new tracks from detections.
+        update_track(rows, dets, scores, cls): Update tracks with matched detections.
+        get_dists(dists, scores): Fuses IoU distances between tracks and detections with detection scores.
+        multi_gmc(rows, H): Applies global motion compensation to tracks.
+        track_boxes(rows): Returns the boxes of tracks for IoU matching.
+        reset_id(): Resets the track ID counter.
+        remove_duplicate_stracks(pdist, tracked, lost): Removes duplicate tracks based on IoU.
     """
 
+    reset_velocity = slice(7, 8)  # velocity components zeroed when predicting lost tracks
+
     def __init__(self, args, frame_rate=30):
         """Initialize a YOLOv8 object to track objects with given arguments and frame rate."""
-        self.tracked_stracks = []  # type: list[STrack]
-        self.lost_stracks = []  # type: list[STrack]
-        self.removed_stracks = []  # type: list[STrack]
-
+        self.tracks = TrackTable()
         self.frame_id = 0
         self.args = args
         self.max_time_lost = int(frame_rate / 30.0 * args.track_buffer)
@@ -252,11 +257,87 @@ class BYTETracker:
 
     def update(self, results, img=None):
         """Updates object tracker with new detections and returns tracked object bounding boxes."""
+        return self.multi_update([self], [results], [img])[0]
+
+    @staticmethod
+    def multi_update(trackers, results, imgs):
+        """
+        Update several trackers in lockstep, running their Kalman filter and IoU steps as single batched operations.
+
+        Every tracker runs its own association in `update_steps()`, which yields at each Kalman filter or IoU step. As
+        all trackers yield the same sequence of steps, the steps of all trackers are executed together, so S video
+        streams cost one predict, update and IoU pass each instead of S small ones. Track IDs, states and resets stay
+        per tracker.
+
+        Args:
+            trackers (list[BYTETracker]): Trackers of the same type, each updated once.
+            results (list): Detections of each tracker, see `update()`.
+            imgs (list): Image of each tracker, used for global motion compensation.
+
+        Returns:
+            (list[np.ndarray]): Tracked objects of each tracker in the format returned by `update()`.
+        """
+        steps = [t.update_steps(r, im) for t, r, im in zip(trackers, results, imgs)]
+        ops = [next(s) for s in steps]
+        while True:
+            outs = BYTETracker._execute(trackers, ops)
+            ops, returned = [], []
+            for s, out in zip(steps, outs):
+                try:
+                    ops.append(s.send(out))
+                except StopIteration as e:
+                    returned.append(e.value)
+            if returned:
+                return returned
+
+    @staticmethod
+    def _execute(trackers, ops):
+        """Executes one step yielded by `update_steps()` for all trackers at once and returns the output of each."""
+        kind, kf = ops[0][0], trackers[0].kalman_filter
+        if kind == "iou":  # ('iou', [(a_boxes, b_boxes), ...]) -> list of cost matrices
+            dists = iter(matching.batch_iou_distance([pair for op in ops for pair in op[1]]))
+            return [[next(dists) for _ in op[1]] for op in ops]
+
+        if kind == "predict":  # ('predict', rows) -> None
+            means = []
+            for t, (_, rows) in zip(trackers, ops):
+                mean = t.tracks.mean[rows]
+                mean[t.tracks.state[rows] != TrackState.Tracked, t.reset_velocity] = 0
+                means.append(mean)
+            rows = [op[1] for op in ops]
+            if sum(map(len, rows)):
+                covariance = np.concatenate([t.tracks.covariance[r] for t, r in zip(trackers, rows)])
+                mean, covariance = kf.multi_predict(np.concatenate(means), covariance)
+                _scatter(trackers, rows, mean, covariance)
+            return [None] * len(ops)
+
+        if kind == "kalman":  # ('kalman', rows, measurement, new_measurement) -> (mean, covariance) of new tracks
+            rows = [op[1] for op in ops]
+            if sum(map(len, rows)):
+                mean = np.concatenate([t.tracks.mean[r] for t, r in zip(trackers, rows)])
+                covariance = np.concatenate([t.tracks.covariance[r] for t, r in zip(trackers, rows)])
+                mean, covariance = kf.multi_update(mean, covariance, np.concatenate([op[2] for op in ops]))
+                _scatter(trackers, rows, mean, covariance)
+            new = [op[3] for op in ops]
+            mean, covariance = kf.multi_initiate(np.concatenate(new))
+            i = np.cumsum([len(x) for x in new])[:-1]
+            return list(zip(np.split(mean, i), np.split(covariance, i)))
+
+        raise ValueError(f"Unknown tracker step '{kind}'")
+
+    def update_steps(self, results, img=None):
+        """
+        Generator running one tracker update, yielding each Kalman filter and IoU step for batched execution.
+
+        Yields:
+            (tuple): Step to execute, ('predict', rows), ('iou', [(a_boxes, b_boxes), ...]) or
+                ('kalman', rows, measurement, new_measurement). The step output is sent back into the generator.
+
+        Returns:
+            (np.ndarray): Tracked objects in the format returned by `update()`.
+        """
         self.frame_id += 1
-        activated_stracks = []
-        refind_stracks = []
-        lost_stracks = []
-        removed_stracks = []
+        t = self.tracks
 
         scores = results.conf
         bboxes = results.xywhr if hasattr(results, "xywhr") else results.xywh
@@ -265,180 +346,184 @@ class BYTETracker:
         cls = results.cls
 
         remain_inds = scores > self.args.track_high_thresh
-        inds_low = scores > self.args.track_low_thresh
-        inds_high = scores < self.args.track_high_thresh
-
-        inds_second = np.logical_and(inds_low, inds_high)
-        dets_second = bboxes[inds_second]
-        dets = bboxes[remain_inds]
-        scores_keep = scores[remain_inds]
-        scores_second = scores[inds_second]
-        cls_keep = cls[remain_inds]
-        cls_second = cls[inds_second]
-
-        detections = self.init_track(dets, scores_keep, cls_keep, img)
-        # Add newly detected tracklets to tracked_stracks
-        unconfirmed = []
-        tracked_stracks = []  # type: list[STrack]
-        for track in self.tracked_stracks:
-            if not track.is_activated:
-                unconfirmed.append(track)
-            else:
-                tracked_stracks.append(track)
+        inds_second = (scores > self.args.track_low_thresh) & (scores < self.args.track_high_thresh)
+        dets, scores_keep, cls_keep = bboxes[remain_inds], scores[remain_inds], cls[remain_inds]
+        dets_second, scores_second, cls_second = bboxes[inds_second], scores[inds_second], cls[inds_second]
+
+        # Tracks are ordered tracked first, then lost, row order is preserved by all boolean selections below
+        state, n = t.state.copy(), len(t)  # states at the start of the frame
+        tracked, lost = state == TrackState.Tracked, state == TrackState.Lost
+        unconfirmed = np.nonzero(tracked & ~t.is_activated)[0]
         # Step 2: First association, with high score detection boxes
-        strack_pool = self.joint_stracks(tracked_stracks, self.lost_stracks)
+        strack_pool = np.nonzero((tracked & t.is_activated) | lost)[0]
         # Predict the current location with KF
-        self.multi_predict(strack_pool)
+        yield "predict", strack_pool
         if hasattr(self, "gmc") and img is not None:
             warp = self.gmc.apply(img, dets)
-            STrack.multi_gmc(strack_pool, warp)
-            STrack.multi_gmc(unconfirmed, warp)
-
-        dists = self.get_dists(strack_pool, detections)
-        matches, u_track, u_detection = matching.linear_assignment(dists, thresh=self.args.match_thresh)
-
-        for itracked, idet in matches:
-            track = strack_pool[itracked]
-            det = detections[idet]
-            if track.state == TrackState.Tracked:
-                track.update(det, self.frame_id)
-                activated_stracks.append(track)
-            else:
-                track.re_activate(det, self.frame_id, new_id=False)
-                refind_stracks.append(track)
+            self.multi_gmc(strack_pool, warp)
+            self.multi_gmc(unconfirmed, warp)
+
+        (dists,) = yield "iou", [(self.track_boxes(strack_pool), self.det_boxes(dets))]
+        matches, u_track, u_detection = self._assign(self.get_dists(dists, scores_keep), self.args.match_thresh)
+        rows1, idet1 = strack_pool[matches[:, 0]], matches[:, 1]
+        refind_stracks = rows1[lost[rows1]]
         # Step 3: Second association, with low score detection boxes association the untrack to the low score detections
-        detections_second = self.init_track(dets_second, scores_second, cls_second, img)
-        r_tracked_stracks = [strack_pool[i] for i in u_track if strack_pool[i].state == TrackState.Tracked]
-        # TODO
-        dists = matching.iou_distance(r_tracked_stracks, detections_second)
-        matches, u_track, u_detection_second = matching.linear_assignment(dists, thresh=0.5)
-        for itracked, idet in matches:
-            track = r_tracked_stracks[itracked]
-            det = detections_second[idet]
-            if track.state == TrackState.Tracked:
-                track.update(det, self.frame_id)
-                activated_stracks.append(track)
-            else:
-                track.re_activate(det, self.frame_id, new_id=False)
-                refind_stracks.append(track)
-
-        for it in u_track:
-            track = r_tracked_stracks[it]
-            if track.state != TrackState.Lost:
-                track.mark_lost()
-                lost_stracks.append(track)
-        # Deal with unconfirmed tracks, usually tracks with only one beginning frame
-        detections = [detections[i] for i in u_detection]
-        dists = self.get_dists(unconfirmed, detections)
-        matches, u_unconfirmed, u_detection = matching.linear_assignment(dists, thresh=0.7)
-        for itracked, idet in matches:
-            unconfirmed[itracked].update(detections[idet], self.frame_id)
-            activated_stracks.append(unconfirmed[itracked])
-        for it in u_unconfirmed:
-            track = unconfirmed[it]
-            track.mark_removed()
-            removed_stracks.append(track)
+        # Also deal with unconfirmed tracks, usually tracks with only one beginning frame
+        r_tracked_stracks = strack_pool[u_track][tracked[strack_pool[u_track]]]
+        dists, dists_unconfirmed = yield "iou", [
+            (self.track_boxes(r_tracked_stracks), self.det_boxes(dets_second)),
+            (self.track_boxes(unconfirmed), self.det_boxes(dets[u_detection])),
+        ]
+        matches, u_track, _ = self._assign(dists, 0.5)
+        rows2, idet2 = r_tracked_stracks[matches[:, 0]], matches[:, 1]
+        lost_stracks = r_tracked_stracks[u_track]
+        dists = self.get_dists(dists_unconfirmed, scores_keep[u_detection])
+        matches, u_unconfirmed, u_det = self._assign(dists, 0.7)
+        rows3, idet3 = unconfirmed[matches[:, 0]], u_detection[matches[:, 1]]
         # Step 4: Init new stracks
-        for inew in u_detection:
-            track = detections[inew]
-            if track.score < self.args.new_track_thresh:
-                continue
-            track.activate(self.kalman_filter, self.frame_id)
-            activated_stracks.append(track)
+        inew = u_detection[u_det]
+        inew = inew[scores_keep[inew] >= self.args.new_track_thresh]
+
+        # Kalman filter update of all matched tracks and initiation of new tracks
+        rows = np.concatenate((rows1, rows2, rows3))
+        matched = np.concatenate((dets[idet1], dets_second[idet2], dets[idet3]))
+        measurement = self.xywh_to_measurement(matched[:, :4])
+        mean, covariance = yield "kalman", rows, measurement, self.xywh_to_measurement(dets[inew, :4])
+        self.update_track(
+            rows,
+            matched,
+            np.concatenate((scores_keep[idet1], scores_second[idet2], scores_keep[idet3])),
+            np.concatenate((cls_keep[idet1], cls_second[idet2], cls_keep[idet3])),
+        )
+        t.state[lost_stracks] = TrackState.Lost
+        t.state[unconfirmed[u_unconfirmed]] = TrackState.Removed
+        new_stracks = self.init_track(mean, covariance, dets[inew], scores_keep[inew], cls_keep[inew])
         # Step 5: Update state
-        for track in self.lost_stracks:
-            if self.frame_id - track.end_frame > self.max_time_lost:
-                track.mark_removed()
-                removed_stracks.append(track)
-
-        self.tracked_stracks = [t for t in self.tracked_stracks if t.state == TrackState.Tracked]
-        self.tracked_stracks = self.joint_stracks(self.tracked_stracks, activated_stracks)
-        self.tracked_stracks = self.joint_stracks(self.tracked_stracks, refind_stracks)
-        self.lost_stracks = self.sub_stracks(self.lost_stracks, self.tracked_stracks)
-        self.lost_stracks.extend(lost_stracks)
-        self.lost_stracks = self.sub_stracks(self.lost_stracks, self.removed_stracks)
-        self.tracked_stracks, self.lost_stracks = self.remove_duplicate_stracks(self.tracked_stracks, self.lost_stracks)
-        self.removed_stracks.extend(removed_stracks)
-        if len(self.removed_stracks) > 1000:
-            self.removed_stracks = self.removed_stracks[-999:]  # clip remove stracks to 1000 maximum
-
-        return np.asarray([x.result for x in self.tracked_stracks if x.is_activated], dtype=np.float32)
+        t.state[np.nonzero(lost & (self.frame_id - t.frame_id[:n] > self.max_time_lost))[0]] = TrackState.Removed
+
+        state = t.state[:n]
+        tracked_stracks = np.concatenate((np.nonzero(tracked & (state == TrackState.Tracked))[0], new_stracks))
+        tracked_stracks = np.concatenate((tracked_stracks, refind_stracks))
+        lost_stracks = np.concatenate((np.nonzero(lost & (state == TrackState.Lost))[0], lost_stracks))
+        (pdist,) = yield "iou", [(self.track_boxes(tracked_stracks), self.track_boxes(lost_stracks))]
+        tracked_stracks, lost_stracks = self.remove_duplicate_stracks(pdist, tracked_stracks, lost_stracks)
+        t.keep(np.concatenate((tracked_stracks, lost_stracks)))
+
+        rows = np.nonzero(t.is_activated[: len(tracked_stracks)])[0]
+        return np.concatenate(
+            (self.track_boxes(rows), np.stack((t.track_id[rows], t.score[rows], t.cls[rows], t.idx[rows]), 1)), 1
+        ).astype(np.float32)
 
     def get_kalmanfilter(self):
         """Returns a Kalman filter object for tracking bounding boxes."""
         return KalmanFilterXYAH()
 
-    def init_track(self, dets, scores, cls, img=None):
-        """Initialize object tracking with detections and scores using STrack algorithm."""
-        return [STrack(xyxy, s, c) for (xyxy, s, c) in zip(dets, scores, cls)] if len(dets) else []  # detections
+    @staticmethod
+    def xywh_to_measurement(xywh):
+        """Convert Nx4 boxes (center x, center y, width, height) to the Kalman filter measurement (x, y, a, h)."""
+        ret = np.asarray(xywh, dtype=float).copy()
+        ret[:, 2] /= ret[:, 3]
+        return ret
+
+    @staticmethod
+    def mean_to_xywh(mean):
+        """Convert Nx8 Kalman filter states (x, y, a, h, ...) to boxes (center x, center y, width, height)."""
+        ret = mean[:, :4].copy()
+        ret[:, 2] *= ret[:, 3]
+        return ret
+
+    @staticmethod
+    def det_boxes(dets):
+        """Returns detection boxes for IoU matching, xyxy or xywha for oriented boxes."""
+        if dets.shape[1] == 6:
+            return np.ascontiguousarray(dets[:, :5], dtype=np.float32)
+        return np.ascontiguousarray(xywh2xyxy(dets[:, :4]), dtype=np.float32)
+
+    def track_boxes(self, rows):
+        """Returns track boxes for IoU matching, xyxy or xywha for oriented boxes."""
+        xywh, angle = self.mean_to_xywh(self.tracks.mean[rows]), self.tracks.angle[rows]
+        if len(rows) and not np.isnan(angle).any():
+            return np.concatenate((xywh, angle[:, None]), 1).astype(np.float32)
+        return xywh2xyxy(xywh).astype(np.float32)
+
+    def init_track(self, mean, covariance, dets, scores, cls):
+        """Start new tracks from unmatched detections and their initial Kalman filter states, returning their rows."""
+        if not len(dets):
+            return np.empty(0, dtype=int)
+        ids = np.arange(self.id_count + 1, self.id_count + len(dets) + 1)
+        self.id_count += len(dets)
+        return self.tracks.append(
+            mean=mean,
+            covariance=covariance,
+            state=TrackState.Tracked,
+            is_activated=self.frame_id == 1,
+            track_id=ids,
+            score=scores,
+            cls=cls,
+            idx=dets[:, -1],
+            angle=dets[:, 4] if dets.shape[1] == 6 else np.nan,
+            frame_id=self.frame_id,
+            start_frame=self.frame_id,
+        )
 
-    def get_dists(self, tracks, detections):
-        """Calculates the distance between tracks and detections using IoU and fuses scores."""
-        dists = matching.iou_distance(tracks, detections)
+    def update_track(self, rows, dets, scores, cls):
+        """Update the attributes of Kalman-updated tracks with their matched detections, re-activating lost tracks."""
+        t = self.tracks
+        t.tracklet_len[rows] = np.where(t.state[rows] == TrackState.Tracked, t.tracklet_len[rows] + 1, 0)
+        t.state[rows] = TrackState.Tracked
+        t.is_activated[rows] = True
+        t.frame_id[rows] = self.frame_id
+        t.score[rows], t.cls[rows], t.idx[rows] = scores, cls, dets[:, -1]
+        t.angle[rows] = dets[:, 4] if dets.shape[1] == 6 else np.nan
+
+    def get_dists(self, dists, scores):
+        """Fuses the IoU distances between tracks and detections with the detection scores."""
         # TODO: mot20
         # if not self.args.mot20:
-        dists = matching.fuse_score(dists, detections)
-        return dists
-
-    def multi_predict(self, tracks):
-        """Returns the predicted tracks using the YOLOv8 network."""
-        STrack.multi_predict(tracks)
+        return matching.fuse_score(dists, scores)
 
     @staticmethod
-    def reset_id():
-        """Resets the ID counter of STrack."""
-        STrack.reset_id()
+    def _assign(dists, thresh):
+        """Linear assignment returning matches as an (n, 2) array and unmatched rows and columns as index arrays."""
+        matches, u_a, u_b = matching.linear_assignment(dists, thresh=thresh)
+        return np.asarray(matches, dtype=int).reshape(-1, 2), np.asarray(u_a, dtype=int), np.asarray(u_b, dtype=int)
+
+    def multi_gmc(self, rows, H=np.eye(2, 3)):
+        """Update track positions and covariances using a homography matrix."""
+        if not len(rows):
+            return
+        t = self.tracks
+        R8x8 = np.kron(np.eye(4, dtype=float), H[:2, :2])
+        mean = t.mean[rows] @ R8x8.T
+        mean[:, :2] += H[:2, 2]
+        t.mean[rows], t.covariance[rows] = mean, R8x8 @ t.covariance[rows] @ R8x8.T
+
+    def reset_id(self):
+        """Resets the track ID counter, track IDs are counted per tracker."""
+        self.id_count = 0
 
     def reset(self):
         """Reset tracker."""
-        self.tracked_stracks = []  # type: list[STrack]
-        self.lost_stracks = []  # type: list[STrack]
-        self.removed_stracks = []  # type: list[STrack]
+        self.tracks = TrackTable()
         self.frame_id = 0
         self.kalman_filter = self.get_kalmanfilter()
         self.reset_id()
 
-    @staticmethod
-    def joint_stracks(tlista, tlistb):
-        """Combine two lists of stracks into a single one."""
-        exists = {}
-        res = []
-        for t in tlista:
-            exists[t.track_id] = 1
-            res.append(t)
-        for t in tlistb:
-            tid = t.track_id
-            if not exists.get(tid, 0):
-                exists[tid] = 1
-                res.append(t)
-        return res
-
-    @staticmethod
-    def sub_stracks(tlista, tlistb):
-        """DEPRECATED CODE in https://github.com/ultralytics/ultralytics/pull/1890/
-        stracks = {t.track_id: t for t in tlista}
-        for t in tlistb:
-            tid = t.track_id
-            if stracks.get(tid, 0):
-                del stracks[tid]
-        return list(stracks.values())
-        """
-        track_ids_b = {t.track_id for t in tlistb}
-        return [t for t in tlista if t.track_id not in track_ids_b]
-
-    @staticmethod
-    def remove_duplicate_stracks(stracksa, stracksb):
-        """Remove duplicate stracks with non-maximum IoU distance."""
-        pdist = matching.iou_distance(stracksa, stracksb)
-        pairs = np.where(pdist < 0.15)
-        dupa, dupb = [], []
-        for p, q in zip(*pairs):
-            timep = stracksa[p].frame_id - stracksa[p].start_frame
-            timeq = stracksb[q].frame_id - stracksb[q].start_frame
-            if timep > timeq:
-                dupb.append(q)
-            else:
-                dupa.append(p)
-        resa = [t for i, t in enumerate(stracksa) if i not in dupa]
-        resb = [t for i, t in enumerate(stracksb) if i not in dupb]
-        return resa, resb
+    def remove_duplicate_stracks(self, pdist, tracked, lost):
+        """Remove duplicate tracks between tracked and lost rows with IoU distances pdist, keeping the longer track."""
+        p, q = np.nonzero(pdist < 0.15)
+        t = self.tracks
+        timep = t.frame_id[tracked[p]] - t.start_frame[tracked[p]]
+        timeq = t.frame_id[lost[q]] - t.start_frame[lost[q]]
+        keep_tracked, keep_lost = np.ones(len(tracked), dtype=bool), np.ones(len(lost), dtype=bool)
+        keep_lost[q[timep > timeq]] = False
+        keep_tracked[p[timep <= timeq]] = False
+        return tracked[keep_tracked], lost[keep_lost]
+
+
+def _scatter(trackers, rows, mean, covariance):
+    """Writes concatenated Kalman filter states back to the track tables of several trackers."""
+    i = 0
+    for t, r in zip(trackers, rows):
+        t.tracks.mean[r], t.tracks.covariance[r] = mean[i : i + len(r)], covariance[i : i + len(r)]
+        i += len(r)
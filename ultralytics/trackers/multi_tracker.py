@@ -0,0 +1,70 @@
+# Ultralytics YOLO 🚀, AGPL-3.0 license
+
+
+class MultiStreamTracker:
+    """
+    A class managing one tracker per video stream and updating all streams with batched tracker steps.
+
+    Instead of updating the tracker of each stream one after the other, all streams with detections are updated in
+    lockstep with `BYTETracker.multi_update()`, so the Kalman filter predict and update of all streams' tracks and their
+    IoU cost matrices are each computed in one batched pass. Track IDs, states and resets remain per stream.
+
+    Attributes:
+        trackers (list[BYTETracker]): Tracker of each stream.
+
+    Example:
+        ```python
+        from ultralytics.trackers.bot_sort import BOTSORT
+        from ultralytics.trackers.multi_tracker import MultiStreamTracker
+
+        tracker = MultiStreamTracker(BOTSORT, args, streams=16)
+        tracks = tracker.update([r.boxes.cpu().numpy() for r in results], [r.orig_img for r in results])
+        ```
+    """
+
+    def __init__(self, tracker, args, streams=1, frame_rate=30):
+        """
+        Initializes a tracker of type `tracker` for each of `streams` streams.
+
+        Args:
+            tracker (type): Tracker class, i.e. BYTETracker or BOTSORT.
+            args (namespace): Tracker arguments.
+            streams (int): Number of streams.
+            frame_rate (int): Frame rate of the streams.
+        """
+        self.trackers = [tracker(args=args, frame_rate=frame_rate) for _ in range(streams)]
+
+    def __len__(self):
+        """Returns the number of streams."""
+        return len(self.trackers)
+
+    def __getitem__(self, i):
+        """Returns the tracker of stream i."""
+        return self.trackers[i]
+
+    def update(self, results, imgs=None):
+        """
+        Updates the trackers of all streams with their new detections.
+
+        Args:
+            results (list): Detections of each stream as accepted by `BYTETracker.update()`, None to skip a stream.
+            imgs (list, optional): Image of each stream, used for global motion compensation.
+
+        Returns:
+            (list[np.ndarray | None]): Tracked objects of each stream, None for skipped streams.
+        """
+        imgs = [None] * len(results) if imgs is None else imgs
+        active = [i for i, r in enumerate(results) if r is not None]
+        tracks = [None] * len(results)
+        if active:
+            outputs = type(self.trackers[0]).multi_update(
+                [self.trackers[i] for i in active], [results[i] for i in active], [imgs[i] for i in active]
+            )
+            for i, x in zip(active, outputs):
+                tracks[i] = x
+        return tracks
+
+    def reset(self, i=None):
+        """Resets the tracker of stream i, or of all streams if i is None."""
+        for tracker in self.trackers if i is None else [self.trackers[i]]:
+            tracker.reset()
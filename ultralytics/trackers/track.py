@@ -9,6 +9,7 @@ from ultralytics.utils import IterableSimpleNamespace, yaml_load
 from ultralytics.utils.checks import check_yaml
 from .bot_sort import BOTSORT
 from .byte_tracker import BYTETracker
+from .multi_tracker import MultiStreamTracker
 
 # A mapping of tracker types to corresponding tracker classes
 TRACKER_MAP = {"bytetrack": BYTETracker, "botsort": BOTSORT}
@@ -34,13 +35,9 @@ def on_predict_start(predictor: object, persist: bool = False) -> None:
     if cfg.tracker_type not in {"bytetrack", "botsort"}:
         raise AssertionError(f"Only 'bytetrack' and 'botsort' are supported for now, but got '{cfg.tracker_type}'")
 
-    trackers = []
-    for _ in range(predictor.dataset.bs):
-        tracker = TRACKER_MAP[cfg.tracker_type](args=cfg, frame_rate=30)
-        trackers.append(tracker)
-        if predictor.dataset.mode != "stream":  # only need one tracker for other modes.
-            break
-    predictor.trackers = trackers
+    # One tracker per stream, other modes only need one tracker
+    streams = predictor.dataset.bs if predictor.dataset.mode == "stream" else 1
+    predictor.trackers = MultiStreamTracker(TRACKER_MAP[cfg.tracker_type], cfg, streams=streams, frame_rate=30)
     predictor.vid_path = [None] * predictor.dataset.bs  # for determining when to reset tracker on new video
 
 
@@ -56,24 +53,30 @@ def on_predict_postprocess_end(predictor: object, persist: bool = False) -> None
 
     is_obb = predictor.args.task == "obb"
     is_stream = predictor.dataset.mode == "stream"
+    dets, tracks = [None] * len(im0s), [None] * len(im0s)
     for i in range(len(im0s)):
-        tracker = predictor.trackers[i if is_stream else 0]
         vid_path = predictor.save_dir / Path(path[i]).name
         if not persist and predictor.vid_path[i if is_stream else 0] != vid_path:
-            tracker.reset()
+            predictor.trackers.reset(i if is_stream else 0)
             predictor.vid_path[i if is_stream else 0] = vid_path
 
         det = (predictor.results[i].obb if is_obb else predictor.results[i].boxes).cpu().numpy()
         if len(det) == 0:
             continue
-        tracks = tracker.update(det, im0s[i])
-        if len(tracks) == 0:
+        dets[i] = det
+        if not is_stream:  # images of a batch are consecutive frames of the only tracker
+            tracks[i] = predictor.trackers[0].update(det, im0s[i])
+    if is_stream:  # update the trackers of all streams at once
+        tracks = predictor.trackers.update(dets, im0s)
+
+    for i, t in enumerate(tracks):
+        if t is None or len(t) == 0:
             continue
-        idx = tracks[:, -1].astype(int)
+        idx = t[:, -1].astype(int)
         predictor.results[i] = predictor.results[i][idx]
 
         update_args = dict()
-        update_args["obb" if is_obb else "boxes"] = torch.as_tensor(tracks[:, :-1])
+        update_args["obb" if is_obb else "boxes"] = torch.as_tensor(t[:, :-1])
         predictor.results[i].update(**update_args)
 
 
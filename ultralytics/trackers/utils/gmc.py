@@ -6,6 +6,7 @@ import cv2
 import numpy as np
 
 from ultralytics.utils import LOGGER
+from ultralytics.utils.ops import Profile
 
 
 class GMC:
@@ -15,36 +16,50 @@ class GMC:
     This class provides methods for tracking and detecting objects based on several tracking algorithms including ORB,
     SIFT, ECC, and Sparse Optical Flow. It also supports downscaling of frames for computational efficiency.
 
+    The 'sparseOptFlowReuse' method keeps the previous preprocessed frame and tracks the surviving keypoints forward
+    instead of re-detecting them every frame. With interval > 1 motion is only estimated every interval frames, the
+    frames in between are warped by the last estimated per-frame motion and the keyframe corrects the accumulated error.
+
     Attributes:
-        method (str): The method used for tracking. Options include 'orb', 'sift', 'ecc', 'sparseOptFlow', 'none'.
+        method (str): The method used for tracking. Options include 'orb', 'sift', 'ecc', 'sparseOptFlow',
+            'sparseOptFlowReuse', 'none'.
         downscale (int): Factor by which to downscale the frames for processing.
+        interval (int): Estimate motion every interval frames and interpolate in between.
         prevFrame (np.ndarray): Stores the previous frame for tracking.
         prevKeyPoints (list): Stores the keypoints from the previous frame.
         prevDescriptors (np.ndarray): Stores the descriptors from the previous frame.
         initializedFirstFrame (bool): Flag to indicate if the first frame has been processed.
+        dt (Profile): Accumulated time spent in apply(), dt.dt holds the time of the last call.
+        calls (int): Number of apply() calls.
+        estimates (int): Number of apply() calls that estimated motion, the others were interpolated.
 
     Methods:
-        __init__(self, method='sparseOptFlow', downscale=2): Initializes a GMC object with the specified method
-                                                              and downscale factor.
+        __init__(self, method='sparseOptFlow', downscale=2, interval=1): Initializes a GMC object with the specified
+                                                                          method, downscale factor and interval.
         apply(self, raw_frame, detections=None): Applies the chosen method to a raw frame and optionally uses
                                                  provided detections.
         applyEcc(self, raw_frame, detections=None): Applies the ECC algorithm to a raw frame.
         applyFeatures(self, raw_frame, detections=None): Applies feature-based methods like ORB or SIFT to a raw frame.
         applySparseOptFlow(self, raw_frame, detections=None): Applies the Sparse Optical Flow method to a raw frame.
+        applySparseOptFlowReuse(self, raw_frame): Applies Sparse Optical Flow reusing the previous frame's keypoints.
+        timing(self): Returns the per-call timing statistics.
     """
 
-    def __init__(self, method: str = "sparseOptFlow", downscale: int = 2) -> None:
+    def __init__(self, method: str = "sparseOptFlow", downscale: int = 2, interval: int = 1) -> None:
         """
         Initialize a video tracker with specified parameters.
 
         Args:
-            method (str): The method used for tracking. Options include 'orb', 'sift', 'ecc', 'sparseOptFlow', 'none'.
+            method (str): The method used for tracking. Options include 'orb', 'sift', 'ecc', 'sparseOptFlow',
+                'sparseOptFlowReuse', 'none'.
             downscale (int): Downscale factor for processing frames.
+            interval (int): Estimate motion every interval frames and interpolate the frames in between.
         """
         super().__init__()
 
         self.method = method
         self.downscale = max(1, int(downscale))
+        self.interval = max(1, int(interval))
 
         if self.method == "orb":
             self.detector = cv2.FastFeatureDetector_create(20)
@@ -62,20 +77,19 @@ class GMC:
             self.warp_mode = cv2.MOTION_EUCLIDEAN
             self.criteria = (cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, number_of_iterations, termination_eps)
 
-        elif self.method == "sparseOptFlow":
+        elif self.method in {"sparseOptFlow", "sparseOptFlowReuse"}:
             self.feature_params = dict(
                 maxCorners=1000, qualityLevel=0.01, minDistance=1, blockSize=3, useHarrisDetector=False, k=0.04
             )
+            self.lk_params = dict(winSize=(21, 21), maxLevel=3)  # cv2.calcOpticalFlowPyrLK() defaults
+            self.redetect_ratio = 0.5  # re-detect keypoints once fewer than this fraction of them survive
 
         elif self.method in {"none", "None", None}:
             self.method = None
         else:
             raise ValueError(f"Error: Unknown GMC method:{method}")
 
-        self.prevFrame = None
-        self.prevKeyPoints = None
-        self.prevDescriptors = None
-        self.initializedFirstFrame = False
+        self.reset_params()
 
     def apply(self, raw_frame: np.array, detections: list = None) -> np.array:
         """
@@ -94,6 +108,25 @@ class GMC:
             array([[1, 2, 3],
                    [4, 5, 6]])
         """
+        with self.dt:
+            if self.method is None:
+                H = np.eye(2, 3)
+            elif self.calls % self.interval:
+                H = self.step[:2].copy()  # interpolate with the last estimated per-frame motion
+                self.applied = self.step @ self.applied
+            else:
+                H = self._estimate(raw_frame, detections)
+                if self.interval > 1:
+                    M = np.vstack((H, (0, 0, 1)))  # motion since the previous keyframe
+                    H = (M @ np.linalg.inv(self.applied))[:2]  # correct for the interpolated motion applied so far
+                    self.step = self._root(M, self.interval)
+                    self.applied = np.eye(3)
+                self.estimates += 1
+        self.calls += 1
+        return H
+
+    def _estimate(self, raw_frame: np.array, detections: list = None) -> np.array:
+        """Estimates the motion from the previous estimated frame to raw_frame with the chosen method."""
         if self.method in {"orb", "sift"}:
             return self.applyFeatures(raw_frame, detections)
         elif self.method == "ecc":
@@ -101,7 +134,42 @@ class GMC:
         elif self.method == "sparseOptFlow":
             return self.applySparseOptFlow(raw_frame)
         else:
-            return np.eye(2, 3)
+            return self.applySparseOptFlowReuse(raw_frame)
+
+    @staticmethod
+    def _root(M: np.array, n: int) -> np.array:
+        """
+        Splits a similarity transform into n equal steps, i.e. returns S with S^n = M.
+
+        Args:
+            M (np.ndarray): 3x3 similarity transform (rotation, uniform scale and translation).
+            n (int): Number of steps.
+
+        Returns:
+            (np.ndarray): 3x3 per-step similarity transform.
+        """
+        a, b = M[0, 0], M[1, 0]
+        scale, angle = np.hypot(a, b) ** (1 / n), np.arctan2(b, a) / n
+        c, s = scale * np.cos(angle), scale * np.sin(angle)
+        A = np.array([[c, -s], [s, c]])
+        powers = np.eye(2)  # translation t satisfies (I + A + ... + A^(n-1)) @ t = M[:2, 2]
+        total = np.eye(2)
+        for _ in range(n - 1):
+            powers = A @ powers
+            total += powers
+        S = np.eye(3)
+        S[:2, :2] = A
+        S[:2, 2] = np.linalg.solve(total, M[:2, 2])
+        return S
+
+    def timing(self) -> dict:
+        """Returns the number of calls and estimates and the mean time per call in milliseconds."""
+        return {
+            "calls": self.calls,
+            "estimates": self.estimates,
+            "ms_per_call": self.dt.t * 1e3 / max(self.calls, 1),
+            "last_ms": getattr(self.dt, "dt", 0.0) * 1e3,
+        }
 
     def applyEcc(self, raw_frame: np.array) -> np.array:
         """
@@ -329,16 +397,9 @@ class GMC:
         matchedKeypoints, status, _ = cv2.calcOpticalFlowPyrLK(self.prevFrame, frame, self.prevKeyPoints, None)
 
         # Leave good correspondences only
-        prevPoints = []
-        currPoints = []
-
-        for i in range(len(status)):
-            if status[i]:
-                prevPoints.append(self.prevKeyPoints[i])
-                currPoints.append(matchedKeypoints[i])
-
-        prevPoints = np.array(prevPoints)
-        currPoints = np.array(currPoints)
+        good = status.ravel().astype(bool)
+        prevPoints = self.prevKeyPoints[good]
+        currPoints = matchedKeypoints[good]
 
         # Find rigid matrix
         if (prevPoints.shape[0] > 4) and (prevPoints.shape[0] == prevPoints.shape[0]):
@@ -355,9 +416,74 @@ class GMC:
 
         return H
 
+    def applySparseOptFlowReuse(self, raw_frame: np.array) -> np.array:
+        """
+        Apply Sparse Optical Flow to a raw frame, reusing the previous frame and its tracked keypoints.
+
+        The keypoints tracked into this frame (and kept as RANSAC inliers) are the keypoints of the next call, so corner
+        detection only runs on the first frame and when fewer than redetect_ratio of the detected keypoints survive.
+
+        Args:
+            raw_frame (np.ndarray): The raw frame to be processed.
+
+        Returns:
+            (np.ndarray): Processed frame.
+
+        Examples:
+            >>> gmc = GMC(method='sparseOptFlowReuse')
+            >>> gmc.applySparseOptFlowReuse(np.zeros((64, 64, 3), dtype=np.uint8))
+            array([[1., 0., 0.],
+                   [0., 1., 0.]])
+        """
+        height, width, _ = raw_frame.shape
+        frame = cv2.cvtColor(raw_frame, cv2.COLOR_BGR2GRAY)
+        H = np.eye(2, 3)
+
+        # Downscale image
+        if self.downscale > 1.0:
+            frame = cv2.resize(frame, (width // self.downscale, height // self.downscale))
+
+        keypoints = None
+        if self.prevFrame is not None and self.prevKeyPoints is not None:
+            # Track the previous keypoints into this frame
+            matchedKeypoints, status, _ = cv2.calcOpticalFlowPyrLK(
+                self.prevFrame, frame, self.prevKeyPoints, None, **self.lk_params
+            )
+            good = status.ravel().astype(bool)
+            prevPoints, keypoints = self.prevKeyPoints[good], matchedKeypoints[good]
+
+            # Find rigid matrix
+            if prevPoints.shape[0] > 4:
+                M, inliers = cv2.estimateAffinePartial2D(prevPoints, keypoints, cv2.RANSAC)
+                if M is not None:
+                    H = M
+                    keypoints = keypoints[inliers.ravel().astype(bool)]  # drop points on moving objects
+                    if self.downscale > 1.0:
+                        H[0, 2] *= self.downscale
+                        H[1, 2] *= self.downscale
+            else:
+                LOGGER.warning("WARNING: not enough matching points")
+
+        # Re-detect the keypoints on the first frame and once too few of them survive
+        if keypoints is None or len(keypoints) < self.redetect_ratio * self.numDetected:
+            keypoints = cv2.goodFeaturesToTrack(frame, mask=None, **self.feature_params)
+            self.numDetected = 0 if keypoints is None else len(keypoints)
+
+        self.prevFrame = frame
+        self.prevKeyPoints = keypoints
+        self.initializedFirstFrame = True
+
+        return H
+
     def reset_params(self) -> None:
         """Reset parameters."""
         self.prevFrame = None
         self.prevKeyPoints = None
         self.prevDescriptors = None
+        self.numDetected = 0
         self.initializedFirstFrame = False
+        self.dt = Profile()
+        self.calls = 0
+        self.estimates = 0
+        self.step = np.eye(3)  # last estimated per-frame motion
+        self.applied = np.eye(3)  # interpolated motion applied since the last keyframe
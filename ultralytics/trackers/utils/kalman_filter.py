@@ -59,6 +59,32 @@ class KalmanFilterXYAH:
         covariance = np.diag(np.square(std))
         return mean, covariance
 
+    def multi_initiate(self, measurement: np.ndarray) -> tuple:
+        """
+        Create tracks from unassociated measurements (Vectorized version).
+
+        Args:
+            measurement (ndarray): The Nx4 dimensional matrix of bounding boxes (x, y, a, h).
+
+        Returns:
+            (tuple[ndarray, ndarray]): Returns the Nx8 mean matrix and Nx8x8 covariance matrix of the new tracks.
+        """
+        h = measurement[:, 3]
+        mean = np.concatenate((measurement, np.zeros_like(measurement)), 1).astype(float)
+        std = [
+            2 * self._std_weight_position * h,
+            2 * self._std_weight_position * h,
+            1e-2 * np.ones_like(h),
+            2 * self._std_weight_position * h,
+            10 * self._std_weight_velocity * h,
+            10 * self._std_weight_velocity * h,
+            1e-5 * np.ones_like(h),
+            10 * self._std_weight_velocity * h,
+        ]
+        covariance = np.zeros((len(mean), 8, 8))
+        covariance[:, range(8), range(8)] = np.square(np.stack(std, 1))
+        return mean, covariance
+
     def predict(self, mean: np.ndarray, covariance: np.ndarray) -> tuple:
         """
         Run Kalman filter prediction step.
@@ -113,6 +139,27 @@ class KalmanFilterXYAH:
         covariance = np.linalg.multi_dot((self._update_mat, covariance, self._update_mat.T))
         return mean, covariance + innovation_cov
 
+    def multi_project(self, mean: np.ndarray, covariance: np.ndarray) -> tuple:
+        """
+        Project state distributions to measurement space (Vectorized version).
+
+        Args:
+            mean (ndarray): The Nx8 dimensional mean matrix of the states.
+            covariance (ndarray): The Nx8x8 covariance matrix of the states.
+
+        Returns:
+            (tuple[ndarray, ndarray]): Returns the Nx4 projected mean and Nx4x4 projected covariance matrices.
+        """
+        std = [
+            self._std_weight_position * mean[:, 3],
+            self._std_weight_position * mean[:, 3],
+            1e-1 * np.ones_like(mean[:, 3]),
+            self._std_weight_position * mean[:, 3],
+        ]
+        covariance = self._update_mat @ covariance @ self._update_mat.T
+        covariance[:, range(4), range(4)] += np.square(np.stack(std, 1))
+        return mean @ self._update_mat.T, covariance
+
     def multi_predict(self, mean: np.ndarray, covariance: np.ndarray) -> tuple:
         """
         Run Kalman filter prediction step (Vectorized version).
@@ -139,12 +186,11 @@ class KalmanFilterXYAH:
         ]
         sqr = np.square(np.r_[std_pos, std_vel]).T
 
-        motion_cov = [np.diag(sqr[i]) for i in range(len(mean))]
-        motion_cov = np.asarray(motion_cov)
+        motion_cov = np.zeros((len(mean), 8, 8))
+        motion_cov[:, range(8), range(8)] = sqr
 
         mean = np.dot(mean, self._motion_mat.T)
-        left = np.dot(self._motion_mat, covariance).transpose((1, 0, 2))
-        covariance = np.dot(left, self._motion_mat.T) + motion_cov
+        covariance = self._motion_mat @ covariance @ self._motion_mat.T + motion_cov  # batched matmul
 
         return mean, covariance
 
@@ -173,6 +219,27 @@ class KalmanFilterXYAH:
         new_covariance = covariance - np.linalg.multi_dot((kalman_gain, projected_cov, kalman_gain.T))
         return new_mean, new_covariance
 
+    def multi_update(self, mean: np.ndarray, covariance: np.ndarray, measurement: np.ndarray) -> tuple:
+        """
+        Run Kalman filter correction step (Vectorized version).
+
+        Args:
+            mean (ndarray): The Nx8 dimensional mean matrix of the predicted states.
+            covariance (ndarray): The Nx8x8 covariance matrix of the predicted states.
+            measurement (ndarray): The Nx4 dimensional matrix of measurements in the format of `project()`.
+
+        Returns:
+            (tuple[ndarray, ndarray]): Returns the measurement-corrected state distributions.
+        """
+        projected_mean, projected_cov = self.multi_project(mean, covariance)
+        kalman_gain = np.linalg.solve(projected_cov, self._update_mat @ covariance.transpose(0, 2, 1))
+        kalman_gain = kalman_gain.transpose(0, 2, 1)  # (N, 8, 4)
+        innovation = measurement - projected_mean
+
+        new_mean = mean + (kalman_gain @ innovation[..., None])[..., 0]
+        new_covariance = covariance - kalman_gain @ projected_cov @ kalman_gain.transpose(0, 2, 1)
+        return new_mean, new_covariance
+
     def gating_distance(
         self,
         mean: np.ndarray,
@@ -255,6 +322,32 @@ class KalmanFilterXYWH(KalmanFilterXYAH):
         covariance = np.diag(np.square(std))
         return mean, covariance
 
+    def multi_initiate(self, measurement: np.ndarray) -> tuple:
+        """
+        Create tracks from unassociated measurements (Vectorized version).
+
+        Args:
+            measurement (ndarray): The Nx4 dimensional matrix of bounding boxes (x, y, w, h).
+
+        Returns:
+            (tuple[ndarray, ndarray]): Returns the Nx8 mean matrix and Nx8x8 covariance matrix of the new tracks.
+        """
+        w, h = measurement[:, 2], measurement[:, 3]
+        mean = np.concatenate((measurement, np.zeros_like(measurement)), 1).astype(float)
+        std = [
+            2 * self._std_weight_position * w,
+            2 * self._std_weight_position * h,
+            2 * self._std_weight_position * w,
+            2 * self._std_weight_position * h,
+            10 * self._std_weight_velocity * w,
+            10 * self._std_weight_velocity * h,
+            10 * self._std_weight_velocity * w,
+            10 * self._std_weight_velocity * h,
+        ]
+        covariance = np.zeros((len(mean), 8, 8))
+        covariance[:, range(8), range(8)] = np.square(np.stack(std, 1))
+        return mean, covariance
+
     def predict(self, mean, covariance) -> tuple:
         """
         Run Kalman filter prediction step.
@@ -309,6 +402,27 @@ class KalmanFilterXYWH(KalmanFilterXYAH):
         covariance = np.linalg.multi_dot((self._update_mat, covariance, self._update_mat.T))
         return mean, covariance + innovation_cov
 
+    def multi_project(self, mean, covariance) -> tuple:
+        """
+        Project state distributions to measurement space (Vectorized version).
+
+        Args:
+            mean (ndarray): The Nx8 dimensional mean matrix of the states.
+            covariance (ndarray): The Nx8x8 covariance matrix of the states.
+
+        Returns:
+            (tuple[ndarray, ndarray]): Returns the Nx4 projected mean and Nx4x4 projected covariance matrices.
+        """
+        std = [
+            self._std_weight_position * mean[:, 2],
+            self._std_weight_position * mean[:, 3],
+            self._std_weight_position * mean[:, 2],
+            self._std_weight_position * mean[:, 3],
+        ]
+        covariance = self._update_mat @ covariance @ self._update_mat.T
+        covariance[:, range(4), range(4)] += np.square(np.stack(std, 1))
+        return mean @ self._update_mat.T, covariance
+
     def multi_predict(self, mean, covariance) -> tuple:
         """
         Run Kalman filter prediction step (Vectorized version).
@@ -335,12 +449,11 @@ class KalmanFilterXYWH(KalmanFilterXYAH):
         ]
         sqr = np.square(np.r_[std_pos, std_vel]).T
 
-        motion_cov = [np.diag(sqr[i]) for i in range(len(mean))]
-        motion_cov = np.asarray(motion_cov)
+        motion_cov = np.zeros((len(mean), 8, 8))
+        motion_cov[:, range(8), range(8)] = sqr
 
         mean = np.dot(mean, self._motion_mat.T)
-        left = np.dot(self._motion_mat, covariance).transpose((1, 0, 2))
-        covariance = np.dot(left, self._motion_mat.T) + motion_cov
+        covariance = self._motion_mat @ covariance @ self._motion_mat.T + motion_cov  # batched matmul
 
         return mean, covariance
 
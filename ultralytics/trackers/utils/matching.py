@@ -63,14 +63,14 @@ def iou_distance(atracks: list, btracks: list) -> np.ndarray:
     Compute cost based on Intersection over Union (IoU) between tracks.
 
     Args:
-        atracks (list[STrack] | list[np.ndarray]): List of tracks 'a' or bounding boxes.
-        btracks (list[STrack] | list[np.ndarray]): List of tracks 'b' or bounding boxes.
+        atracks (list[STrack] | list[np.ndarray] | np.ndarray): List of tracks 'a' or bounding boxes.
+        btracks (list[STrack] | list[np.ndarray] | np.ndarray): List of tracks 'b' or bounding boxes.
 
     Returns:
         (np.ndarray): Cost matrix computed based on IoU.
     """
 
-    if atracks and isinstance(atracks[0], np.ndarray) or btracks and isinstance(btracks[0], np.ndarray):
+    if len(atracks) and isinstance(atracks[0], np.ndarray) or len(btracks) and isinstance(btracks[0], np.ndarray):
         atlbrs = atracks
         btlbrs = btracks
     else:
@@ -93,6 +93,42 @@ def iou_distance(atracks: list, btracks: list) -> np.ndarray:
     return 1 - ious  # cost matrix
 
 
+def batch_iou_distance(pairs: list, max_size: int = 10000) -> list:
+    """
+    Compute the IoU cost matrices of several pairs of box arrays in one vectorized pass.
+
+    Axis-aligned boxes of all pairs are zero-padded into (S, N, 4) and (S, M, 4) arrays and intersected at once, which
+    avoids S small NumPy calls when matching the tracks of many video streams. Oriented boxes and pairs larger than
+    `max_size` elements, where per-call overhead no longer matters, are matched pair by pair.
+
+    Args:
+        pairs (list[tuple[np.ndarray, np.ndarray]]): Pairs of box arrays (atlbrs, btlbrs), in xyxy or xywha format.
+        max_size (int, optional): Largest padded cost matrix size computed batched. Defaults to 10000.
+
+    Returns:
+        (list[np.ndarray]): Cost matrix of each pair, as computed by `iou_distance()`.
+    """
+
+    na, nb = [len(a) for a, _ in pairs], [len(b) for _, b in pairs]
+    obb = any(len(a) and a.shape[1] == 5 or len(b) and b.shape[1] == 5 for a, b in pairs)
+    if len(pairs) == 1 or obb or max(na) * max(nb) > max_size:
+        return [iou_distance(a, b) for a, b in pairs]
+    box1 = np.zeros((len(pairs), max(na), 4), dtype=np.float32)
+    box2 = np.zeros((len(pairs), max(nb), 4), dtype=np.float32)
+    for i, (a, b) in enumerate(pairs):
+        box1[i, : na[i]], box2[i, : nb[i]] = a[:, :4], b[:, :4]
+
+    # bbox_ioa(box1, box2, iou=True) over the leading stream dimension
+    b1_x1, b1_y1, b1_x2, b1_y2 = box1[..., None].transpose(2, 0, 1, 3)  # (S, N, 1)
+    b2_x1, b2_y1, b2_x2, b2_y2 = box2[:, None].transpose(3, 0, 1, 2)  # (S, 1, M)
+    inter_area = (np.minimum(b1_x2, b2_x2) - np.maximum(b1_x1, b2_x1)).clip(0) * (
+        np.minimum(b1_y2, b2_y2) - np.maximum(b1_y1, b2_y1)
+    ).clip(0)
+    area = (b2_x2 - b2_x1) * (b2_y2 - b2_y1) + (b1_x2 - b1_x1) * (b1_y2 - b1_y1) - inter_area
+    ious = inter_area / (area + 1e-7)
+    return [1 - ious[i, : na[i], : nb[i]] for i in range(len(pairs))]
+
+
 def embedding_distance(tracks: list, detections: list, metric: str = "cosine") -> np.ndarray:
     """
     Compute distance between tracks and detections based on embeddings.
@@ -123,7 +159,7 @@ def fuse_score(cost_matrix: np.ndarray, detections: list) -> np.ndarray:
 
     Args:
         cost_matrix (np.ndarray): The matrix containing cost values for assignments.
-        detections (list[BaseTrack]): List of detections with scores.
+        detections (list[BaseTrack] | np.ndarray): List of detections with scores, or their scores.
 
     Returns:
         (np.ndarray): Fused similarity matrix.
@@ -132,7 +168,6 @@ def fuse_score(cost_matrix: np.ndarray, detections: list) -> np.ndarray:
     if cost_matrix.size == 0:
         return cost_matrix
     iou_sim = 1 - cost_matrix
-    det_scores = np.array([det.score for det in detections])
-    det_scores = np.expand_dims(det_scores, axis=0).repeat(cost_matrix.shape[0], axis=0)
-    fuse_sim = iou_sim * det_scores
+    det_scores = detections if isinstance(detections, np.ndarray) else np.array([det.score for det in detections])
+    fuse_sim = iou_sim * det_scores[None]
     return 1 - fuse_sim  # fuse_cost
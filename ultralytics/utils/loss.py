@@ -184,25 +184,31 @@ class v8DetectionLoss:
 
         self.use_dfl = m.reg_max > 1
 
-        self.assigner = TaskAlignedAssigner(topk=10, num_classes=self.nc, alpha=0.5, beta=6.0)
+        self.assigner = TaskAlignedAssigner(
+            topk=10, num_classes=self.nc, alpha=0.5, beta=6.0, chunk=getattr(h, "tal_chunk", 0)
+        )
         self.bbox_loss = BboxLoss(m.reg_max - 1, use_dfl=self.use_dfl).to(device)
         self.proj = torch.arange(m.reg_max, dtype=torch.float, device=device)
 
+    def pad_targets(self, targets, batch_size):
+        """
+        Pads (image index, ...) target rows to a (batch_size, max targets per image, ...) tensor with a single scatter.
+
+        Targets are sorted stably by image index, so the targets of each image keep their order.
+        """
+        if targets.shape[0] == 0:
+            return torch.zeros(batch_size, 0, targets.shape[1] - 1, device=self.device)
+        i, order = targets[:, 0].long().sort(stable=True)  # image index
+        counts = torch.bincount(i, minlength=batch_size)
+        j = torch.arange(len(i), device=i.device) - (counts.cumsum(0) - counts)[i]  # position within its image
+        out = torch.zeros(batch_size, counts.max(), targets.shape[1] - 1, device=self.device)
+        out[i, j] = targets[order, 1:]
+        return out
+
     def preprocess(self, targets, batch_size, scale_tensor):
         """Preprocesses the target counts and matches with the input batch size to output a tensor."""
-        if targets.shape[0] == 0:
-            out = torch.zeros(batch_size, 0, 5, device=self.device)
-        else:
-            i = targets[:, 0]  # image index
-            _, counts = i.unique(return_counts=True)
-            counts = counts.to(dtype=torch.int32)
-            out = torch.zeros(batch_size, counts.max(), 5, device=self.device)
-            for j in range(batch_size):
-                matches = i == j
-                n = matches.sum()
-                if n:
-                    out[j, :n] = targets[matches, 1:]
-            out[..., 1:5] = xywh2xyxy(out[..., 1:5].mul_(scale_tensor))
+        out = self.pad_targets(targets, batch_size)
+        out[..., 1:5] = xywh2xyxy(out[..., 1:5].mul_(scale_tensor))
         return out
 
     def bbox_decode(self, anchor_points, pred_dist):
@@ -625,25 +631,15 @@ class v8OBBLoss(v8DetectionLoss):
         Note model must be de-paralleled.
         """
         super().__init__(model)
-        self.assigner = RotatedTaskAlignedAssigner(topk=10, num_classes=self.nc, alpha=0.5, beta=6.0)
+        self.assigner = RotatedTaskAlignedAssigner(
+            topk=10, num_classes=self.nc, alpha=0.5, beta=6.0, chunk=getattr(self.hyp, "tal_chunk", 0)
+        )
         self.bbox_loss = RotatedBboxLoss(self.reg_max - 1, use_dfl=self.use_dfl).to(self.device)
 
     def preprocess(self, targets, batch_size, scale_tensor):
         """Preprocesses the target counts and matches with the input batch size to output a tensor."""
-        if targets.shape[0] == 0:
-            out = torch.zeros(batch_size, 0, 6, device=self.device)
-        else:
-            i = targets[:, 0]  # image index
-            _, counts = i.unique(return_counts=True)
-            counts = counts.to(dtype=torch.int32)
-            out = torch.zeros(batch_size, counts.max(), 6, device=self.device)
-            for j in range(batch_size):
-                matches = i == j
-                n = matches.sum()
-                if n:
-                    bboxes = targets[matches, 2:]
-                    bboxes[..., :4].mul_(scale_tensor)
-                    out[j, :n] = torch.cat([targets[matches, 1:2], bboxes], dim=-1)
+        out = self.pad_targets(targets, batch_size)
+        out[..., 1:5].mul_(scale_tensor)
         return out
 
     def __call__(self, preds, batch):
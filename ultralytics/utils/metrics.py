@@ -776,6 +776,70 @@ def compute_ap(recall, precision):
     return ap, mpre, mrec
 
 
+class APHistogram:
+    """
+    Streaming accumulator of the statistics needed by ap_per_class() as fixed-width confidence histograms.
+
+    Instead of keeping every prediction until the end of validation, the number of predictions and true positives per
+    IoU threshold are counted in `bins` confidence bins per class. Memory is constant in the number of images,
+    histograms from several processes can be merged by adding their counts, and the P/R curves are computed in
+    O(bins) per class. Predictions within one bin share the bin's lower confidence edge, so AP is approximate, with an
+    error that shrinks as the number of bins grows.
+
+    Attributes:
+        bins (int): Number of confidence bins in [0, 1].
+        n (torch.Tensor): Number of predictions per class and bin, shape (nc, bins).
+        tp (torch.Tensor): Number of true positives per class, bin and IoU threshold, shape (nc, bins, niou).
+        nt (torch.Tensor): Number of targets per class, shape (nc, ).
+
+    Example:
+        ```python
+        hist = APHistogram(nc=80, niou=10, bins=1000)
+        hist.update(tp, conf, pred_cls, target_cls)  # once per image or batch
+        tp, fp, p, r, f1, ap, unique_classes, *_ = ap_per_class(hist, None, None, None)
+        ```
+    """
+
+    def __init__(self, nc, niou=10, bins=1000, device="cpu"):
+        """Initializes empty histograms for nc classes, niou IoU thresholds and bins confidence bins."""
+        self.bins = bins
+        self.n = torch.zeros(nc, bins, dtype=torch.long, device=device)
+        self.tp = torch.zeros(nc, bins, niou, dtype=torch.long, device=device)
+        self.nt = torch.zeros(nc, dtype=torch.long, device=device)
+
+    def update(self, tp, conf, pred_cls, target_cls):
+        """Adds the predictions (tp, conf, pred_cls) and targets (target_cls) of an image or batch to the histograms."""
+        b = (conf * self.bins).long().clamp_(0, self.bins - 1) + pred_cls.long() * self.bins  # flat class-bin index
+        self.n.view(-1).index_add_(0, b, torch.ones_like(b))
+        self.tp.view(-1, self.tp.shape[-1]).index_add_(0, b, tp.long())
+        self.nt.index_add_(0, target_cls.long(), torch.ones_like(target_cls, dtype=torch.long))
+
+    def merge(self, other):
+        """Adds the counts of another APHistogram, i.e. from another DDP rank, and returns self."""
+        self.n += other.n.to(self.n.device)
+        self.tp += other.tp.to(self.tp.device)
+        self.nt += other.nt.to(self.nt.device)
+        return self
+
+    def any(self):
+        """Returns True if any prediction is a true positive."""
+        return bool(self.tp.any())
+
+    def classes(self):
+        """Returns the classes that have targets and their number of targets, like np.unique(target_cls)."""
+        nt = self.nt.cpu().numpy()
+        unique_classes = np.nonzero(nt)[0]
+        return unique_classes, nt[unique_classes]
+
+    def curve(self, c):
+        """Returns confidence, cumulative true and false positives of class c in descending confidence, per bin."""
+        n, tp = self.n[c].flip(0).cpu().numpy(), self.tp[c].flip(0).cpu().numpy()
+        i = n > 0  # non-empty bins
+        tpc = tp.cumsum(0)[i]
+        fpc = n.cumsum(0)[i, None] - tpc
+        return np.arange(self.bins - 1, -1, -1)[i] / self.bins, tpc, fpc
+
+
 def ap_per_class(
     tp, conf, pred_cls, target_cls, plot=False, on_plot=None, save_dir=Path(), names=(), eps=1e-16, prefix=""
 ):
@@ -783,7 +847,8 @@ def ap_per_class(
     Computes the average precision per class for object detection evaluation.
 
     Args:
-        tp (np.ndarray): Binary array indicating whether the detection is correct (True) or not (False).
+        tp (np.ndarray | APHistogram): Binary array indicating whether the detection is correct (True) or not (False),
+            or an APHistogram of the streamed statistics, in which case conf, pred_cls and target_cls are ignored.
         conf (np.ndarray): Array of confidence scores of the detections.
         pred_cls (np.ndarray): Array of predicted classes of the detections.
         target_cls (np.ndarray): Array of true classes of the detections.
@@ -810,40 +875,49 @@ def ap_per_class(
             prec_values: Precision values at mAP@0.5 for each class. Shape: (nc, 1000).
     """
 
-    # Sort by objectness
-    i = np.argsort(-conf)
-    tp, conf, pred_cls = tp[i], conf[i], pred_cls[i]
+    hist = tp if isinstance(tp, APHistogram) else None
+    if hist is None:
+        # Sort by objectness
+        i = np.argsort(-conf)
+        tp, conf, pred_cls = tp[i], conf[i], pred_cls[i]
 
-    # Find unique classes
-    unique_classes, nt = np.unique(target_cls, return_counts=True)
+        # Find unique classes
+        unique_classes, nt = np.unique(target_cls, return_counts=True)
+    else:
+        unique_classes, nt = hist.classes()
     nc = unique_classes.shape[0]  # number of classes, number of detections
 
     # Create Precision-Recall curve and compute AP for each class
     x, prec_values = np.linspace(0, 1, 1000), []
 
     # Average precision, precision and recall curves
-    ap, p_curve, r_curve = np.zeros((nc, tp.shape[1])), np.zeros((nc, 1000)), np.zeros((nc, 1000))
+    niou = hist.tp.shape[-1] if hist else tp.shape[1]  # number of IoU thresholds
+    ap, p_curve, r_curve = np.zeros((nc, niou)), np.zeros((nc, 1000)), np.zeros((nc, 1000))
     for ci, c in enumerate(unique_classes):
-        i = pred_cls == c
         n_l = nt[ci]  # number of labels
-        n_p = i.sum()  # number of predictions
+        if hist is None:
+            i = pred_cls == c
+            conf_c = conf[i]
+
+            # Accumulate FPs and TPs
+            fpc = (1 - tp[i]).cumsum(0)
+            tpc = tp[i].cumsum(0)
+        else:
+            conf_c, tpc, fpc = hist.curve(c)  # one point per non-empty confidence bin
+        n_p = conf_c.shape[0]  # number of predictions
         if n_p == 0 or n_l == 0:
             continue
 
-        # Accumulate FPs and TPs
-        fpc = (1 - tp[i]).cumsum(0)
-        tpc = tp[i].cumsum(0)
-
         # Recall
         recall = tpc / (n_l + eps)  # recall curve
-        r_curve[ci] = np.interp(-x, -conf[i], recall[:, 0], left=0)  # negative x, xp because xp decreases
+        r_curve[ci] = np.interp(-x, -conf_c, recall[:, 0], left=0)  # negative x, xp because xp decreases
 
         # Precision
         precision = tpc / (tpc + fpc)  # precision curve
-        p_curve[ci] = np.interp(-x, -conf[i], precision[:, 0], left=1)  # p at pr_score
+        p_curve[ci] = np.interp(-x, -conf_c, precision[:, 0], left=1)  # p at pr_score
 
         # AP from recall-precision curve
-        for j in range(tp.shape[1]):
+        for j in range(ap.shape[1]):
             ap[ci, j], mpre, mrec = compute_ap(recall[:, j], precision[:, j])
             if plot and j == 0:
                 prec_values.append(np.interp(x, mrec, mpre))  # precision at mAP@0.5
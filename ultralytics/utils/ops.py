@@ -180,6 +180,7 @@ def non_max_suppression(
     max_wh=7680,
     in_place=True,
     rotated=False,
+    batched=False,
 ):
     """
     Perform non-maximum suppression (NMS) on a set of boxes, with support for masks and multiple labels per box.
@@ -205,6 +206,9 @@ def non_max_suppression(
         max_nms (int): The maximum number of boxes into torchvision.ops.nms().
         max_wh (int): The maximum box width and height in pixels.
         in_place (bool): If True, the input prediction tensor will be modified in place.
+        rotated (bool): If True, the prediction boxes are rotated boxes in xywhr format.
+        batched (bool): If True, filter and suppress the whole batch in one vectorized pass instead of looping over
+            images. Falls back to the per-image loop for rotated boxes and apriori labels.
 
     Returns:
         (List[torch.Tensor]): A list of length batch_size, where each element is a tensor of
@@ -229,6 +233,11 @@ def non_max_suppression(
     time_limit = 2.0 + max_time_img * bs  # seconds to quit after
     multi_label &= nc > 1  # multiple labels per box (adds 0.5ms/img)
 
+    if batched and not rotated and not labels:
+        return _batched_non_max_suppression(
+            prediction, xc, conf_thres, iou_thres, classes, agnostic, multi_label, max_det, nc, max_nms, max_wh
+        )
+
     prediction = prediction.transpose(-1, -2)  # shape(1,84,6300) to shape(1,6300,84)
     if not rotated:
         if in_place:
@@ -236,6 +245,8 @@ def non_max_suppression(
         else:
             prediction = torch.cat((xywh2xyxy(prediction[..., :4]), prediction[..., 4:]), dim=-1)  # xywh to xyxy
 
+    if classes is not None:
+        classes = torch.tensor(classes, device=prediction.device)
     t = time.time()
     output = [torch.zeros((0, 6 + nm), device=prediction.device)] * bs
     for xi, x in enumerate(prediction):  # image index, image inference
@@ -267,7 +278,7 @@ def non_max_suppression(
 
         # Filter by class
         if classes is not None:
-            x = x[(x[:, 5:6] == torch.tensor(classes, device=x.device)).any(1)]
+            x = x[(x[:, 5:6] == classes).any(1)]
 
         # Check shape
         n = x.shape[0]  # number of boxes
@@ -308,6 +319,81 @@ def non_max_suppression(
     return output
 
 
+def _batched_non_max_suppression(
+    prediction, xc, conf_thres, iou_thres, classes, agnostic, multi_label, max_det, nc, max_nms, max_wh
+):
+    """
+    Vectorized NMS over a whole batch, used by non_max_suppression(batched=True).
+
+    Candidates of all images are filtered, pre-selected and suppressed together. Boxes are offset along y by image
+    index and along x by class index, so a single torchvision NMS call never suppresses across images or classes while
+    keeping offsets as small as with per-image NMS. As CPU NMS cost grows quadratically with the number of boxes, large
+    CPU batches instead run NMS on each image's contiguous slice of the already filtered candidates.
+
+    Args:
+        prediction (torch.Tensor): Raw predictions of shape (batch_size, 4 + num_classes + num_masks, num_boxes) with
+            boxes in xywh format. The tensor is never modified.
+        xc (torch.Tensor): Boolean candidate mask of shape (batch_size, num_boxes).
+        conf_thres (float): Confidence threshold.
+        iou_thres (float): IoU threshold.
+        classes (List[int], optional): Class indices to keep.
+        agnostic (bool): Class-agnostic NMS.
+        multi_label (bool): Allow multiple labels per box.
+        max_det (int): Maximum number of detections per image.
+        nc (int): Number of classes.
+        max_nms (int): Maximum number of boxes per image into NMS.
+        max_wh (int): Maximum box width and height in pixels.
+
+    Returns:
+        (List[torch.Tensor]): Same format as non_max_suppression().
+    """
+    bs = prediction.shape[0]
+    nm = prediction.shape[1] - nc - 4
+    b, i = torch.where(xc)  # candidates
+    box, cls, mask = prediction[b, :, i].split((4, nc, nm), 1)  # gather candidates only
+    box = xywh2xyxy(box)
+    if multi_label:
+        k, j = torch.where(cls > conf_thres)
+        b, box, conf, mask = b[k], box[k], cls[k, j], mask[k]
+    else:  # best class only
+        conf, j = cls.max(1)
+        k = conf > conf_thres
+        b, box, conf, j, mask = b[k], box[k], conf[k], j[k], mask[k]
+
+    # Filter by class
+    if classes is not None:
+        k = (j[:, None] == torch.tensor(classes, device=j.device)).any(1)
+        b, box, conf, j, mask = b[k], box[k], conf[k], j[k], mask[k]
+
+    # Group candidates by image, most confident first, and keep at most max_nms per image
+    k = (b * 2 - conf.double()).argsort()
+    b, counts = b[k], torch.bincount(b, minlength=bs)
+    x = torch.cat((box[k], conf[k, None], j[k, None].float(), mask[k]), 1)
+    if counts.max() > max_nms:  # excess boxes
+        k = torch.arange(len(b), device=b.device) - (counts.cumsum(0) - counts)[b] < max_nms  # rank within image
+        b, x, counts = b[k], x[k], counts.clamp(max=max_nms)
+
+    # Batched NMS, boxes offset by class along x and by image along y
+    c = x[:, 5] * (0 if agnostic else max_wh)
+    if x.device.type == "cpu" and len(x) > 1000:  # CPU NMS is O(n^2), suppress each image's slice separately
+        boxes = x[:, :4] + torch.stack((c, c), 1).repeat(1, 2)
+        k, start = [], 0
+        for n in counts.tolist():
+            if n:
+                k.append(torchvision.ops.nms(boxes[start : start + n], x[start : start + n, 4], iou_thres) + start)
+            start += n
+        k = torch.cat(k)
+    else:
+        k = torchvision.ops.nms(x[:, :4] + torch.stack((c, b * max_wh), 1).repeat(1, 2), x[:, 4], iou_thres)
+    k = k.sort()[0]  # image-grouped order
+
+    # Limit detections per image
+    b = b[k]
+    counts = torch.bincount(b, minlength=bs)
+    k = k[torch.arange(len(b), device=b.device) - (counts.cumsum(0) - counts)[b] < max_det]
+    return list(x[k].split(counts.clamp(max=max_det).tolist()))
+
+
 def clip_boxes(boxes, shape):
     """
     Takes a list of bounding boxes and a shape (height, width) and clips the bounding boxes to the shape.
@@ -616,21 +702,33 @@ def resample_segments(segments, n=1000):
     """
     Inputs a list of segments (n,2) and returns a list of segments (n,2) up-sampled to n points each.
 
+    All segments are interpolated at once, as one packed array of their points with per-segment offsets.
+
     Args:
         segments (list): a list of (n,2) arrays, where n is the number of points in the segment.
         n (int): number of points to resample the segment to. Defaults to 1000
 
     Returns:
-        segments (list): the resampled segments.
+        segments (np.ndarray): the resampled segments, with shape (len(segments), n, 2).
     """
-    for i, s in enumerate(segments):
-        s = np.concatenate((s, s[0:1, :]), axis=0)
-        x = np.linspace(0, len(s) - 1, n)
-        xp = np.arange(len(s))
-        segments[i] = (
-            np.concatenate([np.interp(x, xp, s[:, i]) for i in range(2)], dtype=np.float32).reshape(2, -1).T
-        )  # segment xy
-    return segments
+    if not len(segments):
+        return np.zeros((0, n, 2), dtype=np.float32)
+    lengths = np.array([len(s) for s in segments])
+    starts = np.cumsum(lengths) - lengths
+    points = np.concatenate(segments).astype(np.float64)
+    points = np.insert(points, starts + lengths, points[starts], axis=0)  # close every segment with its first point
+    starts += np.arange(len(segments))  # offsets of the closed segments
+    x = np.arange(n) * (lengths[:, None] / max(n - 1, 1))  # same as np.linspace(0, length, n) for each segment
+    i = np.minimum(x.astype(np.intp), lengths[:, None] - 1)  # index of the point before x
+    t = (x - i)[..., None]
+    i += starts[:, None]
+    p0 = points.take(i, 0)
+    out = points.take(i + 1, 0)
+    out -= p0
+    out *= t
+    out += p0  # linear interpolation like np.interp()
+    out[:, -1] = points[starts]  # end exactly on the first point
+    return out.astype(np.float32)
 
 
 def crop_mask(masks, boxes):
@@ -727,6 +825,77 @@ def process_mask_native(protos, masks_in, bboxes, shape):
     return masks.gt_(0.5)
 
 
+def _bilinear_weights(size_in, size_out, device=None):
+    """
+    Returns the source indices and weights that F.interpolate(mode='bilinear', align_corners=False) uses along one axis.
+
+    Args:
+        size_in (int): Input size of the axis.
+        size_out (int): Output size of the axis.
+        device (torch.device, optional): Device of the returned tensors.
+
+    Returns:
+        (tuple): Lower and upper source indices and their weights, each a tensor of shape [size_out].
+    """
+    scale = torch.tensor(size_in, dtype=torch.float32, device=device) / size_out
+    src = ((torch.arange(size_out, dtype=torch.float32, device=device) + 0.5) * scale - 0.5).clamp_(min=0)
+    i0 = src.long().clamp_(max=size_in - 1)
+    w1 = (src - i0).clamp_(0, 1)
+    return i0, (i0 + 1).clamp_(max=size_in - 1), 1 - w1, w1
+
+
+def process_mask_roi(protos, masks_in, bboxes, shape, native=False):
+    """
+    Produces the same masks as `process_mask(..., upsample=True)` or, if native, `process_mask_native`, but upsamples
+    each mask only within the region its box can reach and returns it as a box-local tile instead of a full-frame mask.
+
+    Memory and compute grow with the total box area instead of the number of instances times the frame size. Pixels
+    match the full-frame masks up to float rounding of values right at the 0.5 threshold.
+
+    Args:
+        protos (torch.Tensor): [mask_dim, mask_h, mask_w]
+        masks_in (torch.Tensor): [n, mask_dim], n is number of masks after nms
+        bboxes (torch.Tensor): [n, 4], n is number of masks after nms
+        shape (tuple): the size of the input image (h,w), or of the original image if native
+        native (bool): Whether bboxes are in original image coordinates and masks are upsampled to it, as in
+            process_mask_native.
+
+    Returns:
+        tiles (List[torch.Tensor]): n boolean masks, each covering its region of the (h,w) frame.
+        offsets (torch.Tensor): [n, 2] integer (x, y) position of each tile in the frame.
+    """
+    c, mh, mw = protos.shape  # CHW
+    ih, iw = shape
+    masks = (masks_in @ protos.float().view(c, -1)).sigmoid().view(-1, mh, mw)  # CHW at proto resolution
+    if native:  # remove letterbox padding like scale_masks, masks are cropped to the boxes after upsampling
+        gain = min(mh / ih, mw / iw)
+        pad = (mw - iw * gain) / 2, (mh - ih * gain) / 2  # wh padding
+        masks = masks[:, int(pad[1]) : int(mh - pad[1]), int(pad[0]) : int(mw - pad[0])]
+        xs = _bilinear_weights(masks.shape[2], iw, masks.device)
+        ys = _bilinear_weights(masks.shape[1], ih, masks.device)
+        boxes = bboxes[:, :4].ceil()  # first pixel inside and first pixel past each box
+    else:  # masks are cropped to the boxes at proto resolution, tiles cover the pixels interpolated from inside them
+        boxes = bboxes[:, :4] * torch.tensor([mw / iw, mh / ih] * 2, device=bboxes.device)
+        masks = crop_mask(masks, boxes)
+        xs, ys = _bilinear_weights(mw, iw, masks.device), _bilinear_weights(mh, ih, masks.device)
+        x1, y1, x2, y2 = boxes.ceil().long().T.contiguous()  # first pixel inside and past each box
+        x1, x2 = torch.searchsorted(xs[1], x1), torch.searchsorted(xs[0], x2)
+        y1, y2 = torch.searchsorted(ys[1], y1), torch.searchsorted(ys[0], y2)
+        boxes = torch.stack((x1, y1, x2, y2), 1)
+    boxes[:, [0, 2]] = boxes[:, [0, 2]].clamp_(0, iw)
+    boxes[:, [1, 3]] = boxes[:, [1, 3]].clamp_(0, ih)
+    boxes = boxes.long()
+    boxes[:, 2:] = torch.maximum(boxes[:, 2:], boxes[:, :2])  # empty tiles for boxes outside the frame
+
+    tiles = []
+    for m, (left, top, right, bottom) in zip(masks, boxes.tolist()):
+        x0, x1, wx0, wx1 = (v[left:right] for v in xs)
+        y0, y1, wy0, wy1 = (v[top:bottom] for v in ys)
+        m = m[:, x0] * wx0 + m[:, x1] * wx1  # interpolate columns, (mask_h, tile_w)
+        tiles.append((m[y0] * wy0[:, None] + m[y1] * wy1[:, None]) > 0.5)  # interpolate rows, (tile_h, tile_w)
+    return tiles, boxes[:, :2]
+
+
 def scale_masks(masks, shape, padding=True):
     """
     Rescale segment masks to shape.
@@ -816,8 +985,10 @@ def masks2segments(masks, strategy="largest"):
         segments (List): list of segment masks
     """
     segments = []
-    for x in masks.int().cpu().numpy().astype("uint8"):
-        c = cv2.findContours(x, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)[0]
+    masks = masks.to(torch.uint8).cpu().numpy()
+    for x, (x1, y1, x2, y2) in zip(masks, masks2boxes(masks).tolist()):  # trace contours inside the mask region only
+        x = x[y1:y2, x1:x2]
+        c = cv2.findContours(x, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE, offset=(x1, y1))[0] if x.size else ()
         if c:
             if strategy == "concat":  # concatenate all segments
                 c = np.concatenate([x.reshape(-1, 2) for x in c])
@@ -829,6 +1000,70 @@ def masks2segments(masks, strategy="largest"):
     return segments
 
 
+def masks2boxes(masks):
+    """
+    Returns the box around the non-zero pixels of each mask.
+
+    Args:
+        masks (np.ndarray): Masks of shape (n, h, w).
+
+    Returns:
+        (np.ndarray): Integer boxes of shape (n, 4) in xyxy format with exclusive x2 and y2, zeros for empty masks.
+    """
+    n, h, w = masks.shape
+    if not h or not w:
+        return np.zeros((n, 4), dtype=np.int64)
+    rows, cols = masks.any(2), masks.any(1)  # (n, h), (n, w)
+    boxes = np.stack(
+        (cols.argmax(1), rows.argmax(1), w - cols[:, ::-1].argmax(1), h - rows[:, ::-1].argmax(1)), 1
+    )
+    boxes[~rows.any(1)] = 0
+    return boxes
+
+
+def masks2rle(masks):
+    """
+    Run-length encodes binary masks in column-major order like COCO, with counts that alternate between runs of 0s and
+    1s, starting with 0s. All masks are encoded in a single pass over their concatenated pixels.
+
+    Args:
+        masks (np.ndarray | List[np.ndarray]): Masks of shape (n, h, w), or a list of n masks of different sizes.
+
+    Returns:
+        (List[np.ndarray]): The uint32 run lengths of each mask.
+    """
+    flat = [np.asarray(x, dtype=bool).ravel(order="F") for x in masks]
+    lengths = np.array([len(x) for x in flat], dtype=np.int64)
+    starts = np.cumsum(lengths) - lengths
+    x = np.concatenate(flat) if flat else np.zeros(0, dtype=bool)
+    prev = np.empty_like(x)
+    prev[1:] = x[:-1]
+    prev[starts[lengths > 0]] = False  # every mask starts with a run of 0s
+    changes = np.flatnonzero(x != prev)  # first pixel of every run after the first one
+    changes = np.split(changes, np.searchsorted(changes, starts[1:]))
+    return [np.diff(c, prepend=a, append=a + n).astype(np.uint32) for c, a, n in zip(changes, starts, lengths)]
+
+
+def rle2masks(counts, shapes):
+    """
+    Decodes masks run-length encoded by masks2rle, all in a single pass.
+
+    Args:
+        counts (List[np.ndarray]): The run lengths of each mask.
+        shapes (np.ndarray | List[tuple]): The (h, w) size of each mask.
+
+    Returns:
+        (List[np.ndarray]): The boolean masks.
+    """
+    runs = [len(c) for c in counts]
+    first = np.repeat(np.cumsum(runs) - runs, runs)  # index of the first run of each mask for every run
+    counts = np.concatenate(counts) if counts else np.zeros(0, dtype=np.uint32)
+    x = np.repeat((np.arange(len(counts)) - first) % 2 == 1, counts)
+    shapes = np.asarray(shapes, dtype=np.int64).reshape(-1, 2)
+    masks = np.split(x, np.cumsum(shapes.prod(1))[:-1])
+    return [np.ascontiguousarray(m.reshape(w, h).T) for m, (h, w) in zip(masks, shapes.tolist())]
+
+
 def convert_torch2numpy_batch(batch: torch.Tensor) -> np.ndarray:
     """
     Convert a batch of FP32 torch tensors (0.0-1.0) to a NumPy uint8 array (0-255), changing from BCHW to BHWC layout.
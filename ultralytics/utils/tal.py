@@ -23,9 +23,10 @@ class TaskAlignedAssigner(nn.Module):
         alpha (float): The alpha parameter for the classification component of the task-aligned metric.
         beta (float): The beta parameter for the localization component of the task-aligned metric.
         eps (float): A small value to prevent division by zero.
+        chunk (int): Number of gts per image whose (b, chunk, h*w) metrics are computed at once, 0 for all gts.
     """
 
-    def __init__(self, topk=13, num_classes=80, alpha=1.0, beta=6.0, eps=1e-9):
+    def __init__(self, topk=13, num_classes=80, alpha=1.0, beta=6.0, eps=1e-9, chunk=0):
         """Initialize a TaskAlignedAssigner object with customizable hyperparameters."""
         super().__init__()
         self.topk = topk
@@ -34,6 +35,7 @@ class TaskAlignedAssigner(nn.Module):
         self.alpha = alpha
         self.beta = beta
         self.eps = eps
+        self.chunk = chunk
 
     @torch.no_grad()
     def forward(self, pd_scores, pd_bboxes, anc_points, gt_labels, gt_bboxes, mask_gt):
@@ -69,6 +71,9 @@ class TaskAlignedAssigner(nn.Module):
                 torch.zeros_like(pd_scores[..., 0]).to(device),
             )
 
+        if self.chunk and self.n_max_boxes > self.chunk:
+            return self.chunked_forward(pd_scores, pd_bboxes, anc_points, gt_labels, gt_bboxes, mask_gt)
+
         mask_pos, align_metric, overlaps = self.get_pos_mask(
             pd_scores, pd_bboxes, gt_labels, gt_bboxes, anc_points, mask_gt
         )
@@ -87,6 +92,55 @@ class TaskAlignedAssigner(nn.Module):
 
         return target_labels, target_bboxes, target_scores, fg_mask.bool(), target_gt_idx
 
+    def chunked_forward(self, pd_scores, pd_bboxes, anc_points, gt_labels, gt_bboxes, mask_gt):
+        """
+        Memory-bounded forward() with the same results, for images with many gts.
+
+        The (b, max_num_obj, h*w) metrics and masks are only built for self.chunk gts at a time. Each chunk keeps the
+        indices and metrics of its positive anchors, plus a running per-anchor maximum overlap over all gts, which
+        resolves anchors assigned to several gts like select_highest_overlaps().
+        """
+        bs, na, device = self.bs, pd_scores.shape[1], pd_scores.device
+        max_overlaps = torch.zeros(bs, na, dtype=pd_bboxes.dtype, device=device)  # max overlap over all gts
+        max_overlaps_idx = torch.zeros(bs, na, dtype=torch.long, device=device)  # first gt with the max overlap
+        max_align = torch.zeros(bs, na, dtype=pd_scores.dtype, device=device)  # align metric of that gt
+        pos = []  # (b, gt, anchor) indices, align metrics and overlaps of positive anchors
+        for i in range(0, self.n_max_boxes, self.chunk):
+            labels, bboxes, mask = (x[:, i : i + self.chunk].contiguous() for x in (gt_labels, gt_bboxes, mask_gt))
+            mask_pos, align_metric, overlaps = self.get_pos_mask(pd_scores, pd_bboxes, labels, bboxes, anc_points, mask)
+            idx = overlaps.argmax(1, keepdim=True)  # (b, 1, h*w)
+            better = overlaps.gather(1, idx).squeeze(1) > max_overlaps  # strict, so earlier gts win ties
+            max_overlaps = torch.where(better, overlaps.gather(1, idx).squeeze(1), max_overlaps)
+            max_overlaps_idx = torch.where(better, idx.squeeze(1) + i, max_overlaps_idx)
+            max_align = torch.where(better, align_metric.gather(1, idx).squeeze(1), max_align)
+            b, g, a = mask_pos.nonzero(as_tuple=True)
+            pos.append((b, g + i, a, align_metric[b, g, a], overlaps[b, g, a]))
+        b, g, a, align, overlap = (torch.cat(x) for x in zip(*pos))
+
+        # Anchors assigned to several gts take the gt of highest overlap
+        fg_count = torch.zeros(bs, na, dtype=torch.long, device=device).index_put_((b, a), torch.ones_like(b), True)
+        multi = fg_count > 1
+        target_gt_idx = torch.zeros(bs, na, dtype=torch.long, device=device).index_put_((b, a), g)
+        target_gt_idx = torch.where(multi, max_overlaps_idx, target_gt_idx)
+        align_metric = torch.where(multi, max_align, torch.zeros_like(max_align).index_put_((b, a), align))
+        overlaps = torch.where(multi, max_overlaps, torch.zeros_like(max_overlaps).index_put_((b, a), overlap))
+        fg_mask = (fg_count > 0).to(pd_scores.dtype)
+
+        # Assigned target
+        target_labels, target_bboxes, target_scores = self.get_targets(gt_labels, gt_bboxes, target_gt_idx, fg_mask)
+
+        # Normalize with the max align metric and overlap of the anchors assigned to each gt
+        b, a = fg_mask.nonzero(as_tuple=True)
+        gt = b * self.n_max_boxes + target_gt_idx[b, a]  # flat (b, max_num_obj) index
+        align, overlap = align_metric[b, a], overlaps[b, a]
+        pos_align_metrics = align.new_zeros(bs * self.n_max_boxes).scatter_reduce_(0, gt, align, "amax")
+        pos_overlaps = overlap.new_zeros(bs * self.n_max_boxes).scatter_reduce_(0, gt, overlap, "amax")
+        norm_align_metric = torch.zeros_like(align_metric)
+        norm_align_metric[b, a] = align * pos_overlaps[gt] / (pos_align_metrics[gt] + self.eps)
+        target_scores = target_scores * norm_align_metric.unsqueeze(-1)
+
+        return target_labels, target_bboxes, target_scores, fg_mask.bool(), target_gt_idx
+
     def get_pos_mask(self, pd_scores, pd_bboxes, gt_labels, gt_bboxes, anc_points, mask_gt):
         """Get in_gts mask, (b, max_num_obj, h*w)."""
         mask_in_gts = self.select_candidates_in_gts(anc_points, gt_bboxes)
@@ -101,19 +155,19 @@ class TaskAlignedAssigner(nn.Module):
 
     def get_box_metrics(self, pd_scores, pd_bboxes, gt_labels, gt_bboxes, mask_gt):
         """Compute alignment metric given predicted and ground truth bounding boxes."""
-        na = pd_bboxes.shape[-2]
+        na, n_boxes = pd_bboxes.shape[-2], gt_bboxes.shape[1]  # n_boxes < max_num_obj for chunked_forward()
         mask_gt = mask_gt.bool()  # b, max_num_obj, h*w
-        overlaps = torch.zeros([self.bs, self.n_max_boxes, na], dtype=pd_bboxes.dtype, device=pd_bboxes.device)
-        bbox_scores = torch.zeros([self.bs, self.n_max_boxes, na], dtype=pd_scores.dtype, device=pd_scores.device)
+        overlaps = torch.zeros([self.bs, n_boxes, na], dtype=pd_bboxes.dtype, device=pd_bboxes.device)
+        bbox_scores = torch.zeros([self.bs, n_boxes, na], dtype=pd_scores.dtype, device=pd_scores.device)
 
-        ind = torch.zeros([2, self.bs, self.n_max_boxes], dtype=torch.long)  # 2, b, max_num_obj
-        ind[0] = torch.arange(end=self.bs).view(-1, 1).expand(-1, self.n_max_boxes)  # b, max_num_obj
+        ind = torch.zeros([2, self.bs, n_boxes], dtype=torch.long)  # 2, b, max_num_obj
+        ind[0] = torch.arange(end=self.bs).view(-1, 1).expand(-1, n_boxes)  # b, max_num_obj
         ind[1] = gt_labels.squeeze(-1)  # b, max_num_obj
         # Get the scores of each grid for each gt cls
         bbox_scores[mask_gt] = pd_scores[ind[0], :, ind[1]][mask_gt]  # b, max_num_obj, h*w
 
         # (b, max_num_obj, 1, 4), (b, 1, h*w, 4)
-        pd_boxes = pd_bboxes.unsqueeze(1).expand(-1, self.n_max_boxes, -1, -1)[mask_gt]
+        pd_boxes = pd_bboxes.unsqueeze(1).expand(-1, n_boxes, -1, -1)[mask_gt]
         gt_boxes = gt_bboxes.unsqueeze(2).expand(-1, -1, na, -1)[mask_gt]
         # overlaps[mask_gt] = self.iou_calculation(gt_boxes, pd_boxes)
         # overlaps[mask_gt] = bbox_iou(gt_boxes, pd_boxes,xywh=False, EIoU=True).squeeze(-1).clamp_(0)
@@ -154,11 +208,7 @@ class TaskAlignedAssigner(nn.Module):
 
         # (b, max_num_obj, topk, h*w) -> (b, max_num_obj, h*w)
         count_tensor = torch.zeros(metrics.shape, dtype=torch.int8, device=topk_idxs.device)
-        ones = torch.ones_like(topk_idxs[:, :, :1], dtype=torch.int8, device=topk_idxs.device)
-        for k in range(self.topk):
-            # Expand topk_idxs for each value of k and add 1 at the specified positions
-            count_tensor.scatter_add_(-1, topk_idxs[:, :, k : k + 1], ones)
-        # count_tensor.scatter_add_(-1, topk_idxs, torch.ones_like(topk_idxs, dtype=torch.int8, device=topk_idxs.device))
+        count_tensor.scatter_add_(-1, topk_idxs, torch.ones_like(topk_idxs, dtype=torch.int8))  # all k at once
         # Filter invalid bboxes
         count_tensor.masked_fill_(count_tensor > 1, 0)
 